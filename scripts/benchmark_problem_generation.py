@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Benchmark the baseline per-problem loop against the current generators.
+
+The "loop" series is a frozen copy of the original rejection-sampling loop,
+kept here as a fixed reference: the library's generate_math_problems() now
+samples from problem spaces, so timing it no longer measures the old path.
+"""
+
+import os
+import random
+import sys
+import timeit
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.problem_generator import ProblemGenerator  # noqa: E402
+from src.problem_strategy import adjust_range_by_difficulty  # noqa: E402
+from src.problem_types import (  # noqa: E402
+    OPERATORS,
+    get_difficulty_weights,
+    get_problem_types_for_age,
+)
+
+# (age, difficulty, problems per worksheet, worksheets)
+SCENARIOS = [
+    (6, 0.5, 30, 1),
+    (8, 0.5, 30, 1),
+    (9, 0.8, 30, 1),
+    (8, 0.5, 30, 100),
+    (9, 0.5, 50, 200),
+]
+
+REPEATS = 5
+
+
+def loop_addition(min_val, max_val, difficulty, age):
+    """Baseline AdditionStrategy.generate()."""
+    min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+    if age == 5:
+        if difficulty <= 0.5:
+            num1 = random.randint(min_val, 9)
+        else:
+            num1 = random.randint(min_val, max_val - 1)
+        num2 = random.randint(min_val, min(max_val - num1, max_val))
+    else:
+        num1 = random.randint(min_val, max_val)
+        num2 = random.randint(min_val, max_val)
+    return f"{num1} {OPERATORS['addition']} {num2}", str(num1 + num2)
+
+
+def loop_subtraction(min_val, max_val, difficulty, age):
+    """Baseline SubtractionStrategy.generate()."""
+    min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+    if age == 5:
+        if difficulty <= 0.5:
+            num2 = random.randint(min_val, 9)
+            num1 = random.randint(num2 + 1, max_val)
+        else:
+            num1 = random.randint(min_val + 1, max_val)
+            num2 = random.randint(min_val, num1 - 1)
+    else:
+        num1 = random.randint(min_val, max_val)
+        num2 = random.randint(min_val, max_val)
+        num1, num2 = max(num1, num2), min(num1, num2)
+    return f"{num1} {OPERATORS['subtraction']} {num2}", str(num1 - num2)
+
+
+def loop_multiplication(min_val, max_val, difficulty, age):
+    """Baseline MultiplicationStrategy.generate()."""
+    min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+    num1 = random.randint(min_val, max_val)
+    num2 = random.randint(min_val, max_val)
+    return f"{num1} {OPERATORS['multiplication']} {num2}", str(num1 * num2)
+
+
+def loop_division(min_val, max_val, difficulty, age):
+    """Baseline DivisionStrategy.generate()."""
+    min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+    answer = random.randint(min_val, max_val)
+    num2 = random.randint(min_val, max_val)
+    return f"{answer * num2} {OPERATORS['division']} {num2}", str(answer)
+
+
+def loop_fractions(min_val, max_val, difficulty, age):
+    """Baseline FractionStrategy.generate()."""
+    min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+    denominator = random.randint(2, max_val)
+    numerator = random.randint(1, denominator)
+    return f"{numerator}/{denominator}", str(round(numerator / denominator, 3))
+
+
+LOOP_STRATEGIES = {
+    "addition": loop_addition,
+    "subtraction": loop_subtraction,
+    "multiplication": loop_multiplication,
+    "division": loop_division,
+    "fractions": loop_fractions,
+}
+
+
+def loop_generate(age, count, difficulty):
+    """Baseline generate_math_problems(): draw one problem at a time, reject repeats."""
+    problem_weights = get_difficulty_weights(age, difficulty)
+    problem_types = get_problem_types_for_age(age)
+
+    problems = []
+    answers = []
+    used_problems = set()
+
+    attempts = 0
+    max_attempts = count * 10
+
+    while len(problems) < count and attempts < max_attempts:
+        attempts += 1
+        problem_type = random.choices(
+            list(problem_weights.keys()),
+            weights=list(problem_weights.values()),
+            k=1,
+        )[0]
+        range_tuple = problem_types[problem_type]
+        try:
+            problem, answer = LOOP_STRATEGIES[problem_type](
+                range_tuple[0], range_tuple[1], difficulty, age
+            )
+        except ValueError:
+            continue
+        if problem not in used_problems:
+            problems.append(problem)
+            answers.append(answer)
+            used_problems.add(problem)
+
+    return problems, answers
+
+
+def benchmark(age, difficulty, count, num_worksheets):
+    """Time the baseline loop and both current generation paths for one scenario."""
+    generator = ProblemGenerator(seed=0)
+    random.seed(0)
+
+    def run_loop():
+        for _ in range(num_worksheets):
+            loop_generate(age, count, difficulty)
+
+    def run_single():
+        for _ in range(num_worksheets):
+            generator.generate_math_problems(age, count, difficulty)
+
+    def run_batch():
+        generator.generate_math_problems_batch(age, count, difficulty, num_worksheets)
+
+    loop_time = min(timeit.repeat(run_loop, number=1, repeat=REPEATS))
+    single_time = min(timeit.repeat(run_single, number=1, repeat=REPEATS))
+    batch_time = min(timeit.repeat(run_batch, number=1, repeat=REPEATS))
+    return loop_time, single_time, batch_time
+
+
+def main():
+    """Run all benchmark scenarios and print throughput."""
+    print(
+        f"{'age':>3} {'diff':>4} {'count':>5} {'sheets':>6} "
+        f"{'loop/s':>10} {'single/s':>10} {'batch/s':>10} "
+        f"{'single':>7} {'batch':>7}"
+    )
+    for age, difficulty, count, num_worksheets in SCENARIOS:
+        loop_time, single_time, batch_time = benchmark(
+            age, difficulty, count, num_worksheets
+        )
+        total = count * num_worksheets
+        print(
+            f"{age:>3} {difficulty:>4} {count:>5} {num_worksheets:>6} "
+            f"{total / loop_time:>10.0f} {total / single_time:>10.0f} "
+            f"{total / batch_time:>10.0f} "
+            f"{loop_time / single_time:>6.1f}x {loop_time / batch_time:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""Benchmark worksheet rendering and compare it against a stored baseline.
+
+Measures seconds per call, pages per second, bytes per PDF and peak traced
+memory for layout, QR code generation, worksheets and answer keys. Results
+are written as JSON. With --baseline, any metric that regressed past its
+tolerance is reported and the script exits with status 1.
+
+Timings depend on the machine, so the baseline should be recorded with
+--update-baseline on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from io import BytesIO
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from src.document import template, text  # noqa: E402
+from src.document.renderer import DocumentRenderer  # noqa: E402
+from src.document.template import LayoutChoice  # noqa: E402
+from src.problem_generator import ProblemGenerator  # noqa: E402
+from src.qr_generator import draw_qr_code, qr_matrix  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(__file__), "benchmarks", "rendering_baseline.json"
+)
+
+# Allowed growth over the baseline before a metric counts as a regression
+TOLERANCES = {
+    "seconds": 0.25,
+    "bytes": 0.05,
+    "peak_kb": 0.25,
+}
+
+# Absolute growth always allowed, so sub-millisecond timings are not flagged
+# for scheduler noise
+NOISE_FLOOR = {
+    "seconds": 0.0005,
+}
+
+REPEATS = 10
+
+WORD_PROBLEM_TEMPLATES = [
+    "Sam has {a} apples and buys {b} more at the market. How many apples "
+    "does Sam have now?",
+    "A class of {a} students splits into groups of {b}. How many groups "
+    "are there, and how many students are left over?",
+    "Mia read {a} pages on Monday and {b} pages on Tuesday. How many more "
+    "pages did she read on Monday?",
+]
+
+# (name, layout, problems per worksheet, share of word problems)
+SCENARIOS = [
+    ("2col-30", LayoutChoice.TWO_COLUMN, 30, 0.0),
+    ("1col-30", LayoutChoice.ONE_COLUMN, 30, 0.0),
+    ("words-30", LayoutChoice.ONE_COLUMN, 30, 1.0),
+    ("mixed-30", LayoutChoice.ONE_COLUMN, 30, 0.5),
+    ("2col-300", LayoutChoice.TWO_COLUMN, 300, 0.0),
+    ("words-120", LayoutChoice.ONE_COLUMN, 120, 1.0),
+]
+
+
+def make_problems(count, word_share, seed=0):
+    """Build a deterministic problem set with the given share of word problems."""
+    problems, answers = ProblemGenerator(seed=seed).generate_math_problems(
+        age=8, count=count, difficulty=0.5
+    )
+    rng = random.Random(seed)
+    for index in range(count):
+        if rng.random() < word_share:
+            a, b = rng.randint(10, 99), rng.randint(2, 9)
+            problems[index] = rng.choice(WORD_PROBLEM_TEMPLATES).format(a=a, b=b)
+            answers[index] = str(a + b)
+    return problems, answers
+
+
+def clear_caches():
+    """Forget memoized layouts, wraps and QR codes for a cold measurement."""
+    template._paginate.cache_clear()
+    text.wrap_problem.cache_clear()
+    qr_matrix.cache_clear()
+
+
+def measure(func, cold):
+    """Time a call and trace its peak memory.
+
+    Args:
+        func: Function to measure; returns the output bytes or None.
+        cold: Whether to clear the caches before every call.
+
+    Returns:
+        Dict of seconds per call, peak traced KB and output bytes.
+    """
+
+    def run():
+        if cold:
+            clear_caches()
+        return func()
+
+    output = run()  # Warm up imports, fonts and, unless cold, caches
+    seconds = min(timeit.repeat(run, number=1, repeat=REPEATS))
+
+    if cold:
+        clear_caches()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"seconds": seconds, "peak_kb": peak / 1024}
+    if output is not None:
+        result["bytes"] = len(output)
+    return result
+
+
+def benchmark_scenario(renderer, layout, count, word_share):
+    """Measure every rendering hot path for one scenario."""
+    problems, answers = make_problems(count, word_share)
+    pages = len(renderer.plan(problems, "benchmark", layout).pages)
+    template_manager = renderer.template_manager
+
+    def layout_call():
+        template_manager.calculate_layout(len(problems), problems, layout)
+
+    def worksheet_call():
+        pdf = BytesIO()
+        renderer.create_worksheet(pdf, problems, "benchmark", layout)
+        return pdf.getvalue()
+
+    def answer_key_call():
+        pdf = BytesIO()
+        renderer.create_answer_key(pdf, problems, answers, "benchmark", layout)
+        return pdf.getvalue()
+
+    results = {
+        "calculate_layout_cold": measure(layout_call, cold=True),
+        "calculate_layout": measure(layout_call, cold=False),
+        "create_worksheet": measure(worksheet_call, cold=False),
+        "create_answer_key": measure(answer_key_call, cold=False),
+    }
+    for name in ("create_worksheet", "create_answer_key"):
+        results[name]["pages"] = pages
+        results[name]["pages_per_second"] = pages / results[name]["seconds"]
+    return results
+
+
+def benchmark_qr_code():
+    """Measure generating and drawing a worksheet QR code."""
+
+    def qr_call():
+        pdf = canvas.Canvas(BytesIO(), pagesize=letter)
+        draw_qr_code(pdf, qr_matrix("benchmark"), 500, 730, 40)
+
+    return {
+        "qr_code_cold": measure(qr_call, cold=True),
+        "qr_code": measure(qr_call, cold=False),
+    }
+
+
+def run_benchmarks():
+    """Run all scenarios and collect the results."""
+    renderer = DocumentRenderer()
+    results = {"qr": benchmark_qr_code()}
+    for name, layout, count, word_share in SCENARIOS:
+        results[name] = benchmark_scenario(renderer, layout, count, word_share)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerances=TOLERANCES):
+    """List metrics that grew past their tolerance over the baseline."""
+    regressions = []
+    for scenario, operations in baseline["results"].items():
+        for operation, metrics in operations.items():
+            measured = current["results"].get(scenario, {}).get(operation)
+            if measured is None:
+                continue
+            for metric, tolerance in tolerances.items():
+                if metric not in metrics:
+                    continue
+                limit = max(
+                    metrics[metric] * (1 + tolerance),
+                    metrics[metric] + NOISE_FLOOR.get(metric, 0),
+                )
+                if measured[metric] > limit:
+                    regressions.append(
+                        f"{scenario} {operation} {metric}: "
+                        f"{measured[metric]:.6g} > {metrics[metric]:.6g} "
+                        f"(+{tolerance:.0%} allowed)"
+                    )
+    return regressions
+
+
+def print_results(current):
+    """Print the results as a table."""
+    print(
+        f"{'scenario':<10} {'operation':<22} {'ms':>9} {'pages/s':>8} "
+        f"{'bytes':>8} {'peak KB':>8}"
+    )
+    for scenario, operations in current["results"].items():
+        for operation, metrics in operations.items():
+            pages_per_second = metrics.get("pages_per_second")
+            pages_column = f"{pages_per_second:.0f}" if pages_per_second else "-"
+            print(
+                f"{scenario:<10} {operation:<22} {metrics['seconds'] * 1000:>9.3f} "
+                f"{pages_column:>8} {metrics.get('bytes', '-'):>8} "
+                f"{metrics['peak_kb']:>8.1f}"
+            )
+
+
+def main():
+    """Run the benchmarks, write the results and check for regressions."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help=f"compare against a baseline file (default: {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=TOLERANCES["seconds"],
+        help="allowed relative slowdown (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    current = run_benchmarks()
+    print_results(current)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Wrote baseline to {baseline_path}")
+    elif args.baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        tolerances = dict(TOLERANCES, seconds=args.time_tolerance)
+        regressions = compare(current, baseline, tolerances)
+        if regressions:
+            print(f"{len(regressions)} regressions against {baseline_path}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
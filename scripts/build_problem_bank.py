@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""Build the precomputed problem bank served by the web workers."""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import PROBLEM_BANK_PATH  # noqa: E402
+from src.problem_bank import build_problem_bank  # noqa: E402
+from src.problem_generator import ProblemGenerator  # noqa: E402
+
+
+def main():
+    """Write the problem bank to the configured or given path."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=PROBLEM_BANK_PATH,
+        help=f"output file (default: {PROBLEM_BANK_PATH})",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+
+    start = time.perf_counter()
+    rows = build_problem_bank(args.path, ProblemGenerator().strategies)
+    elapsed = time.perf_counter() - start
+
+    size_mb = os.path.getsize(args.path) / (1024 * 1024)
+    print(f"Wrote {rows} problems ({size_mb:.1f} MB) to {args.path} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
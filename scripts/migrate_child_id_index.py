@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Recreate the Worksheets ChildIdIndex with created_at as its sort key.
+
+Worksheet listings page through a child's worksheets newest first, which
+needs ChildIdIndex keyed on (child_id, created_at). Tables created before
+that have an index keyed on child_id alone. A GSI's key schema cannot be
+changed in place, so this script deletes the old index and creates the new
+one, waiting for each step. Past worksheet pages fail until the new index is
+active, so run it during a maintenance window.
+
+The script does nothing if the index already has the created_at sort key.
+"""
+
+import os
+import sys
+import time
+
+import boto3
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.database.config import CHILD_ID_INDEX, WORKSHEETS_TABLE  # noqa: E402
+
+# Seconds between table status checks
+POLL_SECONDS = 10
+
+NEW_KEY_SCHEMA = [
+    {"AttributeName": "child_id", "KeyType": "HASH"},
+    {"AttributeName": "created_at", "KeyType": "RANGE"},
+]
+
+
+def find_index(client):
+    """Get the description of ChildIdIndex and the table, or None for the index."""
+    table = client.describe_table(TableName=WORKSHEETS_TABLE)["Table"]
+    for index in table.get("GlobalSecondaryIndexes", []):
+        if index["IndexName"] == CHILD_ID_INDEX:
+            return index, table
+    return None, table
+
+
+def wait_for(client, done, message):
+    """Poll the table until done(index, table) is true."""
+    print(message)
+    while True:
+        index, table = find_index(client)
+        if done(index, table):
+            return
+        time.sleep(POLL_SECONDS)
+
+
+def migrate(client):
+    """Replace an outdated ChildIdIndex with the (child_id, created_at) one."""
+    index, table = find_index(client)
+    if index is not None and index["KeySchema"] == NEW_KEY_SCHEMA:
+        print(f"{CHILD_ID_INDEX} already has the created_at sort key")
+        return
+
+    create = {
+        "IndexName": CHILD_ID_INDEX,
+        "KeySchema": NEW_KEY_SCHEMA,
+        "Projection": {"ProjectionType": "ALL"},
+    }
+    # Provisioned tables need throughput for the new index; keep the old one's
+    if table.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+        throughput = (index or table)["ProvisionedThroughput"]
+        create["ProvisionedThroughput"] = {
+            "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+            "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+        }
+
+    if index is not None:
+        print(f"Deleting {CHILD_ID_INDEX} from {WORKSHEETS_TABLE}")
+        client.update_table(
+            TableName=WORKSHEETS_TABLE,
+            GlobalSecondaryIndexUpdates=[{"Delete": {"IndexName": CHILD_ID_INDEX}}],
+        )
+        wait_for(
+            client,
+            lambda index, table: index is None and table["TableStatus"] == "ACTIVE",
+            f"Waiting for {CHILD_ID_INDEX} to be deleted...",
+        )
+
+    print(f"Creating {CHILD_ID_INDEX} on (child_id, created_at)")
+    client.update_table(
+        TableName=WORKSHEETS_TABLE,
+        AttributeDefinitions=[
+            {"AttributeName": "child_id", "AttributeType": "S"},
+            {"AttributeName": "created_at", "AttributeType": "N"},
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": create}],
+    )
+    wait_for(
+        client,
+        lambda index, table: index is not None and index["IndexStatus"] == "ACTIVE",
+        f"Waiting for {CHILD_ID_INDEX} to be built...",
+    )
+    print(f"{CHILD_ID_INDEX} migrated")
+
+
+def main():
+    """Migrate the index of the configured DynamoDB endpoint."""
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=os.getenv("DYNAMODB_ENDPOINT"),
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+    )
+    migrate(client)
+
+
+if __name__ == "__main__":
+    main()
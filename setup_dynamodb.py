@@ -27,6 +27,8 @@ SESSIONS_TABLE = "Sessions"
 WORKSHEETS_TABLE = "Worksheets"
 SUBSCRIPTIONS_TABLE = "mathtutor-subscriptions"
 PAYMENTS_TABLE = "mathtutor-payments"
+RENDER_JOBS_TABLE = "mathtutor-render-jobs"
+SCORE_SUMMARIES_TABLE = "mathtutor-score-summaries"
 
 # Index names
 PARENT_EMAIL_INDEX = "ParentEmailIndex"
@@ -35,6 +37,9 @@ CHILD_ID_INDEX = "ChildIdIndex"
 USER_EMAIL_SUBSCRIPTION_INDEX = "user-email-index"
 USER_EMAIL_PAYMENT_INDEX = "user-email-index"
 
+# TTL attribute names
+RENDER_JOB_TTL_ATTRIBUTE = "expires_at"
+
 
 def create_table_if_not_exists(
     table_name,
@@ -67,6 +72,20 @@ def create_table_if_not_exists(
             raise
 
 
+def enable_ttl_if_disabled(table_name, attribute_name):
+    """Enable TTL on a table if it is not enabled yet."""
+    dynamodb.get_waiter("table_exists").wait(TableName=table_name)
+    ttl = dynamodb.describe_time_to_live(TableName=table_name)
+    if ttl["TimeToLiveDescription"]["TimeToLiveStatus"] != "DISABLED":
+        print(f"TTL on {table_name} already enabled.")
+        return
+    dynamodb.update_time_to_live(
+        TableName=table_name,
+        TimeToLiveSpecification={"Enabled": True, "AttributeName": attribute_name},
+    )
+    print(f"TTL on {table_name} enabled on {attribute_name}.")
+
+
 # Create Users table
 create_table_if_not_exists(
     table_name=USERS_TABLE,
@@ -131,12 +150,14 @@ create_table_if_not_exists(
     attribute_definitions=[
         {"AttributeName": "id", "AttributeType": "S"},
         {"AttributeName": "child_id", "AttributeType": "S"},
+        {"AttributeName": "created_at", "AttributeType": "N"},
     ],
     global_secondary_indexes=[
         {
             "IndexName": CHILD_ID_INDEX,
             "KeySchema": [
                 {"AttributeName": "child_id", "KeyType": "HASH"},
+                {"AttributeName": "created_at", "KeyType": "RANGE"},
             ],
             "Projection": {"ProjectionType": "ALL"},
             "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
@@ -188,4 +209,27 @@ create_table_if_not_exists(
     ],
 )
 
+# Create Render jobs table
+create_table_if_not_exists(
+    table_name=RENDER_JOBS_TABLE,
+    key_schema=[
+        {"AttributeName": "id", "KeyType": "HASH"},  # Partition key
+    ],
+    attribute_definitions=[
+        {"AttributeName": "id", "AttributeType": "S"},
+    ],
+)
+enable_ttl_if_disabled(RENDER_JOBS_TABLE, RENDER_JOB_TTL_ATTRIBUTE)
+
+# Create Score summaries table
+create_table_if_not_exists(
+    table_name=SCORE_SUMMARIES_TABLE,
+    key_schema=[
+        {"AttributeName": "child_id", "KeyType": "HASH"},  # Partition key
+    ],
+    attribute_definitions=[
+        {"AttributeName": "child_id", "AttributeType": "S"},
+    ],
+)
+
 print("All tables checked/created successfully!")
@@ -67,3 +67,15 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 OAUTH_REDIRECT_URI = os.getenv(
     "OAUTH_REDIRECT_URI", "http://localhost:8080/auth/oauth/callback"
 )
+
+# Precomputed problem bank, built with scripts/build_problem_bank.py. When the
+# file is missing, problems are generated without it.
+PROBLEM_BANK_PATH = os.getenv("PROBLEM_BANK_PATH", "data/problem_bank.bin")
+
+# Background PDF render jobs. The "memory" store only works when one process
+# serves every request; production runs several web workers, so it defaults
+# to "dynamodb", which also works with DynamoDB Local.
+RENDER_JOB_STORE = os.getenv(
+    "RENDER_JOB_STORE", "dynamodb" if FLASK_ENV == "production" else "memory"
+)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
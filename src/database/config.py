@@ -14,6 +14,12 @@ USER_EMAIL_SUBSCRIPTION_INDEX = "user-email-index"
 PAYMENTS_TABLE = "mathtutor-payments"
 USER_EMAIL_PAYMENT_INDEX = "user-email-index"
 
+# Background render jobs table
+RENDER_JOBS_TABLE = "mathtutor-render-jobs"
+
+# Per-child score summaries table
+SCORE_SUMMARIES_TABLE = "mathtutor-score-summaries"
+
 # Index names
 PARENT_EMAIL_INDEX = "ParentEmailIndex"
 USER_EMAIL_INDEX = "UserEmailIndex"
@@ -21,3 +27,6 @@ CHILD_ID_INDEX = "ChildIdIndex"
 
 # TTL attribute name for sessions
 SESSION_TTL_ATTRIBUTE = "expires_at"
+
+# TTL attribute name for render jobs
+RENDER_JOB_TTL_ATTRIBUTE = "expires_at"
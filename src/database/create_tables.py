@@ -6,6 +6,8 @@ import boto3
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
+from .config import RENDER_JOB_TTL_ATTRIBUTE
+
 # Load environment variables
 load_dotenv()
 
@@ -103,12 +105,16 @@ def create_tables(dynamodb_resource=None):
             AttributeDefinitions=[
                 {"AttributeName": "id", "AttributeType": "S"},
                 {"AttributeName": "child_id", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "N"},
                 {"AttributeName": "serial_number", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
                     "IndexName": "ChildIdIndex",
-                    "KeySchema": [{"AttributeName": "child_id", "KeyType": "HASH"}],
+                    "KeySchema": [
+                        {"AttributeName": "child_id", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
                     "Projection": {"ProjectionType": "ALL"},
                 },
                 {
@@ -178,6 +184,49 @@ def create_tables(dynamodb_resource=None):
         else:
             raise
 
+    # Render jobs table
+    try:
+        dynamodb.create_table(
+            TableName="mathtutor-render-jobs",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print("Render jobs table created successfully")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceInUseException":
+            print("Render jobs table already exists")
+        else:
+            raise
+
+    # Expire render jobs, and their results, with the table's TTL
+    dynamodb.get_waiter("table_exists").wait(TableName="mathtutor-render-jobs")
+    ttl = dynamodb.describe_time_to_live(TableName="mathtutor-render-jobs")
+    if ttl["TimeToLiveDescription"]["TimeToLiveStatus"] == "DISABLED":
+        dynamodb.update_time_to_live(
+            TableName="mathtutor-render-jobs",
+            TimeToLiveSpecification={
+                "Enabled": True,
+                "AttributeName": RENDER_JOB_TTL_ATTRIBUTE,
+            },
+        )
+        print("Render jobs TTL enabled")
+
+    # Score summaries table
+    try:
+        dynamodb.create_table(
+            TableName="mathtutor-score-summaries",
+            KeySchema=[{"AttributeName": "child_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "child_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print("Score summaries table created successfully")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceInUseException":
+            print("Score summaries table already exists")
+        else:
+            raise
+
 
 if __name__ == "__main__":
     create_tables()
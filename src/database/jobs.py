@@ -0,0 +1,107 @@
+"""Stores for background render jobs."""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from .config import RENDER_JOBS_TABLE
+from .models import RenderJob
+
+
+class JobStore(ABC):
+    """Keeps render jobs and their results until they expire."""
+
+    # Largest result the store can keep, in bytes; None for no limit
+    max_result_bytes: Optional[int] = None
+
+    @abstractmethod
+    def save(self, job: RenderJob) -> None:
+        """Create or update a job."""
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Get a job by ID, or None if it is unknown or expired."""
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """Job store local to this process.
+
+    Jobs are only visible to the process that submitted them, so this store
+    suits development, tests and single-process deployments.
+    """
+
+    def __init__(self):
+        """Initialize in-memory job store."""
+        self._jobs: Dict[str, RenderJob] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: RenderJob) -> None:
+        """Create or update a job, dropping expired ones."""
+        with self._lock:
+            for job_id in [k for k, v in self._jobs.items() if v.is_expired()]:
+                del self._jobs[job_id]
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Get a job by ID, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.is_expired():
+            return None
+        return job
+
+
+class DynamoDBJobStore(JobStore):
+    """Job store in a DynamoDB table, shared by all web workers.
+
+    Works with DynamoDB Local as well. Expired items are removed by the
+    table's TTL on expires_at, which can lag, so expiry is also checked on
+    read. Results must fit in a DynamoDB item (400 KB) next to the other
+    job attributes.
+    """
+
+    max_result_bytes = 350 * 1024
+
+    def __init__(self, dynamodb):
+        """Initialize DynamoDB job store.
+
+        Args:
+            dynamodb: boto3 DynamoDB client.
+        """
+        self.dynamodb = dynamodb
+
+    def save(self, job: RenderJob) -> None:
+        """Create or update a job."""
+        self.dynamodb.put_item(TableName=RENDER_JOBS_TABLE, Item=job.to_item())
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        """Get a job by ID, or None if it is unknown or expired."""
+        response = self.dynamodb.get_item(
+            TableName=RENDER_JOBS_TABLE, Key={"id": {"S": job_id}}
+        )
+        job = RenderJob.from_item(response.get("Item"))
+        if job is None or job.is_expired():
+            return None
+        return job
+
+
+def create_job_store(backend: str, dynamodb=None) -> JobStore:
+    """Create the job store named in configuration.
+
+    Args:
+        backend: "memory" or "dynamodb".
+        dynamodb: boto3 DynamoDB client, required for the DynamoDB store.
+
+    Returns:
+        Job store.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend == "memory":
+        return InMemoryJobStore()
+    if backend == "dynamodb":
+        return DynamoDBJobStore(dynamodb)
+    raise ValueError(f"Unknown render job store: {backend}")
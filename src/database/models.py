@@ -5,6 +5,8 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from src.problem import Problem
+
 
 class DynamoDBModel:
     """Base class for DynamoDB models."""
@@ -255,6 +257,7 @@ class Worksheet(DynamoDBModel):
         answers: list = None,
         completed: bool = False,
         incorrect_problems: list = None,
+        answer_key: List[str] = None,
     ):
         """Initialize a worksheet."""
         super().__init__()
@@ -262,8 +265,16 @@ class Worksheet(DynamoDBModel):
         self.child_id = child_id
         self.problems = problems or []
         self.answers = answers or []
+        # Correct answer of each problem, stored when the worksheet is created
+        self.answer_key = answer_key or []
         self.completed = completed
         self.incorrect_problems = incorrect_problems or []
+        # Counts stored with the item, for worksheets read without their
+        # problems
+        self.stored_problem_count: Optional[int] = None
+        self.stored_incorrect_count: Optional[int] = None
+        self.stored_score: Optional[float] = None
+        self.stored_operation_counts: Optional[Dict[str, List[int]]] = None
         self.created_at = self.utc_now()
         self.updated_at = self.created_at
 
@@ -275,23 +286,60 @@ class Worksheet(DynamoDBModel):
     @property
     def problem_count(self) -> int:
         """Return the number of problems in the worksheet."""
-        return len(self.problems) if self.problems else 0
+        if self.problems:
+            return len(self.problems)
+        return self.stored_problem_count or 0
+
+    @property
+    def incorrect_count(self) -> int:
+        """Return the number of incorrectly answered problems."""
+        if not self.problems and self.stored_incorrect_count is not None:
+            return self.stored_incorrect_count
+        return len(self.incorrect_problems)
 
     @property
     def score(self) -> float:
         """Calculate the score as a percentage."""
-        if not self.completed or not self.problems:
+        if not self.problems and self.stored_score is not None:
+            return self.stored_score
+        if not self.completed or not self.problem_count:
             return 0.0
-        correct = len(self.problems) - len(self.incorrect_problems)
-        return (correct / len(self.problems)) * 100
+        correct = self.problem_count - self.incorrect_count
+        return (correct / self.problem_count) * 100
+
+    @property
+    def operation_counts(self) -> Dict[str, List[int]]:
+        """Count the problems and incorrect answers by operation.
+
+        Returns:
+            [problem count, incorrect count] by operation name.
+        """
+        if not self.problems and self.stored_operation_counts is not None:
+            return self.stored_operation_counts
+        incorrect = set(self.incorrect_problems)
+        counts = {}
+        for index, problem in enumerate(self.problems):
+            if isinstance(problem, dict):
+                operation = problem.get("type", "other")
+            else:
+                try:
+                    operation = Problem.parse(problem).operation
+                except ValueError:
+                    operation = "other"
+            operation_counts = counts.setdefault(operation, [0, 0])
+            operation_counts[0] += 1
+            operation_counts[1] += index in incorrect
+        return counts
 
     @classmethod
-    def create(cls, child_id: str, problems: str) -> "Worksheet":
+    def create(
+        cls, child_id: str, problems: str, answer_key: List[str] = None
+    ) -> "Worksheet":
         """Create a new worksheet."""
         # Convert problems from string to list if needed
         if isinstance(problems, str):
             problems = json.loads(problems)
-        return cls(child_id=child_id, problems=problems)
+        return cls(child_id=child_id, problems=problems, answer_key=answer_key)
 
     @classmethod
     def from_dict(cls, data: dict) -> "Worksheet":
@@ -321,6 +369,13 @@ class Worksheet(DynamoDBModel):
             except json.JSONDecodeError:
                 incorrect_problems = []
 
+        answer_key = data.get("answer_key", [])
+        if isinstance(answer_key, str):
+            try:
+                answer_key = json.loads(answer_key)
+            except json.JSONDecodeError:
+                answer_key = []
+
         # Create and return the worksheet instance
         worksheet = cls(
             child_id=child_id,
@@ -328,12 +383,20 @@ class Worksheet(DynamoDBModel):
             answers=answers,
             completed=data.get("completed", False),
             incorrect_problems=incorrect_problems,
+            answer_key=answer_key,
         )
 
         # Set the id, created_at, and updated_at fields
         worksheet.id = data.get("id", "")
         worksheet.created_at = data.get("created_at", "")
         worksheet.updated_at = data.get("updated_at", "")
+        worksheet.stored_problem_count = data.get("problem_count")
+        worksheet.stored_incorrect_count = data.get("incorrect_count")
+        worksheet.stored_score = data.get("score")
+        operation_counts = data.get("operation_counts")
+        if isinstance(operation_counts, str):
+            operation_counts = json.loads(operation_counts)
+        worksheet.stored_operation_counts = operation_counts
 
         return worksheet
 
@@ -346,6 +409,7 @@ class Worksheet(DynamoDBModel):
             "answers": json.dumps(self.answers),
             "completed": self.completed,
             "incorrect_problems": json.dumps(self.incorrect_problems),
+            "answer_key": json.dumps(self.answer_key),
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
@@ -359,6 +423,7 @@ class Worksheet(DynamoDBModel):
             answers=json.loads(item.get("answers", "[]")),
             completed=item.get("completed", False),
             incorrect_problems=json.loads(item.get("incorrect_problems", "[]")),
+            answer_key=json.loads(item.get("answer_key", "[]")),
         )
         worksheet.id = item.get("id", "")
         worksheet.created_at = item.get("created_at", "")
@@ -566,3 +631,281 @@ class Payment(DynamoDBModel):
             payment.description = data["description"]
 
         return payment
+
+
+class RenderJob(DynamoDBModel):
+    """Background PDF render job for DynamoDB."""
+
+    # Job status constants
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    # Jobs and their results are kept for a day
+    TTL_SECONDS = 24 * 60 * 60
+
+    def __init__(
+        self,
+        user_email: str,
+        worksheet_ids: List[str],
+        answer_key: bool = False,
+    ):
+        self.id = self.generate_id()
+        self.user_email = user_email
+        self.worksheet_ids = worksheet_ids
+        self.answer_key = answer_key
+        self.status = self.STATUS_PENDING
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created_at = self.utc_now()
+        self.updated_at = self.created_at
+        self.expires_at = self.created_at + self.TTL_SECONDS
+
+    @property
+    def is_finished(self) -> bool:
+        """Check whether the job has stopped, successfully or not."""
+        return self.status in [self.STATUS_DONE, self.STATUS_FAILED]
+
+    def is_expired(self) -> bool:
+        """Check whether the job is past its time to live."""
+        return self.expires_at < self.utc_now()
+
+    def finish(self, filename: str, content_type: str, result: bytes) -> None:
+        """Record the rendered file of a successful job."""
+        self.status = self.STATUS_DONE
+        self.filename = filename
+        self.content_type = content_type
+        self.result = result
+        self.updated_at = self.utc_now()
+
+    def fail(self, error: str) -> None:
+        """Record why a job failed, dropping any result."""
+        self.status = self.STATUS_FAILED
+        self.error = error
+        self.filename = None
+        self.content_type = None
+        self.result = None
+        self.updated_at = self.utc_now()
+
+    def to_status(self) -> Dict[str, Any]:
+        """Get the job status as shown to the user, without the result."""
+        status = {
+            "job_id": self.id,
+            "status": self.status,
+            "worksheet_ids": self.worksheet_ids,
+            "answer_key": self.answer_key,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if self.filename:
+            status["filename"] = self.filename
+        if self.error:
+            status["error"] = self.error
+        return status
+
+    def to_item(self) -> Dict[str, Dict[str, Any]]:
+        """Convert render job to DynamoDB item format."""
+        data = {
+            "id": self.id,
+            "user_email": self.user_email,
+            "worksheet_ids": json.dumps(self.worksheet_ids),
+            "answer_key": self.answer_key,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "expires_at": self.expires_at,
+        }
+
+        if self.filename:
+            data["filename"] = self.filename
+        if self.content_type:
+            data["content_type"] = self.content_type
+        if self.error:
+            data["error"] = self.error
+
+        item = self.to_dynamodb_item(data)
+        if self.result is not None:
+            item["result"] = {"B": self.result}
+        return item
+
+    @classmethod
+    def from_item(
+        cls, item: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Optional["RenderJob"]:
+        """Create RenderJob instance from DynamoDB item."""
+        if not item:
+            return None
+        data = cls.from_dynamodb_item(item)
+        if not data:
+            return None
+
+        job = cls(
+            user_email=data["user_email"],
+            worksheet_ids=json.loads(data["worksheet_ids"]),
+            answer_key=data["answer_key"],
+        )
+
+        job.id = data["id"]
+        job.status = data["status"]
+        job.created_at = int(data["created_at"])
+        job.updated_at = int(data["updated_at"])
+        job.expires_at = int(data["expires_at"])
+        job.filename = data.get("filename")
+        job.content_type = data.get("content_type")
+        job.error = data.get("error")
+
+        # Binary attributes are not converted by from_dynamodb_item
+        if "result" in item:
+            job.result = bytes(item["result"]["B"])
+
+        return job
+
+
+class ScoreSummary(DynamoDBModel):
+    """Rolling summary of a child's graded worksheets for DynamoDB.
+
+    Kept up to date as worksheets are graded, so score charts need one
+    small read instead of every worksheet the child has done.
+    """
+
+    # Number of latest scores kept for charts
+    RECENT_LIMIT = 50
+
+    def __init__(self, child_id: str):
+        self.child_id = child_id
+        self.graded_count = 0
+        self.score_total = 0.0
+        self.problem_count = 0
+        self.incorrect_count = 0
+        # [worksheet ID, date, score] of the latest graded worksheets,
+        # oldest first
+        self.recent: List[List[Any]] = []
+        # [problem count, incorrect count] by operation
+        self.operations: Dict[str, List[int]] = {}
+        # Number of times the summary has been saved, for conditional writes
+        self.version = 0
+        self.updated_at = self.utc_now()
+
+    @property
+    def average_score(self) -> Optional[float]:
+        """Average score of the graded worksheets, or None if there are none."""
+        if not self.graded_count:
+            return None
+        return self.score_total / self.graded_count
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        """Percentage of all graded problems answered correctly."""
+        if not self.problem_count:
+            return None
+        correct = self.problem_count - self.incorrect_count
+        return correct / self.problem_count * 100
+
+    @property
+    def recent_scores(self) -> List[float]:
+        """Latest scores, oldest first."""
+        return [score for _, _, score in self.recent]
+
+    @property
+    def recent_dates(self) -> List[str]:
+        """Dates of the latest scores, oldest first."""
+        return [date for _, date, _ in self.recent]
+
+    def operation_accuracy(self) -> Dict[str, float]:
+        """Percentage of problems answered correctly, by operation."""
+        return {
+            operation: (total - incorrect) / total * 100
+            for operation, (total, incorrect) in sorted(self.operations.items())
+            if total
+        }
+
+    def add(self, worksheet: "Worksheet", operations: Dict[str, List[int]]) -> None:
+        """Count a graded worksheet.
+
+        Args:
+            worksheet: Graded worksheet.
+            operations: [problem count, incorrect count] of the worksheet by
+                operation.
+        """
+        self._count(worksheet, operations, 1)
+        self.recent = [entry for entry in self.recent if entry[0] != worksheet.id]
+        self.recent.append(
+            [worksheet.id, _date_text(worksheet.created_at), round(worksheet.score, 1)]
+        )
+        self.recent.sort(key=lambda entry: entry[1])
+        del self.recent[: -self.RECENT_LIMIT]
+        self.updated_at = self.utc_now()
+
+    def remove(self, worksheet: "Worksheet", operations: Dict[str, List[int]]) -> None:
+        """Stop counting a worksheet, such as before counting its new grade.
+
+        Args:
+            worksheet: Worksheet as it was when it was counted.
+            operations: [problem count, incorrect count] of the worksheet by
+                operation, as they were when it was counted.
+        """
+        self._count(worksheet, operations, -1)
+        self.recent = [entry for entry in self.recent if entry[0] != worksheet.id]
+        self.updated_at = self.utc_now()
+
+    def _count(
+        self, worksheet: "Worksheet", operations: Dict[str, List[int]], sign: int
+    ) -> None:
+        """Add a worksheet to the totals, or subtract it with sign -1."""
+        self.graded_count += sign
+        self.score_total += sign * worksheet.score
+        self.problem_count += sign * worksheet.problem_count
+        self.incorrect_count += sign * worksheet.incorrect_count
+        for operation, (total, incorrect) in operations.items():
+            counts = self.operations.setdefault(operation, [0, 0])
+            counts[0] += sign * total
+            counts[1] += sign * incorrect
+            if not counts[0]:
+                del self.operations[operation]
+
+    def to_item(self) -> Dict[str, Dict[str, Any]]:
+        """Convert score summary to DynamoDB item format."""
+        return self.to_dynamodb_item(
+            {
+                "child_id": self.child_id,
+                "graded_count": self.graded_count,
+                "score_total": self.score_total,
+                "problem_count": self.problem_count,
+                "incorrect_count": self.incorrect_count,
+                "recent": json.dumps(self.recent),
+                "operations": json.dumps(self.operations),
+                "version": self.version,
+                "updated_at": self.updated_at,
+            }
+        )
+
+    @classmethod
+    def from_item(
+        cls, item: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Optional["ScoreSummary"]:
+        """Create ScoreSummary instance from DynamoDB item."""
+        if not item:
+            return None
+        data = cls.from_dynamodb_item(item)
+        if not data:
+            return None
+
+        summary = cls(child_id=data["child_id"])
+        summary.graded_count = int(data["graded_count"])
+        summary.score_total = data["score_total"]
+        summary.problem_count = int(data["problem_count"])
+        summary.incorrect_count = int(data["incorrect_count"])
+        summary.recent = json.loads(data["recent"])
+        summary.operations = json.loads(data["operations"])
+        summary.version = int(data.get("version", 0))
+        summary.updated_at = int(data["updated_at"])
+        return summary
+
+
+def _date_text(timestamp: Any) -> str:
+    """Format a datetime or Unix timestamp as YYYY-MM-DD."""
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime.fromtimestamp(int(timestamp))
+    return timestamp.strftime("%Y-%m-%d")
@@ -1,17 +1,21 @@
 """Repository class for DynamoDB operations."""
 
+import base64
 import json
 import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import boto3
+from botocore.exceptions import ClientError
 
 from .config import (
     CHILD_ID_INDEX,
     CHILDREN_TABLE,
     PARENT_EMAIL_INDEX,
     PAYMENTS_TABLE,
+    SCORE_SUMMARIES_TABLE,
     SESSION_TTL_ATTRIBUTE,
     SESSIONS_TABLE,
     SUBSCRIPTIONS_TABLE,
@@ -21,9 +25,89 @@ from .config import (
     USERS_TABLE,
     WORKSHEETS_TABLE,
 )
-from .models import Child, Payment, Session, Subscription, User
+from .models import Child, Payment, ScoreSummary, Session, Subscription, User
 from .models import Worksheet as WorksheetModel
 
+# Worksheets per page of a worksheet listing
+WORKSHEET_PAGE_SIZE = 20
+
+# Worksheet attributes shown in listings
+WORKSHEET_LIST_ATTRIBUTES = [
+    "id",
+    "child_id",
+    "created_at",
+    "completed",
+    "incorrect_problems",
+    "problem_count",
+]
+
+# Most keys a single BatchGetItem request may hold
+BATCH_GET_SIZE = 100
+
+# Most requests a single BatchWriteItem request may hold
+BATCH_WRITE_SIZE = 25
+
+# Attempts at a batch before unprocessed keys are given up on
+BATCH_ATTEMPTS = 5
+
+# Initial wait before retrying unprocessed keys, doubled on every retry
+BATCH_BACKOFF_SECONDS = 0.05
+
+
+def _encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode the last key of a worksheet page as a URL-safe cursor."""
+    data = json.dumps([key["created_at"]["N"], key["id"]["S"]])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def _decode_cursor(cursor: str, child_id: str) -> Dict[str, Any]:
+    """Decode a cursor into the start key of a child's worksheet page.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    try:
+        created_at, worksheet_id = json.loads(base64.urlsafe_b64decode(cursor))
+        int(created_at)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return {
+        "id": {"S": str(worksheet_id)},
+        "child_id": {"S": child_id},
+        "created_at": {"N": str(created_at)},
+    }
+
+
+def _chunks(values: List[Any], size: int) -> Iterable[List[Any]]:
+    """Split values into lists of at most size values."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _worksheet_from_item(item: Dict[str, Any]) -> WorksheetModel:
+    """Convert a worksheet item, which may be projected, to a worksheet."""
+    data = {
+        "id": item["id"]["S"],
+        "child_id": item.get("child_id", {}).get("S", ""),
+        "problems": item.get("problems", {}).get("S", "[]"),
+        "serial_number": item.get("serial_number", {}).get("S"),
+        "incorrect_problems": item.get("incorrect_problems", {}).get("S"),
+        "answers": item.get("answers", {}).get("S"),
+        "answer_key": item.get("answer_key", {}).get("S", "[]"),
+        "completed": item.get("completed", {}).get("BOOL", False),
+    }
+    for field in ("created_at", "updated_at"):
+        if field in item:
+            data[field] = datetime.fromtimestamp(int(item[field]["N"]))
+    for field in ("problem_count", "incorrect_count"):
+        if field in item:
+            data[field] = int(item[field]["N"])
+    if "score" in item:
+        data["score"] = float(item["score"]["N"])
+    if "operation_counts" in item:
+        data["operation_counts"] = item["operation_counts"]["S"]
+    return WorksheetModel.from_dict(data)
+
 
 class DynamoDBRepository:
     """Repository class for DynamoDB operations."""
@@ -101,6 +185,11 @@ class DynamoDBRepository:
         response = self.dynamodb.scan(TableName=CHILDREN_TABLE)
         return [Child.from_item(item) for item in response.get("Items", [])]
 
+    def batch_get_children(self, child_ids: Iterable[str]) -> Dict[str, Child]:
+        """Get children by ID in batches; missing children are left out."""
+        items = self._batch_get(CHILDREN_TABLE, child_ids)
+        return {item["id"]["S"]: Child.from_item(item) for item in items}
+
     # Session operations
     def get_session(self, token: str) -> Optional[Session]:
         """Get session by token."""
@@ -142,19 +231,7 @@ class DynamoDBRepository:
         if not item:
             return None
 
-        return WorksheetModel.from_dict(
-            {
-                "id": item["id"]["S"],
-                "child_id": item["child_id"]["S"],
-                "problems": item["problems"]["S"],
-                "created_at": datetime.fromtimestamp(int(item["created_at"]["N"])),
-                "updated_at": datetime.fromtimestamp(int(item["updated_at"]["N"])),
-                "serial_number": item.get("serial_number", {}).get("S"),
-                "incorrect_problems": item.get("incorrect_problems", {}).get("S"),
-                "answers": item.get("answers", {}).get("S"),
-                "completed": item.get("completed", {}).get("BOOL", False),
-            }
-        )
+        return _worksheet_from_item(item)
 
     def get_child_worksheets(self, child_id: str) -> List[WorksheetModel]:
         """Get all worksheets for a child."""
@@ -164,22 +241,59 @@ class DynamoDBRepository:
             KeyConditionExpression="child_id = :child_id",
             ExpressionAttributeValues={":child_id": {"S": child_id}},
         )
-        return [
-            WorksheetModel.from_dict(
-                {
-                    "id": item["id"]["S"],
-                    "child_id": item["child_id"]["S"],
-                    "problems": item["problems"]["S"],
-                    "created_at": datetime.fromtimestamp(int(item["created_at"]["N"])),
-                    "updated_at": datetime.fromtimestamp(int(item["updated_at"]["N"])),
-                    "serial_number": item.get("serial_number", {}).get("S"),
-                    "incorrect_problems": item.get("incorrect_problems", {}).get("S"),
-                    "answers": item.get("answers", {}).get("S"),
-                    "completed": item.get("completed", {}).get("BOOL", False),
-                }
-            )
-            for item in response.get("Items", [])
-        ]
+        return [_worksheet_from_item(item) for item in response.get("Items", [])]
+
+    def get_child_worksheet_page(
+        self,
+        child_id: str,
+        limit: int = WORKSHEET_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[WorksheetModel], Optional[str]]:
+        """Get a page of a child's worksheets, newest first.
+
+        Only the attributes shown in worksheet listings are fetched, so the
+        cost of a page does not depend on the size of the worksheets or on
+        how many worksheets the child has.
+
+        Args:
+            child_id: Child ID.
+            limit: Maximum number of worksheets on the page.
+            cursor: Cursor of the page, from a previous call. If None, gets
+                the first page.
+
+        Returns:
+            Tuple of the worksheets, without their problems and answers, and
+            the cursor of the next page, or None on the last page.
+
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        names = {f"#p{i}": name for i, name in enumerate(WORKSHEET_LIST_ATTRIBUTES)}
+        query = {
+            "TableName": WORKSHEETS_TABLE,
+            "IndexName": CHILD_ID_INDEX,
+            "KeyConditionExpression": "child_id = :child_id",
+            "ExpressionAttributeValues": {":child_id": {"S": child_id}},
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if cursor:
+            query["ExclusiveStartKey"] = _decode_cursor(cursor, child_id)
+        response = self.dynamodb.query(**query)
+        worksheets = [_worksheet_from_item(item) for item in response["Items"]]
+
+        # Worksheets saved before problem counts were stored
+        legacy = [w.id for w in worksheets if w.stored_problem_count is None]
+        if legacy:
+            counted = self.batch_get_worksheets(legacy, ["problems"])
+            for worksheet in worksheets:
+                if worksheet.id in counted:
+                    worksheet.problems = counted[worksheet.id].problems
+
+        last_key = response.get("LastEvaluatedKey")
+        return worksheets, _encode_cursor(last_key) if last_key else None
 
     def create_worksheet(self, worksheet: WorksheetModel) -> None:
         """Create a new worksheet."""
@@ -193,8 +307,13 @@ class DynamoDBRepository:
         # Handle problems which could be a list or a string
         if isinstance(worksheet.problems, list):
             item["problems"] = {"S": json.dumps(worksheet.problems)}
+            problem_count = len(worksheet.problems)
         else:
             item["problems"] = {"S": worksheet.problems}
+            problem_count = len(json.loads(worksheet.problems))
+
+        # Stored so listings can skip the problems
+        item["problem_count"] = {"N": str(problem_count)}
 
         # Handle created_at and updated_at which could be datetime or int
         if isinstance(worksheet.created_at, datetime):
@@ -219,6 +338,10 @@ class DynamoDBRepository:
         if worksheet.answers is not None:
             item["answers"] = {"S": json.dumps(worksheet.answers)}
 
+        # Answer key, for worksheets created with one
+        if worksheet.answer_key:
+            item["answer_key"] = {"S": json.dumps(worksheet.answer_key)}
+
         self.dynamodb.put_item(
             TableName=WORKSHEETS_TABLE,
             Item=item,
@@ -238,8 +361,13 @@ class DynamoDBRepository:
         # Handle problems which could be a list or a string
         if isinstance(worksheet.problems, list):
             item["problems"] = {"S": json.dumps(worksheet.problems)}
+            problem_count = len(worksheet.problems)
         else:
             item["problems"] = {"S": worksheet.problems}
+            problem_count = len(json.loads(worksheet.problems))
+
+        # Stored so listings can skip the problems
+        item["problem_count"] = {"N": str(problem_count)}
 
         # Handle created_at and updated_at which could be datetime or int
         if isinstance(worksheet.created_at, datetime):
@@ -256,6 +384,12 @@ class DynamoDBRepository:
         if hasattr(worksheet, "serial_number") and worksheet.serial_number:
             item["serial_number"] = {"S": worksheet.serial_number}
 
+        # Stored when graded so score summaries can skip the problems
+        if worksheet.completed:
+            item["incorrect_count"] = {"N": str(worksheet.incorrect_count)}
+            item["score"] = {"N": str(worksheet.score)}
+            item["operation_counts"] = {"S": json.dumps(worksheet.operation_counts)}
+
         # Always include incorrect_problems, even if it's an empty list
         if worksheet.incorrect_problems is not None:
             item["incorrect_problems"] = {"S": json.dumps(worksheet.incorrect_problems)}
@@ -264,6 +398,10 @@ class DynamoDBRepository:
         if worksheet.answers is not None:
             item["answers"] = {"S": json.dumps(worksheet.answers)}
 
+        # Answer key, for worksheets created with one
+        if worksheet.answer_key:
+            item["answer_key"] = {"S": json.dumps(worksheet.answer_key)}
+
         self.dynamodb.put_item(
             TableName=WORKSHEETS_TABLE,
             Item=item,
@@ -282,6 +420,74 @@ class DynamoDBRepository:
             print(f"Error deleting worksheet {worksheet_id}: {str(e)}")
             raise
 
+    def batch_get_worksheets(
+        self, worksheet_ids: Iterable[str], projection: Optional[List[str]] = None
+    ) -> Dict[str, WorksheetModel]:
+        """Get worksheets by ID in batches.
+
+        Args:
+            worksheet_ids: Worksheet IDs; missing worksheets are left out.
+            projection: Optional attributes to fetch, such as ["child_id"] for
+                an ownership check. The ID is always fetched. If None, fetches
+                whole worksheets.
+
+        Returns:
+            Worksheets by ID.
+        """
+        if projection is not None:
+            projection = ["id"] + [name for name in projection if name != "id"]
+        items = self._batch_get(WORKSHEETS_TABLE, worksheet_ids, projection)
+        return {item["id"]["S"]: _worksheet_from_item(item) for item in items}
+
+    def batch_delete_worksheets(self, worksheet_ids: Iterable[str]) -> None:
+        """Delete worksheets by ID in batches."""
+        self._batch_write(
+            WORKSHEETS_TABLE,
+            [
+                {"DeleteRequest": {"Key": {"id": {"S": worksheet_id}}}}
+                for worksheet_id in dict.fromkeys(worksheet_ids)
+            ],
+        )
+
+    # Score summary operations
+    def get_score_summary(self, child_id: str) -> Optional[ScoreSummary]:
+        """Get the score summary of a child."""
+        response = self.dynamodb.get_item(
+            TableName=SCORE_SUMMARIES_TABLE, Key={"child_id": {"S": child_id}}
+        )
+        return ScoreSummary.from_item(response.get("Item"))
+
+    def save_score_summary(self, summary: ScoreSummary) -> bool:
+        """Save the score summary of a child unless it changed since it was read.
+
+        The write is conditional on the version the summary was read at, so
+        concurrent grades and deletes cannot overwrite each other's changes.
+
+        Returns:
+            True if the summary was saved, or False if another writer saved it
+            first. The caller should then read it again and reapply its change.
+        """
+        if summary.version:
+            condition = {
+                "ConditionExpression": "version = :version",
+                "ExpressionAttributeValues": {":version": {"N": str(summary.version)}},
+            }
+        else:
+            # New summaries, and summaries saved before they were versioned
+            condition = {"ConditionExpression": "attribute_not_exists(version)"}
+
+        summary.version += 1
+        try:
+            self.dynamodb.put_item(
+                TableName=SCORE_SUMMARIES_TABLE, Item=summary.to_item(), **condition
+            )
+        except ClientError as e:
+            summary.version -= 1
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
     # Subscription operations
     def get_subscription_by_id(self, subscription_id: str) -> Optional[Subscription]:
         """Get subscription by ID."""
@@ -364,6 +570,65 @@ class DynamoDBRepository:
             TableName=PAYMENTS_TABLE, Key={"id": {"S": payment_id}}
         )
 
+    # Batch operations
+    def _batch_get(
+        self,
+        table: str,
+        ids: Iterable[str],
+        projection: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get items by ID with BatchGetItem.
+
+        IDs are deduplicated and requested in chunks of BATCH_GET_SIZE, and
+        unprocessed keys are retried with exponential backoff.
+
+        Raises:
+            RuntimeError: If keys are still unprocessed after BATCH_ATTEMPTS.
+        """
+        request = {}
+        if projection:
+            names = {f"#p{i}": name for i, name in enumerate(projection)}
+            request["ProjectionExpression"] = ", ".join(names)
+            request["ExpressionAttributeNames"] = names
+
+        items = []
+        keys = [{"id": {"S": id_}} for id_ in dict.fromkeys(ids)]
+        for chunk in _chunks(keys, BATCH_GET_SIZE):
+            pending = {table: dict(request, Keys=chunk)}
+            for attempt in range(BATCH_ATTEMPTS):
+                if attempt:
+                    time.sleep(BATCH_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                response = self.dynamodb.batch_get_item(RequestItems=pending)
+                items.extend(response.get("Responses", {}).get(table, []))
+                pending = response.get("UnprocessedKeys")
+                if not pending:
+                    break
+            else:
+                raise RuntimeError(f"Unprocessed keys in batch get from {table}")
+        return items
+
+    def _batch_write(self, table: str, requests: List[Dict[str, Any]]) -> None:
+        """Write put or delete requests with BatchWriteItem.
+
+        Requests are sent in chunks of BATCH_WRITE_SIZE, and unprocessed
+        requests are retried with exponential backoff.
+
+        Raises:
+            RuntimeError: If requests are still unprocessed after
+                BATCH_ATTEMPTS.
+        """
+        for chunk in _chunks(requests, BATCH_WRITE_SIZE):
+            pending = {table: chunk}
+            for attempt in range(BATCH_ATTEMPTS):
+                if attempt:
+                    time.sleep(BATCH_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                response = self.dynamodb.batch_write_item(RequestItems=pending)
+                pending = response.get("UnprocessedItems")
+                if not pending:
+                    break
+            else:
+                raise RuntimeError(f"Unprocessed items in batch write to {table}")
+
 
 _repository_instance = None
 
@@ -0,0 +1,72 @@
+"""Fonts available for rendering worksheets."""
+
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+logger = logging.getLogger(__name__)
+
+# Handwriting fonts, fetched with scripts/download_fonts.py
+FONTS_DIR = Path(__file__).resolve().parents[2] / "data" / "fonts"
+
+
+class FontChoice(Enum):
+    """Available worksheet font options."""
+
+    HELVETICA = "helvetica"
+    KIDS_HANDWRITING = "kids_handwriting"
+    CHILDRENS_HANDWRITING = "childrens_handwriting"
+    MESSY_HANDWRITING = "messy_handwriting"
+
+
+# TrueType file of each handwriting font, in FONTS_DIR
+FONT_FILES = {
+    FontChoice.KIDS_HANDWRITING: "KidsHandwriting.ttf",
+    FontChoice.CHILDRENS_HANDWRITING: "Childrens-Handwriting.ttf",
+    FontChoice.MESSY_HANDWRITING: "MessyHandwriting.ttf",
+}
+
+
+@dataclass(frozen=True)
+class FontFamily:
+    """Registered ReportLab font names used on a worksheet."""
+
+    regular: str
+    bold: str
+
+
+@lru_cache(maxsize=None)
+def font_family(choice: FontChoice) -> FontFamily:
+    """Get the fonts of a font choice, registering them on first use.
+
+    Each TrueType font is parsed and registered once per process; every
+    later render reuses the parsed font. ReportLab embeds only the glyphs
+    a document uses, so PDFs stay small.
+
+    Args:
+        choice: Font choice.
+
+    Returns:
+        Registered font names.
+
+    Raises:
+        FileNotFoundError: If the font file is missing.
+    """
+    if choice == FontChoice.HELVETICA:
+        return FontFamily(regular="Helvetica", bold="Helvetica-Bold")
+
+    path = FONTS_DIR / FONT_FILES[choice]
+    if not path.exists():
+        raise FileNotFoundError(f"Font file not found: {path}")
+
+    name = path.stem
+    pdfmetrics.registerFont(TTFont(name, str(path)))
+    logger.debug(f"Registered font {name} from {path}")
+
+    # Handwriting fonts have no bold face
+    return FontFamily(regular=name, bold=name)
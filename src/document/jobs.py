@@ -0,0 +1,150 @@
+"""Background rendering of worksheet PDFs in a local process pool."""
+
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from typing import List, Optional, Sequence, Tuple
+
+from src.database.jobs import JobStore
+from src.database.models import RenderJob
+from src.document.renderer import DocumentRenderer
+
+logger = logging.getLogger(__name__)
+
+# (name, problems, answers, worksheet_id) of a worksheet to render, as taken
+# by DocumentRenderer.stream_archive()
+RenderItem = Tuple[str, List[str], List[str], str]
+
+# Renderer reused by every job that runs in a worker process
+_worker_renderer: Optional[DocumentRenderer] = None
+
+
+def render_job(
+    worksheets: Sequence[RenderItem], answer_key: bool
+) -> Tuple[str, str, bytes]:
+    """Render the output of a job inside a worker process.
+
+    A single worksheet becomes a PDF of the worksheet, or of its answer key.
+    Several worksheets become a ZIP of PDFs, with answer keys if requested.
+
+    Args:
+        worksheets: Worksheets to render.
+        answer_key: Whether to render answer keys.
+
+    Returns:
+        Tuple of (filename, content_type, content).
+
+    Raises:
+        ValueError: If number of problems and answers don't match.
+    """
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = DocumentRenderer()
+
+    if len(worksheets) == 1:
+        [(name, problems, answers, worksheet_id)] = worksheets
+        pdf = BytesIO()
+        if answer_key:
+            _worker_renderer.create_answer_key(pdf, problems, answers, worksheet_id)
+            filename = f"{name}_key.pdf"
+        else:
+            _worker_renderer.create_worksheet(pdf, problems, worksheet_id)
+            filename = f"{name}.pdf"
+        return filename, "application/pdf", pdf.getvalue()
+
+    content = b"".join(
+        _worker_renderer.stream_archive(worksheets, answer_keys=answer_key)
+    )
+    return "worksheets.zip", "application/zip", content
+
+
+class RenderQueue:
+    """Renders PDFs in worker processes and records the jobs in a job store.
+
+    Web workers only enqueue jobs and read their status, so rendering never
+    holds a request. The pool is started on the first job.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 2):
+        """Initialize render queue.
+
+        Args:
+            store: Store where jobs and their results are kept.
+            workers: Number of worker processes.
+        """
+        self.store = store
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it if needed."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def submit(self, job: RenderJob, worksheets: Sequence[RenderItem]) -> RenderJob:
+        """Save a pending job and enqueue its rendering.
+
+        Args:
+            job: New job.
+            worksheets: Worksheets to render, in the order of job.worksheet_ids.
+
+        Returns:
+            The saved job.
+        """
+        self.store.save(job)
+        future = self._executor().submit(render_job, list(worksheets), job.answer_key)
+        future.add_done_callback(partial(self._finish, job))
+        logger.info(f"Queued render job {job.id} for {len(worksheets)} worksheets")
+        return job
+
+    def _finish(self, job: RenderJob, future: Future) -> None:
+        """Record the outcome of a job once its worker is done.
+
+        Results too large for the store fail the job. If saving the outcome
+        fails, the job is saved again as failed without its result, so it
+        never stays pending.
+        """
+        limit = self.store.max_result_bytes
+        try:
+            filename, content_type, content = future.result()
+        except Exception as e:
+            logger.error(f"Render job {job.id} failed: {str(e)}", exc_info=True)
+            job.fail(str(e))
+        else:
+            if limit is not None and len(content) > limit:
+                logger.warning(f"Render job {job.id} result too large: {len(content)}")
+                job.fail(
+                    f"The result is too large ({len(content)} bytes). "
+                    "Please select fewer worksheets."
+                )
+            else:
+                job.finish(filename, content_type, content)
+                logger.info(f"Render job {job.id} finished: {len(content)} bytes")
+
+        try:
+            self.store.save(job)
+        except Exception as e:
+            logger.error(f"Error saving render job {job.id}: {str(e)}", exc_info=True)
+            job.fail(f"Could not save the result: {str(e)}")
+            try:
+                self.store.save(job)
+            except Exception as e:
+                logger.error(
+                    f"Error saving failed render job {job.id}: {str(e)}", exc_info=True
+                )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes.
+
+        Args:
+            wait: Whether to wait for queued jobs to finish.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
@@ -1,57 +1,124 @@
 """Module for rendering worksheets and answer keys."""
 
 import logging
+import zipfile
+from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import qrcode
 from PIL import Image, ImageDraw, ImageFont
 from reportlab.lib.pagesizes import letter, portrait
-from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
+from src.document.fonts import FontChoice, font_family
 from src.document.template import LayoutChoice, TemplateManager
+from src.document.text import wrap_problem
+from src.qr_generator import QRMatrix, draw_qr_code, qr_matrix
 
 logger = logging.getLogger(__name__)
 
+# A file path, or any writable binary stream such as BytesIO or a response body
+PDFOutput = Union[str, BinaryIO]
+
+# Page furniture positions, shared with the SVG renderer
+WORKSHEET_TITLE = "Math Worksheet"
+ANSWER_KEY_TITLE = "Math Worksheet - Answer Key"
+TITLE_POSITION = (200, 750)
+DATE_LINE_POSITION = (50, 720)
+QR_POSITION = (500, 730)
+QR_SIZE = 40
+
+# Problem text starts this far right of the problem number
+PROBLEM_TEXT_INDENT = 35
+# Distance between wrapped word problem lines
+LINE_HEIGHT = 15
+
+
+@dataclass
+class RenderPlan:
+    """Layout, text wrapping and QR code shared by a worksheet and its key."""
+
+    worksheet_id: str
+    problems: List[str]
+    positions: List[Tuple[int, int, int]]
+    rois: List[Tuple[int, int, int, int]]
+    wrapped: List[Optional[Tuple[str, ...]]]  # None for single-line problems
+    boxes: List[Tuple[float, float, float, float]]  # (x, y, width, height)
+    pages: Tuple[range, ...]  # Indices of the problems on each page
+    qr_code: QRMatrix
+
 
 class DocumentRenderer:
     """Renders worksheets and answer keys as PDFs."""
 
-    def __init__(self, template_manager: Optional[TemplateManager] = None):
+    def __init__(
+        self,
+        template_manager: Optional[TemplateManager] = None,
+        font: FontChoice = FontChoice.HELVETICA,
+    ):
         """Initialize document renderer.
 
         Args:
             template_manager: Optional template manager. If None, creates a new one.
+            font: Font for all worksheet text. Handwriting fonts are registered
+                once per process and shared by every renderer.
         """
         self.template_manager = template_manager or TemplateManager()
+        self.fonts = font_family(font)
 
-    def _create_qr_code(self, worksheet_id: str) -> BytesIO:
-        """Generate a QR code for worksheet identification.
+    def _answer_boxes(
+        self,
+        positions: List[Tuple[int, int, int]],
+        rois: List[Tuple[int, int, int, int]],
+        wrapped: List[Optional[Tuple[str, ...]]],
+    ) -> List[Tuple[float, float, float, float]]:
+        """Place the answer box of every problem.
 
         Args:
-            worksheet_id: Unique identifier for worksheet.
+            positions: List of (x_problem, y, x_answer) tuples.
+            rois: List of (x1, y1, x2, y2) tuples for answer boxes.
+            wrapped: Wrapped lines of each problem, None for single-line ones.
 
         Returns:
-            BytesIO containing QR code image.
+            List of (x, y, width, height) rectangles.
         """
-        qr = qrcode.QRCode(
-            version=1,
-            box_size=10,
-            border=4,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-        )
-        qr.add_data(worksheet_id)
-        qr.make(fit=True)
+        boxes = []
+        for (_, y, _), (x1, y1, x2, y2), lines in zip(positions, rois, wrapped):
+            if lines is not None:
+                y1 = y - (len(lines) * LINE_HEIGHT) - 10  # Position box below text
+            boxes.append((x1, y1, x2 - x1, y2 - y1))
+        return boxes
+
+    @staticmethod
+    def answer_baseline(
+        y: float,
+        lines: Optional[Tuple[str, ...]],
+        box: Tuple[float, float, float, float],
+    ) -> float:
+        """Get the baseline of a problem's answer on an answer key.
 
-        qr_image = qr.make_image(fill_color="black", back_color="white")
-        byte_stream = BytesIO()
-        qr_image.save(byte_stream, format="PNG")
-        byte_stream.seek(0)
+        Args:
+            y: Baseline of the problem.
+            lines: Wrapped lines of the problem, None for single-line ones.
+            box: Answer box of the problem.
 
-        return byte_stream
+        Returns:
+            Baseline of the answer text.
+        """
+        if lines is not None:
+            return box[1] + 5  # Answer goes inside the box below text
+        return y
 
     def _render_text(
         self,
@@ -61,6 +128,10 @@ class DocumentRenderer:
         problems: List[str],
         answers: Optional[List[str]] = None,
         render_answers: bool = False,
+        wrapped: Optional[List[Optional[Tuple[str, ...]]]] = None,
+        boxes: Optional[List[Tuple[float, float, float, float]]] = None,
+        draw_boxes: bool = True,
+        start: int = 0,
     ) -> None:
         """Render problems and optionally answers into the PDF.
 
@@ -71,104 +142,230 @@ class DocumentRenderer:
             problems: List of problem strings.
             answers: Optional list of answer strings.
             render_answers: Whether to render answers.
+            wrapped: Optional pre-wrapped lines from wrap_problem() for each
+                problem. If None, problems are wrapped here.
+            boxes: Optional answer boxes from _answer_boxes(). If None,
+                boxes are placed here.
+            draw_boxes: Whether to draw the answer boxes. Combined documents
+                draw them once as a shared form instead.
+            start: Index of the first problem, used for numbering problems
+                on continuation pages.
         """
-        for i, ((x_problem, y, x_answer), roi) in enumerate(zip(positions, rois)):
+        if wrapped is None:
+            wrapped = [wrap_problem(p, self.fonts.regular) for p in problems]
+        if boxes is None:
+            boxes = self._answer_boxes(positions, rois, wrapped)
+
+        for i, ((x_problem, y, x_answer), box) in enumerate(zip(positions, boxes)):
             problem = problems[i]
+            lines = wrapped[i]
             answer = answers[i] if render_answers and answers else None
 
             # Render problem number
-            pdf.setFont("Helvetica-Bold", 12)
-            pdf.drawString(x_problem, y, f"{i + 1}.")
-            pdf.setFont("Helvetica", 12)
+            pdf.setFont(self.fonts.bold, 12)
+            pdf.drawString(x_problem, y, f"{start + i + 1}.")
+            pdf.setFont(self.fonts.regular, 12)
 
             # Handle word problems
-            is_word_problem = len(problem) > 30 or "?" in problem
-            if is_word_problem:
-                # Split into words and wrap text
-                words = problem.split()
-                lines = []
-                current_line = []
-                current_width = 0
-                max_width = 250  # Width for word problems
-
-                for word in words:
-                    word_width = pdf.stringWidth(word, "Helvetica", 12)
-                    space_width = pdf.stringWidth(" ", "Helvetica", 12)
-                    if current_width + word_width <= max_width:
-                        current_line.append(word)
-                        current_width += word_width + space_width
-                    else:
-                        lines.append(" ".join(current_line))
-                        current_line = [word]
-                        current_width = word_width
-
-                if current_line:
-                    lines.append(" ".join(current_line))
-
+            if lines is not None:
                 # Draw wrapped text
                 for j, line in enumerate(lines):
-                    pdf.drawString(x_problem + 35, y - j * 15, line)
-
-                # Draw answer box below the text
-                x1, y1, x2, y2 = roi
-                box_y = y - (len(lines) * 15) - 10  # Position box below text
-                pdf.rect(x1, box_y, x2 - x1, y2 - y1, stroke=1, fill=0)
-
-                # Render answer if needed
-                if render_answers and answer:
-                    pdf.drawString(x_answer, box_y + 5, str(answer))
+                    pdf.drawString(
+                        x_problem + PROBLEM_TEXT_INDENT, y - j * LINE_HEIGHT, line
+                    )
             else:
                 # Regular single-line problem
-                pdf.drawString(x_problem + 35, y, problem)
-                x1, y1, x2, y2 = roi
-                pdf.rect(x1, y1, x2 - x1, y2 - y1, stroke=1, fill=0)
+                pdf.drawString(x_problem + PROBLEM_TEXT_INDENT, y, problem)
 
-                # Render answer if needed
-                if render_answers and answer:
-                    pdf.drawString(x_answer, y, str(answer))
+            if draw_boxes:
+                pdf.rect(*box, stroke=1, fill=0)
 
-    def create_worksheet(
+            # Render answer if needed
+            if render_answers and answer:
+                pdf.drawString(
+                    x_answer, self.answer_baseline(y, lines, box), str(answer)
+                )
+
+    def plan(
         self,
-        filename: str,
         problems: List[str],
         worksheet_id: str,
         layout: Optional[LayoutChoice] = None,
-    ) -> None:
-        """Generate a math worksheet PDF.
+    ) -> RenderPlan:
+        """Compute everything a worksheet and its answer key have in common.
 
         Args:
-            filename: Output PDF path.
             problems: List of problem strings.
             worksheet_id: Worksheet ID.
             layout: Optional layout choice. If None, automatically chosen.
+
+        Returns:
+            Render plan for create_worksheet() and create_answer_key().
         """
-        # Create PDF
-        pdf = canvas.Canvas(filename, pagesize=portrait(letter))
-        width, height = letter
+        layout_plan = self.template_manager.plan_layout(
+            problems, layout, self.fonts.regular
+        )
+        positions = list(layout_plan.positions)
+        rois = list(layout_plan.rois)
+        wrapped = [wrap_problem(problem, self.fonts.regular) for problem in problems]
+        return RenderPlan(
+            worksheet_id=worksheet_id,
+            problems=problems,
+            positions=positions,
+            rois=rois,
+            wrapped=wrapped,
+            boxes=self._answer_boxes(positions, rois, wrapped),
+            pages=layout_plan.pages,
+            qr_code=qr_matrix(worksheet_id),
+        )
 
+    def _draw_furniture(
+        self,
+        pdf: canvas.Canvas,
+        boxes: List[Tuple[float, float, float, float]],
+        answer_key: bool,
+        date_line: str,
+    ) -> None:
+        """Draw the parts of a page that do not depend on the problem text.
+
+        Args:
+            pdf: PDF canvas to draw on.
+            boxes: Answer boxes on the page.
+            answer_key: Whether the page is an answer key.
+            date_line: Name and date line shown on worksheets.
+        """
         # Add header
-        pdf.setFont("Helvetica", 18)
-        pdf.drawString(200, 750, "Math Worksheet")
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        pdf.drawString(50, 720, f"Name: _______________    Date: {current_datetime}")
+        pdf.setFont(self.fonts.regular, 18)
+        if answer_key:
+            pdf.drawString(*TITLE_POSITION, ANSWER_KEY_TITLE)
+        else:
+            pdf.drawString(*TITLE_POSITION, WORKSHEET_TITLE)
+            pdf.drawString(*DATE_LINE_POSITION, date_line)
+
+        # Add answer boxes
+        for box in boxes:
+            pdf.rect(*box, stroke=1, fill=0)
+
+    def _draw_page(
+        self,
+        pdf: canvas.Canvas,
+        plan: RenderPlan,
+        answers: Optional[List[str]] = None,
+        date_line: str = "",
+        forms: Optional[Dict[Tuple, str]] = None,
+    ) -> None:
+        """Draw the pages of one worksheet or answer key.
 
-        # Add QR code in the top-right corner
-        qr_code = self._create_qr_code(worksheet_id)
-        pdf.drawImage(ImageReader(qr_code), 500, 730, width=40, height=40)
+        A new page is started between pages, but not after the last one.
 
-        # Calculate layout
-        positions, rois = self.template_manager.calculate_layout(
-            len(problems), problems, layout
+        Args:
+            pdf: PDF canvas to draw on.
+            plan: Render plan of the worksheet.
+            answers: Answers to show. If None, draws a worksheet.
+            date_line: Name and date line shown on worksheets.
+            forms: Form XObjects already defined in the document, keyed by
+                their content. If given, the page furniture is drawn as a
+                form defined once per document and referenced on each page.
+        """
+        answer_key = answers is not None
+        for page_number, page in enumerate(plan.pages):
+            if page_number:
+                pdf.showPage()
+            on_page = slice(page.start, page.stop)
+            boxes = plan.boxes[on_page]
+
+            if forms is None:
+                self._draw_furniture(pdf, boxes, answer_key, date_line)
+            else:
+                key = (answer_key, date_line, tuple(boxes))
+                name = forms.get(key)
+                if name is None:
+                    name = f"PageFurniture{len(forms)}"
+                    pdf.beginForm(name)
+                    self._draw_furniture(pdf, boxes, answer_key, date_line)
+                    pdf.endForm()
+                    forms[key] = name
+                pdf.doForm(name)
+
+            # Add QR code in the top-right corner
+            draw_qr_code(pdf, plan.qr_code, *QR_POSITION, QR_SIZE)
+
+            # Render problems, and answers for answer keys
+            self._render_text(
+                pdf,
+                plan.positions[on_page],
+                plan.rois[on_page],
+                plan.problems[on_page],
+                answers[on_page] if answer_key else None,
+                render_answers=answer_key,
+                wrapped=plan.wrapped[on_page],
+                boxes=boxes,
+                draw_boxes=False,
+                start=page.start,
+            )
+
+    def _canvas(self, filename: PDFOutput) -> canvas.Canvas:
+        """Start a letter-size PDF whose only fonts are the worksheet fonts."""
+        return canvas.Canvas(
+            filename,
+            pagesize=portrait(letter),
+            initialFontName=self.fonts.regular,
+            initialFontSize=12,
         )
 
-        # Render problems
-        self._render_text(pdf, positions, rois, problems)
+    @staticmethod
+    def _date_line() -> str:
+        """Name and date line for worksheets rendered now."""
+        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"Name: _______________    Date: {current_datetime}"
 
+    def _draw_worksheet(self, filename: PDFOutput, plan: RenderPlan) -> None:
+        """Draw a worksheet PDF from a render plan."""
+        pdf = self._canvas(filename)
+        self._draw_page(pdf, plan, date_line=self._date_line())
         pdf.save()
 
+    def _draw_answer_key(
+        self, filename: PDFOutput, plan: RenderPlan, answers: List[str]
+    ) -> None:
+        """Draw an answer key PDF from a render plan."""
+        pdf = self._canvas(filename)
+        self._draw_page(pdf, plan, answers)
+        pdf.save()
+
+    @staticmethod
+    def _check_answers(problems: List[str], answers: List[str]) -> None:
+        """Make sure there is one answer per problem.
+
+        Raises:
+            ValueError: If number of problems and answers don't match.
+        """
+        if len(problems) != len(answers):
+            raise ValueError(
+                f"Number of problems ({len(problems)}) doesn't match "
+                f"number of answers ({len(answers)})"
+            )
+
+    def create_worksheet(
+        self,
+        filename: PDFOutput,
+        problems: List[str],
+        worksheet_id: str,
+        layout: Optional[LayoutChoice] = None,
+    ) -> None:
+        """Generate a math worksheet PDF.
+
+        Args:
+            filename: Output PDF path or writable binary stream.
+            problems: List of problem strings.
+            worksheet_id: Worksheet ID.
+            layout: Optional layout choice. If None, automatically chosen.
+        """
+        self._draw_worksheet(filename, self.plan(problems, worksheet_id, layout))
+
     def create_answer_key(
         self,
-        filename: str,
+        filename: PDFOutput,
         problems: List[str],
         answers: List[str],
         worksheet_id: str,
@@ -177,7 +374,7 @@ class DocumentRenderer:
         """Generate an answer key PDF.
 
         Args:
-            filename: Output PDF path.
+            filename: Output PDF path or writable binary stream.
             problems: List of problem strings.
             answers: List of answer strings.
             worksheet_id: Worksheet ID.
@@ -186,30 +383,151 @@ class DocumentRenderer:
         Raises:
             ValueError: If number of problems and answers don't match.
         """
-        if len(problems) != len(answers):
-            raise ValueError(
-                f"Number of problems ({len(problems)}) doesn't match "
-                f"number of answers ({len(answers)})"
-            )
+        self._check_answers(problems, answers)
+        self._draw_answer_key(
+            filename, self.plan(problems, worksheet_id, layout), answers
+        )
 
-        # Create PDF
-        pdf = canvas.Canvas(filename, pagesize=portrait(letter))
-        width, height = letter
+    def render_pair(
+        self,
+        worksheet_filename: PDFOutput,
+        answer_key_filename: PDFOutput,
+        problems: List[str],
+        answers: List[str],
+        worksheet_id: str,
+        layout: Optional[LayoutChoice] = None,
+    ) -> None:
+        """Generate a worksheet and its answer key from one render plan.
 
-        # Add header
-        pdf.setFont("Helvetica", 18)
-        pdf.drawString(200, 750, "Math Worksheet - Answer Key")
+        The layout, word problem wrapping and QR code are computed once and
+        shared by both PDFs.
 
-        # Add QR code in the top-right corner
-        qr_code = self._create_qr_code(worksheet_id)
-        pdf.drawImage(ImageReader(qr_code), 500, 730, width=40, height=40)
+        Args:
+            worksheet_filename: Output path or stream of the worksheet PDF.
+            answer_key_filename: Output path or stream of the answer key PDF.
+            problems: List of problem strings.
+            answers: List of answer strings.
+            worksheet_id: Worksheet ID.
+            layout: Optional layout choice. If None, automatically chosen.
 
-        # Calculate layout
-        positions, rois = self.template_manager.calculate_layout(
-            len(problems), problems, layout
-        )
+        Raises:
+            ValueError: If number of problems and answers don't match.
+        """
+        self._check_answers(problems, answers)
+        plan = self.plan(problems, worksheet_id, layout)
+        self._draw_worksheet(worksheet_filename, plan)
+        self._draw_answer_key(answer_key_filename, plan, answers)
 
-        # Render problems and answers
-        self._render_text(pdf, positions, rois, problems, answers, render_answers=True)
+    def create_document(
+        self,
+        filename: PDFOutput,
+        worksheets: Iterable[Tuple[List[str], List[str], str]],
+        answer_keys: bool = False,
+        layout: Optional[LayoutChoice] = None,
+    ) -> int:
+        """Generate one PDF holding many worksheets, e.g. for a class set.
+
+        Each worksheet's pages come first, followed by the answer key pages if
+        requested. Page furniture (title, name and date line, answer boxes)
+        is drawn once as a form XObject for every distinct page shape and
+        referenced from each page, and all pages share font resources.
+
+        Args:
+            filename: Output PDF path or writable binary stream.
+            worksheets: (problems, answers, worksheet_id) tuples.
+            answer_keys: Whether to add an answer key page per worksheet.
+            layout: Optional layout choice. If None, chosen per worksheet.
+
+        Returns:
+            Number of pages written.
+
+        Raises:
+            ValueError: If number of problems and answers don't match.
+        """
+        plans = []
+        for problems, answers, worksheet_id in worksheets:
+            if answer_keys:
+                self._check_answers(problems, answers)
+            plans.append((self.plan(problems, worksheet_id, layout), answers))
+
+        pdf = self._canvas(filename)
+        forms: Dict[Tuple, str] = {}
+        date_line = self._date_line()
+
+        for plan, _ in plans:
+            self._draw_page(pdf, plan, date_line=date_line, forms=forms)
+            pdf.showPage()
+        if answer_keys:
+            for plan, answers in plans:
+                self._draw_page(pdf, plan, answers, forms=forms)
+                pdf.showPage()
 
         pdf.save()
+
+        pages = sum(len(plan.pages) for plan, _ in plans) * (2 if answer_keys else 1)
+        logger.debug(f"Rendered {pages} pages using {len(forms)} shared forms")
+        return pages
+
+    def stream_archive(
+        self,
+        worksheets: Iterable[Tuple[str, List[str], List[str], str]],
+        answer_keys: bool = False,
+    ) -> Iterator[bytes]:
+        """Render worksheets into a ZIP archive, yielding it in chunks.
+
+        Each worksheet is rendered in memory and written to the archive,
+        then the archive bytes produced so far are yielded. Memory use stays
+        at one worksheet however many are downloaded, and the chunks can be
+        sent with chunked transfer encoding as they are produced.
+
+        Args:
+            worksheets: (name, problems, answers, worksheet_id) tuples. The
+                name is used for the file names in the archive.
+            answer_keys: Whether to add each worksheet's answer key.
+
+        Yields:
+            Consecutive chunks of the ZIP archive.
+
+        Raises:
+            ValueError: If number of problems and answers don't match.
+        """
+        stream = _ChunkStream()
+        # PDF content is already compressed, so entries are stored as is
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, problems, answers, worksheet_id in worksheets:
+                worksheet_pdf = BytesIO()
+                if answer_keys:
+                    answer_key_pdf = BytesIO()
+                    self.render_pair(
+                        worksheet_pdf, answer_key_pdf, problems, answers, worksheet_id
+                    )
+                    archive.writestr(f"{name}_key.pdf", answer_key_pdf.getvalue())
+                else:
+                    self.create_worksheet(worksheet_pdf, problems, worksheet_id)
+                archive.writestr(f"{name}.pdf", worksheet_pdf.getvalue())
+                yield stream.drain()
+
+        # Central directory, written when the archive is closed
+        yield stream.drain()
+
+
+class _ChunkStream:
+    """Write-only stream whose contents are collected and drained in chunks."""
+
+    def __init__(self):
+        """Initialize chunk stream."""
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """Buffer data until the next drain()."""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush; data is kept until drained."""
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,180 @@
+"""SVG rendering of worksheets for display in the browser."""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import letter
+
+from src.document.renderer import (
+    ANSWER_KEY_TITLE,
+    DATE_LINE_POSITION,
+    LINE_HEIGHT,
+    PROBLEM_TEXT_INDENT,
+    QR_POSITION,
+    QR_SIZE,
+    TITLE_POSITION,
+    WORKSHEET_TITLE,
+    DocumentRenderer,
+    RenderPlan,
+)
+from src.document.template import LayoutChoice
+from src.qr_generator import qr_runs
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+
+# Number of rendered worksheets kept in memory
+SVG_CACHE_SIZE = 256
+
+# Date line of browser previews, which are not tied to a print time
+BLANK_DATE_LINE = "Name: _______________    Date: _______________"
+
+# CSS fallbacks for the fonts registered with ReportLab
+FONT_FALLBACKS = {
+    "Helvetica": "Helvetica,Arial,sans-serif",
+}
+
+
+def _num(value: float) -> str:
+    """Format a coordinate compactly."""
+    return f"{round(value, 2):g}"
+
+
+def _text(x: float, y: float, text: str, css_class: Optional[str] = None) -> str:
+    """Draw text with its baseline at PDF coordinates (x, y)."""
+    class_attr = f' class="{css_class}"' if css_class else ""
+    return (
+        f'<text x="{_num(x)}" y="{_num(PAGE_HEIGHT - y)}"{class_attr}>'
+        f"{escape(text)}</text>"
+    )
+
+
+class SVGRenderer:
+    """Renders worksheet and answer key pages as SVG.
+
+    Pages are drawn from the same render plan as the PDFs, so positions,
+    answer boxes, wrapping and QR codes match the printed worksheet. The
+    result is a compact string per page, memoized per worksheet so it can
+    be served inline repeatedly.
+    """
+
+    def __init__(
+        self,
+        renderer: Optional[DocumentRenderer] = None,
+        cache_size: int = SVG_CACHE_SIZE,
+    ):
+        """Initialize SVG renderer.
+
+        Args:
+            renderer: Optional document renderer whose layout and fonts are
+                used. If None, creates a new one.
+            cache_size: Number of rendered worksheets kept in memory.
+        """
+        self.renderer = renderer or DocumentRenderer()
+        self._render_cached = lru_cache(maxsize=cache_size)(self._render)
+
+        fonts = self.renderer.fonts
+        family = FONT_FALLBACKS.get(fonts.regular, f"{fonts.regular},cursive")
+        bold = ".b{font-weight:bold}" if fonts.bold != fonts.regular else ""
+        self._style = (
+            f"<style>text{{font:12px {family}}}{bold}"
+            ".h{font-size:18px}.a{fill:none;stroke:#000}</style>"
+        )
+
+    def render_pages(
+        self,
+        problems: List[str],
+        worksheet_id: str,
+        answers: Optional[List[str]] = None,
+        layout: Optional[LayoutChoice] = None,
+        date_line: str = BLANK_DATE_LINE,
+    ) -> Tuple[str, ...]:
+        """Render the pages of a worksheet, or of its answer key.
+
+        Args:
+            problems: List of problem strings.
+            worksheet_id: Worksheet ID.
+            answers: Answers to show. If None, renders the worksheet.
+            layout: Optional layout choice. If None, automatically chosen.
+            date_line: Name and date line shown on worksheets.
+
+        Returns:
+            One SVG document per page.
+
+        Raises:
+            ValueError: If number of problems and answers don't match.
+        """
+        if answers is not None:
+            DocumentRenderer._check_answers(problems, answers)
+            answers = tuple(answers)
+        return self._render_cached(
+            tuple(problems), worksheet_id, answers, layout, date_line
+        )
+
+    def _render(
+        self,
+        problems: Tuple[str, ...],
+        worksheet_id: str,
+        answers: Optional[Tuple[str, ...]],
+        layout: Optional[LayoutChoice],
+        date_line: str,
+    ) -> Tuple[str, ...]:
+        """Render every page of a worksheet; memoized by render_pages()."""
+        plan = self.renderer.plan(list(problems), worksheet_id, layout)
+        return tuple(self._page(plan, page, answers, date_line) for page in plan.pages)
+
+    def _page(
+        self,
+        plan: RenderPlan,
+        page: range,
+        answers: Optional[Tuple[str, ...]],
+        date_line: str,
+    ) -> str:
+        """Render one page of a plan, mirroring DocumentRenderer._draw_page()."""
+        parts = [
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="0 0 {_num(PAGE_WIDTH)} {_num(PAGE_HEIGHT)}" '
+            f'width="{_num(PAGE_WIDTH)}" height="{_num(PAGE_HEIGHT)}" '
+            'style="background:#fff">',
+            self._style,
+        ]
+
+        # Page furniture
+        if answers is not None:
+            parts.append(_text(*TITLE_POSITION, ANSWER_KEY_TITLE, "h"))
+        else:
+            parts.append(_text(*TITLE_POSITION, WORKSHEET_TITLE, "h"))
+            parts.append(_text(*DATE_LINE_POSITION, date_line, "h"))
+
+        for x, y, width, height in plan.boxes[page.start : page.stop]:
+            parts.append(
+                f'<rect class="a" x="{_num(x)}" y="{_num(PAGE_HEIGHT - y - height)}" '
+                f'width="{_num(width)}" height="{_num(height)}"/>'
+            )
+
+        # QR code, one path of dark module runs
+        qr_x, qr_y = QR_POSITION
+        module = QR_SIZE / len(plan.qr_code)
+        top = PAGE_HEIGHT - qr_y - QR_SIZE
+        path = "".join(
+            f"M{_num(qr_x + column * module)} {_num(top + row * module)}"
+            f"h{_num(length * module)}v{_num(module)}h{_num(-length * module)}z"
+            for row, column, length in qr_runs(plan.qr_code)
+        )
+        parts.append(f'<path d="{path}"/>')
+
+        # Problems, and answers for answer keys
+        for i in page:
+            x_problem, y, x_answer = plan.positions[i]
+            lines = plan.wrapped[i]
+            parts.append(_text(x_problem, y, f"{i + 1}.", "b"))
+            for j, line in enumerate(lines or (plan.problems[i],)):
+                parts.append(
+                    _text(x_problem + PROBLEM_TEXT_INDENT, y - j * LINE_HEIGHT, line)
+                )
+            if answers is not None and answers[i]:
+                answer_y = DocumentRenderer.answer_baseline(y, lines, plan.boxes[i])
+                parts.append(_text(x_answer, answer_y, str(answers[i])))
+
+        parts.append("</svg>")
+        return "".join(parts)
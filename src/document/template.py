@@ -3,10 +3,16 @@
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
+from src.document.text import PROBLEM_FONT, is_word_problem, wrap_problem
+
 logger = logging.getLogger(__name__)
 
+# Number of distinct worksheet shapes whose layout is kept in memory
+LAYOUT_CACHE_SIZE = 256
+
 
 class LayoutChoice(Enum):
     """Available worksheet layout options."""
@@ -23,10 +29,43 @@ class LayoutConfig:
     column_limits: List[int]
     x_positions: Dict[str, int]
     y_start: int = 680
+    y_end: int = 50  # Nothing is placed below this on a page
     row_spacing: int = 40
     word_problem_spacing: int = 80  # Extra space for word problems
+    line_spacing: int = 15  # Distance between wrapped word problem lines
     answer_box_dimensions: Tuple[int, int, int, int] = (0, -10, 80, 20)
 
+    def row_height(self, lines: int) -> int:
+        """Vertical space taken by a problem.
+
+        Args:
+            lines: Number of text lines of the problem.
+
+        Returns:
+            Height in points, including the space before the next problem.
+        """
+        if lines <= 1:
+            return self.row_spacing
+        # Wrapped text is followed by its answer box
+        return max(
+            self.word_problem_spacing, lines * self.line_spacing + self.row_spacing
+        )
+
+
+@dataclass(frozen=True)
+class LayoutPlan:
+    """Immutable placement of every problem of a worksheet."""
+
+    layout_choice: LayoutChoice
+    positions: Tuple[Tuple[int, int, int], ...]  # (x_problem, y, x_answer)
+    rois: Tuple[Tuple[int, int, int, int], ...]  # (x1, y1, x2, y2)
+    pages: Tuple[range, ...]  # Indices of the problems on each page
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages the problems flow over."""
+        return len(self.pages)
+
 
 class TemplateManager:
     """Manages worksheet templates and layouts."""
@@ -64,13 +103,57 @@ class TemplateManager:
             The most appropriate layout choice.
         """
         # Count word problems
-        word_problems = sum(1 for p in problems if len(p) > 30 or "?" in p)
+        word_problems = sum(1 for p in problems if is_word_problem(p))
 
         # Use one column if there are too many word problems
         if word_problems > len(problems) * 0.3:  # More than 30% are word problems
             return LayoutChoice.ONE_COLUMN
         return LayoutChoice.TWO_COLUMN
 
+    @staticmethod
+    def height_signature(
+        problems: List[str], font_name: str = PROBLEM_FONT
+    ) -> Tuple[int, ...]:
+        """Get the number of text lines of every problem.
+
+        Worksheets with the same layout choice and signature share a layout.
+
+        Args:
+            problems: List of problem strings.
+            font_name: Registered ReportLab font name of the problem text.
+
+        Returns:
+            Line count of each problem.
+        """
+        signature = []
+        for problem in problems:
+            lines = wrap_problem(problem, font_name)
+            signature.append(1 if lines is None else len(lines))
+        return tuple(signature)
+
+    def plan_layout(
+        self,
+        problems: List[str],
+        layout_choice: Optional[LayoutChoice] = None,
+        font_name: str = PROBLEM_FONT,
+    ) -> LayoutPlan:
+        """Lay out problems, flowing them over as many pages as needed.
+
+        Plans are memoized per layout choice and height signature, so
+        repeated worksheet shapes are laid out once.
+
+        Args:
+            problems: List of problem strings.
+            layout_choice: Optional layout choice. If None, automatically chosen.
+            font_name: Registered ReportLab font name of the problem text.
+
+        Returns:
+            Layout plan of the worksheet.
+        """
+        if layout_choice is None:
+            layout_choice = self.choose_layout(problems)
+        return _paginate(layout_choice, self.height_signature(problems, font_name))
+
     def calculate_layout(
         self,
         num_problems: int,
@@ -79,6 +162,9 @@ class TemplateManager:
     ) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int, int, int]]]:
         """Calculate positions and ROIs for problems based on layout choice.
 
+        Positions repeat from the top of the page on every page; use
+        plan_layout() to know which problems share a page.
+
         Args:
             num_problems: Number of problems to layout
             problems: List of problem strings
@@ -89,44 +175,66 @@ class TemplateManager:
             - positions is a list of (x_problem, y, x_answer) tuples
             - rois is a list of (x1, y1, x2, y2) tuples for answer boxes
         """
-        if layout_choice is None:
-            layout_choice = self.choose_layout(problems)
-
-        config = self.LAYOUT_CONFIGS[layout_choice]
-        positions = []
-        rois = []
-
-        # Initialize y-positions for each column
-        y_positions = {col: config.y_start for col in config.columns}
-
-        # Calculate positions column by column
-        for i in range(num_problems):
-            # Determine which column to use
-            col_idx = i % len(config.columns)
-            column = config.columns[col_idx]
-
-            # Get x-positions for this column
+        plan = self.plan_layout(problems[:num_problems], layout_choice)
+        return list(plan.positions), list(plan.rois)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _paginate(layout_choice: LayoutChoice, heights: Tuple[int, ...]) -> LayoutPlan:
+    """Flow problems row by row over pages.
+
+    Problems fill the columns of a row left to right. A row is as tall as
+    its tallest problem, and starts a new page when it would cross the
+    bottom margin or a column is full.
+
+    Args:
+        layout_choice: Layout to use.
+        heights: Line count of each problem, from height_signature().
+
+    Returns:
+        Layout plan of the worksheet.
+    """
+    config = TemplateManager.LAYOUT_CONFIGS[layout_choice]
+    columns = len(config.columns)
+    rows_per_page = min(config.column_limits)
+    x1, y1_offset, x2, y2_offset = config.answer_box_dimensions
+
+    positions = []
+    rois = []
+    pages = []
+    page_start = 0
+    rows = 0
+    y = config.y_start
+
+    for row_start in range(0, len(heights), columns):
+        row = heights[row_start : row_start + columns]
+        row_height = max(config.row_height(lines) for lines in row)
+
+        # Start a new page when this row does not fit
+        if rows and (rows == rows_per_page or y - row_height < config.y_end):
+            pages.append(range(page_start, row_start))
+            page_start = row_start
+            rows = 0
+            y = config.y_start
+
+        for column in config.columns[: len(row)]:
             x_problem = config.x_positions[f"{column}_problem"]
             x_answer = config.x_positions[f"{column}_answer"]
-
-            # Get current y-position for this column
-            y = y_positions[column]
-
-            # Add position
             positions.append((x_problem, y, x_answer))
-
-            # Calculate ROI
-            x1, y1_offset, x2, y2_offset = config.answer_box_dimensions
-            rois.append(
-                (
-                    x_answer + x1,
-                    y + y1_offset,
-                    x_answer + x2,
-                    y + y2_offset,
-                )
-            )
-
-            # Update y-position for next problem in this column
-            y_positions[column] -= config.row_spacing
-
-        return positions, rois
+            rois.append((x_answer + x1, y + y1_offset, x_answer + x2, y + y2_offset))
+
+        y -= row_height
+        rows += 1
+
+    pages.append(range(page_start, len(heights)))
+
+    logger.debug(
+        f"Laid out {len(heights)} problems over {len(pages)} pages "
+        f"with the {layout_choice.value} layout"
+    )
+    return LayoutPlan(
+        layout_choice=layout_choice,
+        positions=tuple(positions),
+        rois=tuple(rois),
+        pages=tuple(pages),
+    )
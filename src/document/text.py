@@ -0,0 +1,123 @@
+"""Text measurement and wrapping shared by layout and rendering."""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Problems longer than this, or containing a question, are word problems
+WORD_PROBLEM_LENGTH = 30
+
+# Font and wrap width of word problem text
+PROBLEM_FONT = "Helvetica"
+PROBLEM_FONT_SIZE = 12
+WORD_PROBLEM_WIDTH = 250
+
+# Number of distinct problem wraps kept in memory
+WRAP_CACHE_SIZE = 4096
+
+
+def is_word_problem(problem: str) -> bool:
+    """Check whether a problem is a word problem that needs wrapping.
+
+    Args:
+        problem: Problem string.
+
+    Returns:
+        True for word problems.
+    """
+    return len(problem) > WORD_PROBLEM_LENGTH or "?" in problem
+
+
+class _GlyphWidths(dict):
+    """Glyph widths of one font in font units, measured on first use."""
+
+    def __init__(self, font_name: str):
+        """Initialize glyph width table.
+
+        Args:
+            font_name: Registered ReportLab font name.
+        """
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, char: str) -> float:
+        """Measure a glyph the first time it is seen."""
+        width = self[char] = stringWidth(char, self.font_name, 1000)
+        return width
+
+
+@lru_cache(maxsize=None)
+def glyph_widths(font_name: str) -> Dict[str, float]:
+    """Get the glyph width table of a font.
+
+    Widths are in font units (1/1000 of the font size), so one table
+    serves every size of the font.
+
+    Args:
+        font_name: Registered ReportLab font name.
+
+    Returns:
+        Mapping of characters to widths, filled in lazily.
+    """
+    return _GlyphWidths(font_name)
+
+
+def text_width(text: str, font_name: str, font_size: float) -> float:
+    """Measure text the same way as ReportLab's stringWidth().
+
+    Args:
+        text: Text to measure.
+        font_name: Registered ReportLab font name.
+        font_size: Font size in points.
+
+    Returns:
+        Width in points.
+    """
+    widths = glyph_widths(font_name)
+    return 0.001 * font_size * sum(widths[char] for char in text)
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_problem(
+    problem: str,
+    font_name: str = PROBLEM_FONT,
+    font_size: float = PROBLEM_FONT_SIZE,
+    max_width: float = WORD_PROBLEM_WIDTH,
+) -> Optional[Tuple[str, ...]]:
+    """Wrap a word problem into lines that fit the problem column.
+
+    Results are memoized per problem, so the layout and render stages and
+    repeated worksheets share one wrap.
+
+    Args:
+        problem: Problem string.
+        font_name: Registered ReportLab font name.
+        font_size: Font size in points.
+        max_width: Maximum line width in points.
+
+    Returns:
+        Lines of a word problem, or None for single-line problems.
+    """
+    if not is_word_problem(problem):
+        return None
+
+    space_width = text_width(" ", font_name, font_size)
+    lines = []
+    current_line = []
+    current_width = 0
+
+    for word in problem.split():
+        word_width = text_width(word, font_name, font_size)
+        if current_width + word_width <= max_width:
+            current_line.append(word)
+            current_width += word_width + space_width
+        else:
+            lines.append(" ".join(current_line))
+            current_line = [word]
+            current_width = word_width
+
+    if current_line:
+        lines.append(" ".join(current_line))
+
+    return tuple(lines)
@@ -1,9 +1,15 @@
 """Main application module for math worksheet generation."""
 
 import logging
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from src.document.renderer import DocumentRenderer
 from src.document.template import LayoutChoice
@@ -12,6 +18,91 @@ from src.problem_generator import ProblemGenerator
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class WorksheetSpec:
+    """Request for one worksheet in a batch run."""
+
+    age: int
+    count: int = 30
+    layout: LayoutChoice = LayoutChoice.TWO_COLUMN
+    difficulty: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class WorksheetResult:
+    """Output paths and timings for one worksheet in a batch run."""
+
+    spec: WorksheetSpec
+    seed: int
+    worksheet_path: str
+    answer_key_path: str
+    generation_seconds: float
+    render_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        """Total time spent producing the worksheet."""
+        return self.generation_seconds + self.render_seconds
+
+
+# Renderer reused by every task that runs in a worker process
+_worker_renderer: Optional[DocumentRenderer] = None
+
+
+def _produce_worksheet(
+    spec: WorksheetSpec,
+    seed: int,
+    worksheet_id: str,
+    worksheets_dir: Path,
+    answer_keys_dir: Path,
+) -> WorksheetResult:
+    """Generate and render one worksheet inside a worker process.
+
+    Args:
+        spec: Worksheet to produce.
+        seed: Seed for the worksheet's problem generator.
+        worksheet_id: Unique worksheet identifier, also used for file names.
+        worksheets_dir: Directory for the worksheet PDF.
+        answer_keys_dir: Directory for the answer key PDF.
+
+    Returns:
+        Paths and timings for the worksheet.
+    """
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = DocumentRenderer()
+
+    start = time.perf_counter()
+    [(problems, answers)] = ProblemGenerator(seed=seed).generate_worksheet_batch(
+        age=spec.age,
+        difficulty=spec.difficulty,
+        count=spec.count,
+        n=1,
+    )
+    generated = time.perf_counter()
+
+    worksheet_path = worksheets_dir / f"{worksheet_id}.pdf"
+    answer_key_path = answer_keys_dir / f"{worksheet_id}_key.pdf"
+    _worker_renderer.render_pair(
+        str(worksheet_path),
+        str(answer_key_path),
+        problems,
+        answers,
+        worksheet_id,
+        spec.layout,
+    )
+    rendered = time.perf_counter()
+
+    return WorksheetResult(
+        spec=spec,
+        seed=seed,
+        worksheet_path=str(worksheet_path),
+        answer_key_path=str(answer_key_path),
+        generation_seconds=generated - start,
+        render_seconds=rendered - generated,
+    )
+
+
 class MathTutor:
     """Main application class for math worksheet generation."""
 
@@ -57,29 +148,95 @@ class MathTutor:
             ValueError: If age is not supported or difficulty is invalid.
         """
         # Generate problems
-        problems, answers = self.generator.generate_math_problems(
+        [(problems, answers)] = self.generator.generate_worksheet_batch(
             age=age,
-            count=count,
             difficulty=difficulty,
+            count=count,
+            n=1,
         )
 
         # Generate unique ID and paths
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-        worksheet_id = f"math_worksheet_{timestamp}"
+        worksheet_id = f"math_worksheet_{timestamp}_{uuid.uuid4().hex[:8]}"
 
         worksheet_path = self.worksheets_dir / f"{worksheet_id}.pdf"
         answer_key_path = self.answer_keys_dir / f"{worksheet_id}_key.pdf"
 
         # Create worksheet and answer key
-        self.renderer.create_worksheet(
-            str(worksheet_path), problems, worksheet_id, layout
-        )
-        self.renderer.create_answer_key(
-            str(answer_key_path), problems, answers, worksheet_id, layout
+        self.renderer.render_pair(
+            str(worksheet_path),
+            str(answer_key_path),
+            problems,
+            answers,
+            worksheet_id,
+            layout,
         )
 
         return str(worksheet_path), str(answer_key_path)
 
+    def generate_worksheets(
+        self,
+        specs: Sequence[WorksheetSpec],
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> List[WorksheetResult]:
+        """Generate many worksheets and answer keys in parallel.
+
+        Problem generation and PDF rendering are both CPU bound, so each
+        worksheet runs as a separate task in a process pool. Every task gets
+        its own seed and output paths, so tasks share no state and the
+        results do not depend on scheduling.
+
+        Args:
+            specs: Worksheets to produce.
+            workers: Number of worker processes. Defaults to the CPU count.
+                A value of 1 produces the worksheets in this process.
+            seed: Optional seed for the whole run. The same seed and specs
+                always produce the same problems.
+
+        Returns:
+            List of results in the same order as specs.
+
+        Raises:
+            ValueError: If a spec has an unsupported age or invalid difficulty.
+        """
+        workers = workers or os.cpu_count() or 1
+        seed_source = random.Random(seed)
+        seeds = [seed_source.getrandbits(64) for _ in specs]
+
+        # The random run ID keeps runs started in the same second apart
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        run_id = uuid.uuid4().hex[:8]
+        worksheet_ids = [
+            f"math_worksheet_{timestamp}_{run_id}_{index:04d}"
+            for index in range(len(specs))
+        ]
+        tasks = [
+            (spec, task_seed, worksheet_id, self.worksheets_dir, self.answer_keys_dir)
+            for spec, task_seed, worksheet_id in zip(specs, seeds, worksheet_ids)
+        ]
+
+        start = time.perf_counter()
+        if workers == 1 or len(tasks) <= 1:
+            results = [_produce_worksheet(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                results = list(pool.map(_produce_worksheet, *zip(*tasks)))
+        elapsed = time.perf_counter() - start
+
+        for result in results:
+            logger.info(
+                f"Worksheet {Path(result.worksheet_path).stem}: "
+                f"generation {result.generation_seconds:.3f}s, "
+                f"render {result.render_seconds:.3f}s"
+            )
+        logger.info(
+            f"Generated {len(results)} worksheets with {workers} workers "
+            f"in {elapsed:.2f} seconds"
+        )
+
+        return results
+
 
 if __name__ == "__main__":
     # Example usage
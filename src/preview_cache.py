@@ -0,0 +1,69 @@
+"""Short-lived cache of the problems shown in worksheet previews."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+# How long a preview can be reused by the worksheet generated after it
+PREVIEW_TTL_SECONDS = 300
+
+# Number of previews kept in memory
+PREVIEW_CACHE_SIZE = 1024
+
+Preview = Tuple[List[str], List[str]]
+
+
+class PreviewCache:
+    """Previewed (problems, answers), kept per user and settings.
+
+    Repeated previews with unchanged settings show the same problems, and
+    the worksheet generated next with those settings starts with them.
+    Entries expire after a short time and the cache is bounded, dropping
+    the least recently used entry first. The cache is local to the process.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PREVIEW_TTL_SECONDS,
+        max_entries: int = PREVIEW_CACHE_SIZE,
+    ):
+        """Initialize preview cache.
+
+        Args:
+            ttl: Seconds an entry stays valid.
+            max_entries: Maximum number of entries kept.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Preview]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Preview]:
+        """Get an unexpired preview, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, preview = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return preview
+
+    def put(self, key: Hashable, preview: Preview) -> None:
+        """Store a preview, evicting the oldest entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, preview)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Preview]:
+        """Remove and return an unexpired preview, or None."""
+        preview = self.get(key)
+        if preview is not None:
+            with self._lock:
+                self._entries.pop(key, None)
+        return preview
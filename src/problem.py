@@ -0,0 +1,151 @@
+"""Structured value type for math problems."""
+
+import re
+from fractions import Fraction
+from typing import Union
+
+from src.problem_types import OPERATORS
+
+Number = Union[int, Fraction]
+
+# Operator used for fraction problems such as "3/4"
+FRACTION = "/"
+
+# Operation name of each operator, for per-operation statistics
+OPERATION_NAMES = {symbol: name for name, symbol in OPERATORS.items()}
+OPERATION_NAMES[FRACTION] = "fraction"
+
+# Matches "12 × 4", "12×4" and "3/4"
+_PROBLEM_PATTERN = re.compile(
+    r"^\s*(\d+)\s*([%s])\s*(\d+)\s*$"
+    % re.escape("".join(OPERATORS.values()) + FRACTION)
+)
+
+
+def evaluate(left: int, operator: str, right: int) -> Number:
+    """Compute the exact answer of a problem.
+
+    Args:
+        left: Left operand (numerator for fractions)
+        operator: One of the OPERATORS symbols or FRACTION
+        right: Right operand (denominator for fractions)
+
+    Returns:
+        The answer as an int, or a Fraction when it is not whole
+
+    Raises:
+        ValueError: If the operator is unknown
+        ZeroDivisionError: If dividing by zero
+    """
+    if operator == OPERATORS["addition"]:
+        return left + right
+    if operator == OPERATORS["subtraction"]:
+        return left - right
+    if operator == OPERATORS["multiplication"]:
+        return left * right
+    if operator == OPERATORS["division"]:
+        quotient = Fraction(left, right)
+        return quotient.numerator if quotient.denominator == 1 else quotient
+    if operator == FRACTION:
+        return Fraction(left, right)
+    raise ValueError(f"Unknown operator: {operator}")
+
+
+class Problem:
+    """A math problem with its operands, operator and exact answer."""
+
+    __slots__ = ("left", "operator", "right", "answer", "_text", "_answer_text")
+
+    def __init__(self, left: int, operator: str, right: int, answer: Number = None):
+        """Initialize problem.
+
+        Args:
+            left: Left operand (numerator for fractions)
+            operator: One of the OPERATORS symbols or FRACTION
+            right: Right operand (denominator for fractions)
+            answer: Exact answer. If None, computed from the operands.
+        """
+        self.left = left
+        self.operator = operator
+        self.right = right
+        self.answer = evaluate(left, operator, right) if answer is None else answer
+        self._text = None
+        self._answer_text = None
+
+    @property
+    def text(self) -> str:
+        """Printable problem, e.g. "12 × 4" or "3/4"."""
+        if self._text is None:
+            if self.operator == FRACTION:
+                self._text = f"{self.left}/{self.right}"
+            else:
+                self._text = f"{self.left} {self.operator} {self.right}"
+        return self._text
+
+    @property
+    def operation(self) -> str:
+        """Operation name, e.g. "multiplication" or "fraction"."""
+        return OPERATION_NAMES[self.operator]
+
+    @property
+    def answer_text(self) -> str:
+        """Printable answer; fractions are shown as a decimal to 3 places."""
+        if self._answer_text is None:
+            if self.operator == FRACTION or isinstance(self.answer, Fraction):
+                self._answer_text = str(round(float(self.answer), 3))
+            else:
+                self._answer_text = str(self.answer)
+        return self._answer_text
+
+    def to_compact(self) -> str:
+        """Serialize to a compact string such as "12×4"."""
+        return f"{self.left}{self.operator}{self.right}"
+
+    @classmethod
+    def from_compact(cls, data: str) -> "Problem":
+        """Deserialize a string produced by to_compact()."""
+        return cls.parse(data)
+
+    @classmethod
+    def parse(cls, text: str) -> "Problem":
+        """Parse problem text without evaluating it as Python.
+
+        Args:
+            text: Problem text such as "12 × 4", "12×4" or "3/4"
+
+        Returns:
+            The parsed Problem
+
+        Raises:
+            ValueError: If the text is not a two-operand problem
+        """
+        match = _PROBLEM_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Cannot parse problem: {text!r}")
+        left, operator, right = match.groups()
+        try:
+            return cls(int(left), operator, int(right))
+        except ZeroDivisionError:
+            raise ValueError(f"Division by zero in problem: {text!r}")
+
+    def __eq__(self, other: object) -> bool:
+        """Problems are equal when operands and operator match."""
+        if not isinstance(other, Problem):
+            return NotImplemented
+        return (self.left, self.operator, self.right) == (
+            other.left,
+            other.operator,
+            other.right,
+        )
+
+    def __hash__(self) -> int:
+        """Hash on operands and operator."""
+        return hash((self.left, self.operator, self.right))
+
+    def __str__(self) -> str:
+        """Return the printable problem."""
+        return self.text
+
+    def __repr__(self) -> str:
+        """Return a debug representation."""
+        return f"Problem({self.text!r}, answer={self.answer_text!r})"
@@ -0,0 +1,294 @@
+"""Precomputed problem bank backed by a memory-mapped file.
+
+The bank stores every distinct problem for each (age, problem type,
+difficulty bucket) as fixed-width integer rows. Rows are laid out in
+ProblemSpace order, so row i of a segment is the problem that index i
+decodes to. The file is opened with mmap: worker processes that open the
+same bank share its pages through the OS page cache instead of each
+holding a copy.
+
+File layout::
+
+    BANK_MAGIC | header length (uint64) | JSON header | padding | rows
+"""
+
+import json
+import logging
+import random
+import struct
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from src.problem import FRACTION, Problem
+from src.problem_strategy import DIFFICULTY_BUCKETS, ProblemStrategy, difficulty_bucket
+from src.problem_types import OPERATORS, PROBLEM_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Identifies problem bank files and their format version
+BANK_MAGIC = b"MTBANK01"
+
+# Row data starts on a multiple of this many bytes
+BANK_ALIGNMENT = 64
+
+# One row per problem; answers are exact fractions in lowest terms
+BANK_DTYPE = np.dtype(
+    [
+        ("left", "<i4"),
+        ("right", "<i4"),
+        ("answer_num", "<i4"),
+        ("answer_den", "<i4"),
+    ]
+)
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+class BankSegment:
+    """The problems of one (age, problem type, difficulty bucket).
+
+    Offers the same sampling interface as ProblemSpace, but decodes indices
+    by reading rows instead of computing them.
+    """
+
+    def __init__(self, rows: np.ndarray, operator: str):
+        """Initialize bank segment.
+
+        Args:
+            rows: Memory-mapped rows of the segment.
+            operator: Operator symbol of the segment's problems.
+        """
+        self.rows = rows
+        self.operator = operator
+
+    def __len__(self) -> int:
+        """Return the number of distinct problems in the segment."""
+        return len(self.rows)
+
+    def sample(self, count: int, rng: random.Random) -> np.ndarray:
+        """Sample distinct row indices without replacement.
+
+        Args:
+            count: Number of indices to draw.
+            rng: Random source.
+
+        Returns:
+            Array of distinct row indices.
+
+        Raises:
+            ValueError: If count is larger than the segment.
+        """
+        return np.array(rng.sample(range(len(self.rows)), count), dtype=np.int64)
+
+    def sample_array(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Sample distinct row indices without replacement using NumPy.
+
+        Args:
+            count: Number of indices to draw.
+            rng: NumPy random generator.
+
+        Returns:
+            Array of distinct row indices.
+
+        Raises:
+            ValueError: If count is larger than the segment.
+        """
+        return rng.choice(len(self.rows), size=count, replace=False)
+
+    def problems(self, indices: np.ndarray) -> List[Problem]:
+        """Read the problems at the given row indices.
+
+        Args:
+            indices: Row indices between 0 and len(self) - 1.
+
+        Returns:
+            List of problems in index order.
+        """
+        rows = self.rows[indices]
+        return [
+            Problem(
+                left,
+                self.operator,
+                right,
+                numerator if denominator == 1 else Fraction(numerator, denominator),
+            )
+            for left, right, numerator, denominator in zip(
+                rows["left"].tolist(),
+                rows["right"].tolist(),
+                rows["answer_num"].tolist(),
+                rows["answer_den"].tolist(),
+            )
+        ]
+
+
+class ProblemBank:
+    """Read-only, memory-mapped problem bank."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Open a problem bank file.
+
+        Args:
+            path: Path of a file written by build_problem_bank().
+
+        Raises:
+            ValueError: If the file is not a problem bank.
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as bank_file:
+            magic = bank_file.read(len(BANK_MAGIC))
+            if magic != BANK_MAGIC:
+                raise ValueError(f"Not a problem bank file: {self.path}")
+            (header_length,) = _HEADER_LENGTH.unpack(
+                bank_file.read(_HEADER_LENGTH.size)
+            )
+            header = json.loads(bank_file.read(header_length))
+
+        self.rows = np.memmap(
+            self.path,
+            dtype=BANK_DTYPE,
+            mode="r",
+            offset=header["data_offset"],
+            shape=(header["rows"],),
+        )
+        self._segments: Dict[Tuple[int, str, int], BankSegment] = {}
+        for key, (start, stop) in header["segments"].items():
+            age, problem_type, bucket = key.split("|")
+            self._segments[(int(age), problem_type, int(bucket))] = BankSegment(
+                self.rows[start:stop], header["operators"][problem_type]
+            )
+
+        logger.info(
+            f"Opened problem bank {self.path} with {header['rows']} problems "
+            f"in {len(self._segments)} segments"
+        )
+
+    def segment(
+        self, age: int, problem_type: str, difficulty: float
+    ) -> Optional[BankSegment]:
+        """Get the problems for an age, problem type and difficulty.
+
+        Args:
+            age: Student age
+            problem_type: Problem type key in PROBLEM_TYPES
+            difficulty: Difficulty level from 0.0 to 1.0
+
+        Returns:
+            The bank segment, or None if the bank does not cover it
+        """
+        return self._segments.get((age, problem_type, difficulty_bucket(difficulty)))
+
+
+def _answer_columns(
+    left: np.ndarray, operator: str, right: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute exact answers as (numerator, denominator) arrays.
+
+    Vectorized equivalent of problem.evaluate().
+    """
+    if operator == OPERATORS["addition"]:
+        return left + right, np.ones_like(left)
+    if operator == OPERATORS["subtraction"]:
+        return left - right, np.ones_like(left)
+    if operator == OPERATORS["multiplication"]:
+        return left * right, np.ones_like(left)
+    if operator in (OPERATORS["division"], FRACTION):
+        divisor = np.gcd(left, right)
+        return left // divisor, right // divisor
+    raise ValueError(f"Unknown operator: {operator}")
+
+
+def build_problem_bank(
+    path: Union[str, Path], strategies: Mapping[str, ProblemStrategy]
+) -> int:
+    """Enumerate every problem space and write it as a problem bank.
+
+    Buckets whose problem space is identical share one segment.
+
+    Args:
+        path: Output file path.
+        strategies: Strategy for each problem type.
+
+    Returns:
+        Number of problems written.
+    """
+    chunks = []
+    segments = {}
+    operators = {}
+    rows = 0
+    for age, problem_types in PROBLEM_TYPES.items():
+        for problem_type, (min_val, max_val) in problem_types.items():
+            strategy = strategies.get(problem_type)
+            if strategy is None:
+                logger.warning(f"Strategy not found for problem type: {problem_type}")
+                continue
+            operators[problem_type] = strategy.operator
+
+            known = {}
+            for bucket in range(DIFFICULTY_BUCKETS + 1):
+                space = strategy.problem_space(
+                    min_val, max_val, bucket / DIFFICULTY_BUCKETS, age
+                )
+                shape = (
+                    space.first.tobytes(),
+                    space.second_min.tobytes(),
+                    space.offsets.tobytes(),
+                )
+                if shape not in known:
+                    left, right, _ = strategy.build_batch(
+                        *space.decode(np.arange(len(space)))
+                    )
+                    chunk = np.empty(len(space), dtype=BANK_DTYPE)
+                    chunk["left"] = left
+                    chunk["right"] = right
+                    chunk["answer_num"], chunk["answer_den"] = _answer_columns(
+                        chunk["left"], strategy.operator, chunk["right"]
+                    )
+                    chunks.append(chunk)
+                    known[shape] = (rows, rows + len(space))
+                    rows += len(space)
+                segments[f"{age}|{problem_type}|{bucket}"] = known[shape]
+
+    # The header records where the rows start, so size it before encoding
+    header = {"rows": rows, "operators": operators, "segments": segments}
+    prefix = len(BANK_MAGIC) + _HEADER_LENGTH.size
+    data_offset = 0
+    while True:
+        header["data_offset"] = data_offset
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        needed = -(-(prefix + len(encoded)) // BANK_ALIGNMENT) * BANK_ALIGNMENT
+        if needed == data_offset:
+            break
+        data_offset = needed
+
+    with open(path, "wb") as bank_file:
+        bank_file.write(BANK_MAGIC)
+        bank_file.write(_HEADER_LENGTH.pack(len(encoded)))
+        bank_file.write(encoded)
+        bank_file.write(b"\0" * (data_offset - prefix - len(encoded)))
+        for chunk in chunks:
+            bank_file.write(chunk.tobytes())
+
+    logger.info(f"Wrote problem bank {path} with {rows} problems")
+    return rows
+
+
+def open_problem_bank(path: Union[str, Path]) -> Optional[ProblemBank]:
+    """Open a problem bank if the file exists.
+
+    Args:
+        path: Path of the problem bank file.
+
+    Returns:
+        The problem bank, or None if there is no usable bank at path
+    """
+    if not path or not Path(path).exists():
+        logger.info(f"No problem bank at {path}; generating problems directly")
+        return None
+    try:
+        return ProblemBank(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not open problem bank {path}: {e}")
+        return None
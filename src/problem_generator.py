@@ -2,9 +2,15 @@
 
 import logging
 import random
+import threading
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Type
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
+import numpy as np
+
+from src.problem import Problem
+from src.problem_bank import BankSegment, ProblemBank
 from src.problem_generators.basic_operations import (
     AdditionStrategy,
     SubtractionStrategy,
@@ -14,12 +20,25 @@ from src.problem_generators.multiplication import (
     DivisionStrategy,
     MultiplicationStrategy,
 )
-from src.problem_strategy import ProblemStrategy
-from src.problem_types import get_difficulty_weights, get_problem_types_for_age
+from src.problem_sampler import get_problem_type_sampler
+from src.problem_strategy import ProblemSpace, ProblemStrategy
+from src.problem_types import get_problem_types_for_age
 
 logger = logging.getLogger(__name__)
 
 
+def as_text(problems: List[Problem]) -> Tuple[List[str], List[str]]:
+    """Convert problems into the (problems, answers) string lists.
+
+    Args:
+        problems: List of problems.
+
+    Returns:
+        Tuple of (problems, answers) lists.
+    """
+    return [p.text for p in problems], [p.answer_text for p in problems]
+
+
 class ProblemGenerator:
     """Generates age-appropriate math problems."""
 
@@ -32,10 +51,27 @@ class ProblemGenerator:
         "fractions": FractionStrategy,
     }
 
-    def __init__(self, seed: Optional[int] = None):
-        """Initialize problem generator."""
-        if seed is not None:
-            random.seed(seed)
+    def __init__(self, seed: Optional[int] = None, bank: Optional[ProblemBank] = None):
+        """Initialize problem generator.
+
+        Args:
+            seed: Optional seed for reproducible problems. Only this
+                generator's random sources are seeded; the global random
+                module is left untouched.
+            bank: Optional precomputed problem bank. When set, problems are
+                read from the bank instead of being built from operands.
+                The bank holds the same problems in the same order, so a
+                seed produces the same problems either way.
+        """
+        self.rng = random.Random(seed)
+        self.bank = bank
+
+        # Random source for the vectorized batch engine, derived from rng so
+        # one seed reproduces both
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        # Guards rng while forking child generators from several threads
+        self._fork_lock = threading.Lock()
 
         # Initialize strategy instances
         self.strategies: Dict[str, ProblemStrategy] = {
@@ -43,6 +79,20 @@ class ProblemGenerator:
             for problem_type, strategy_class in self.STRATEGY_MAP.items()
         }
 
+    def fork(self) -> "ProblemGenerator":
+        """Create an independent generator, e.g. for a single request.
+
+        A generator is not safe to share between threads, so concurrent
+        callers should each work on their own fork. Forks are seeded from
+        this generator's stream, which keeps seeded runs reproducible.
+
+        Returns:
+            New ProblemGenerator with its own random sources.
+        """
+        with self._fork_lock:
+            seed = self.rng.getrandbits(64)
+        return type(self)(seed=seed, bank=self.bank)
+
     def get_school_year_progress(self) -> float:
         """Calculate current progress in school year (0.0 to 1.0)."""
         current_month = datetime.now().month
@@ -52,6 +102,147 @@ class ProblemGenerator:
             month_in_year = current_month + 5
         return month_in_year / 10.0
 
+    def _resolve_difficulty(self, difficulty: Optional[float]) -> float:
+        """Validate difficulty, defaulting to the school year progress.
+
+        Raises:
+            ValueError: If difficulty is outside 0.0 to 1.0.
+        """
+        if difficulty is None:
+            return self.get_school_year_progress()
+        if not 0.0 <= difficulty <= 1.0:
+            raise ValueError("Difficulty must be between 0.0 and 1.0")
+        return difficulty
+
+    def _problem_spaces(self, age: int, difficulty: float) -> Dict[str, ProblemSpace]:
+        """Build the problem space of every problem type for an age.
+
+        With a problem bank, spaces the bank covers are bank segments.
+
+        Args:
+            age: Age of student.
+            difficulty: Difficulty level from 0.0 to 1.0.
+
+        Returns:
+            Dictionary of problem types and their non-empty problem spaces.
+        """
+        problem_types = get_problem_types_for_age(age)
+        spaces = {}
+        for problem_type, (min_val, max_val) in problem_types.items():
+            if self.bank is not None:
+                segment = self.bank.segment(age, problem_type, difficulty)
+                if segment is not None:
+                    if len(segment):
+                        spaces[problem_type] = segment
+                    continue
+            try:
+                strategy = self.strategies[problem_type]
+                space = strategy.problem_space(min_val, max_val, difficulty, age)
+            except KeyError:
+                logger.warning(f"Strategy not found for problem type: {problem_type}")
+                continue
+            if len(space):
+                spaces[problem_type] = space
+        return spaces
+
+    def count_unique_problems(
+        self, age: int, difficulty: Optional[float] = None
+    ) -> int:
+        """Count the distinct problems available for an age and difficulty.
+
+        Args:
+            age: Age of student.
+            difficulty: Optional difficulty level from 0.0 to 1.0.
+                      If None, uses current school year progress.
+
+        Returns:
+            Number of distinct problems across all problem types.
+
+        Raises:
+            ValueError: If age group is not supported or difficulty is invalid.
+        """
+        difficulty = self._resolve_difficulty(difficulty)
+        return sum(
+            len(space) for space in self._problem_spaces(age, difficulty).values()
+        )
+
+    def iter_problems(
+        self,
+        age: int,
+        difficulty: Optional[float] = None,
+        count: Optional[int] = None,
+        page_size: int = 30,
+    ) -> Iterator[Problem]:
+        """Lazily yield age-appropriate math problems, one page at a time.
+
+        Each page is sampled without replacement from the problem spaces, so
+        problems are unique within a page while memory stays proportional to
+        page_size however many problems are streamed. Later pages may repeat
+        problems from earlier ones.
+
+        Args:
+            age: Age of student.
+            difficulty: Optional difficulty level from 0.0 to 1.0.
+                      If None, uses current school year progress.
+            count: Total number of problems to yield. If None, yields forever.
+            page_size: Number of problems per uniqueness page.
+
+        Yields:
+            Problems with exact answers.
+
+        Raises:
+            ValueError: If age group is not supported, difficulty is invalid,
+                page_size is less than 1, or a page (page_size, or count if
+                smaller) is larger than the number of distinct problems.
+                Raised when iteration starts.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        difficulty = self._resolve_difficulty(difficulty)
+
+        # Get the cached problem type sampler for this difficulty
+        sampler = get_problem_type_sampler(age, difficulty)
+        largest_page = page_size if count is None else min(page_size, count)
+        spaces = self._check_capacity(age, difficulty, largest_page)
+
+        produced = 0
+        while count is None or produced < count:
+            size = page_size if count is None else min(page_size, count - produced)
+
+            # Choose problem type for each slot based on weights
+            slot_types = sampler.draw_many(size, self.rng)
+            slot_types = self._allocate_types(slot_types, sampler.weights, spaces)
+
+            yield from self._build_problems(
+                slot_types, spaces, lambda space, k: space.sample(k, self.rng)
+            )
+            produced += size
+
+    def generate_problems(
+        self, age: int, count: Optional[int] = 30, difficulty: Optional[float] = None
+    ) -> List[Problem]:
+        """Generate age-appropriate math problems as Problem records.
+
+        All problems are unique. Generation time does not depend on how
+        often duplicates would be drawn.
+
+        Args:
+            age: Age of student.
+            count: Number of problems to generate (default 30).
+            difficulty: Optional difficulty level from 0.0 to 1.0.
+                      If None, uses current school year progress.
+
+        Returns:
+            List of problems with exact answers.
+
+        Raises:
+            ValueError: If age group is not supported, difficulty is invalid,
+                or count is larger than the number of distinct problems.
+        """
+        return list(
+            self.iter_problems(age, difficulty, count=count, page_size=max(count, 1))
+        )
+
     def generate_math_problems(
         self, age: int, count: Optional[int] = 30, difficulty: Optional[float] = None
     ) -> Tuple[List[str], List[str]]:
@@ -67,60 +258,245 @@ class ProblemGenerator:
             Tuple of (problems, answers) lists.
 
         Raises:
-            ValueError: If age group is not supported or difficulty is invalid.
+            ValueError: If age group is not supported, difficulty is invalid,
+                or count is larger than the number of distinct problems.
         """
-        if difficulty is None:
-            difficulty = self.get_school_year_progress()
-        elif not 0.0 <= difficulty <= 1.0:
-            raise ValueError("Difficulty must be between 0.0 and 1.0")
+        return as_text(self.generate_problems(age, count, difficulty))
 
-        # Get available problem types and their weights based on difficulty
-        problem_weights = get_difficulty_weights(age, difficulty)
-        problem_types = get_problem_types_for_age(age)
+    def generate_math_problems_batch(
+        self,
+        age: int,
+        count: Optional[int] = 30,
+        difficulty: Optional[float] = None,
+        num_worksheets: int = 1,
+    ) -> List[Tuple[List[str], List[str]]]:
+        """Generate problems for one or more worksheets in a single batch.
+
+        Each worksheet is unique on its own; problems may repeat between
+        worksheets. See generate_worksheet_batch() for cross-sheet
+        uniqueness.
+
+        Args:
+            age: Age of student.
+            count: Number of problems per worksheet (default 30).
+            difficulty: Optional difficulty level from 0.0 to 1.0.
+                      If None, uses current school year progress.
+            num_worksheets: Number of worksheets to generate.
 
-        # Generate problems with weighted distribution
-        problems = []
-        answers = []
-        used_problems = set()  # Keep track of problems we've already generated
+        Returns:
+            List of (problems, answers) tuples, one per worksheet.
 
-        attempts = 0
-        max_attempts = count * 10  # Allow some retries to find unique problems
+        Raises:
+            ValueError: If age group is not supported, difficulty is invalid,
+                or count is larger than the number of distinct problems.
+        """
+        return self.generate_worksheet_batch(
+            age, difficulty, count, num_worksheets, unique_across=False
+        )
 
-        while len(problems) < count and attempts < max_attempts:
-            attempts += 1
+    def generate_worksheet_batch(
+        self,
+        age: int,
+        difficulty: Optional[float] = None,
+        count: int = 30,
+        n: int = 1,
+        unique_across: bool = True,
+        start_with: Optional[Tuple[List[str], List[str]]] = None,
+    ) -> List[Tuple[List[str], List[str]]]:
+        """Generate a set of worksheets in one pass.
 
-            # Choose problem type based on weights
-            problem_type = random.choices(
-                list(problem_weights.keys()),
-                weights=list(problem_weights.values()),
-                k=1,
-            )[0]
-            range_tuple = problem_types[problem_type]
+        The problem type sampler and problem spaces are set up once for the
+        whole set. Problem types and problem indices are drawn as NumPy
+        arrays and answers are computed with array arithmetic, which is much
+        faster than generating worksheets one by one.
 
-            try:
-                # Get the appropriate strategy for this problem type
-                strategy = self.strategies[problem_type]
+        Args:
+            age: Age of student.
+            difficulty: Optional difficulty level from 0.0 to 1.0.
+                      If None, uses current school year progress.
+            count: Number of problems per worksheet (default 30).
+            n: Number of worksheets to generate.
+            unique_across: If True, no problem appears on more than one
+                worksheet of the set. Falls back to per-worksheet uniqueness
+                when there are not enough distinct problems for the set.
+            start_with: Optional (problems, answers) to open the first
+                worksheet with, such as a preview already shown to the user.
+
+        Returns:
+            List of (problems, answers) tuples, one per worksheet.
+
+        Raises:
+            ValueError: If age group is not supported, difficulty is invalid,
+                or count is larger than the number of distinct problems.
+        """
+        difficulty = self._resolve_difficulty(difficulty)
+
+        sampler = get_problem_type_sampler(age, difficulty)
+        spaces = self._check_capacity(age, difficulty, count)
+
+        # Draw the problem type of every slot in every worksheet at once
+        choices = sampler.draw_indices((n, count), self.np_rng)
 
-                # Generate the problem using the strategy
-                problem, answer = strategy.generate(
-                    range_tuple[0], range_tuple[1], difficulty, age
+        if unique_across:
+            available = sum(len(space) for space in spaces.values())
+            if count * n > available:
+                logger.info(
+                    f"Only {available} distinct problems for {n} worksheets of "
+                    f"{count}; problems may repeat between worksheets"
                 )
+                unique_across = False
 
-                # Only add if we haven't seen this problem before
-                if problem not in used_problems:
-                    problems.append(problem)
-                    answers.append(answer)
-                    used_problems.add(problem)
-            except ValueError as e:
-                logger.warning(f"Failed to generate problem: {e}")
-                continue
-            except KeyError as e:
-                logger.warning(f"Strategy not found for problem type: {problem_type}")
-                continue
+        # With cross-sheet uniqueness the whole set is sampled as one page
+        pages = [choices.ravel()] if unique_across else list(choices)
+
+        problems: List[Problem] = []
+        for row in pages:
+            slot_types = self._allocate_types(
+                [sampler.outcomes[index] for index in row.tolist()],
+                sampler.weights,
+                spaces,
+            )
+            problems.extend(
+                self._build_problems(
+                    slot_types,
+                    spaces,
+                    lambda space, k: space.sample_array(k, self.np_rng),
+                )
+            )
+
+        sheets = [as_text(problems[i * count : (i + 1) * count]) for i in range(n)]
+        if start_with:
+            sheets = self._start_with(sheets, count, *start_with)
+        return sheets
+
+    @staticmethod
+    def _start_with(
+        sheets: List[Tuple[List[str], List[str]]],
+        count: int,
+        start_problems: List[str],
+        start_answers: List[str],
+    ) -> List[Tuple[List[str], List[str]]]:
+        """Put given problems at the start of the first worksheet.
+
+        Generated problems that repeat a given one are dropped, and the
+        first worksheet is trimmed back to count. Problems trimmed from it
+        replace any given problem that also appears on a later worksheet,
+        so uniqueness across the set is kept. A given problem is only left in
+        place when every trimmed problem is already on that worksheet.
+
+        Args:
+            sheets: Generated (problems, answers) of each worksheet.
+            count: Number of problems per worksheet.
+            start_problems: Problems to start the first worksheet with.
+            start_answers: Answers of start_problems.
+
+        Returns:
+            List of (problems, answers) tuples, one per worksheet.
+        """
+        start = dict(list(zip(start_problems, start_answers))[:count])
+        problems, answers = sheets[0]
+        generated = [(p, a) for p, a in zip(problems, answers) if p not in start]
+        first = list(start.items()) + generated[: count - len(start)]
+        spare = generated[count - len(start) :]
+
+        result = [([p for p, _ in first], [a for _, a in first])]
+        for problems, answers in sheets[1:]:
+            on_sheet = set(problems)
+            pairs = []
+            for pair in zip(problems, answers):
+                if pair[0] in start:
+                    # Without uniqueness across the set, spares may already
+                    # be on this worksheet
+                    fresh = [i for i, (p, _) in enumerate(spare) if p not in on_sheet]
+                    if fresh:
+                        pair = spare.pop(fresh[-1])
+                        on_sheet.add(pair[0])
+                pairs.append(pair)
+            result.append(([p for p, _ in pairs], [a for _, a in pairs]))
+        return result
+
+    def _check_capacity(
+        self, age: int, difficulty: float, count: int
+    ) -> Dict[str, ProblemSpace]:
+        """Build the problem spaces and make sure they hold count problems.
 
-        if len(problems) < count:
-            logger.warning(
-                f"Could only generate {len(problems)} unique problems out of {count} requested"
+        Raises:
+            ValueError: If count is larger than the number of distinct problems.
+        """
+        spaces = self._problem_spaces(age, difficulty)
+        available = sum(len(space) for space in spaces.values())
+        if count > available:
+            raise ValueError(
+                f"Cannot generate {count} unique problems for age {age} at "
+                f"difficulty {difficulty}: only {available} exist"
             )
+        return spaces
+
+    def _allocate_types(
+        self,
+        slot_types: Sequence[str],
+        problem_weights: Dict[str, float],
+        spaces: Dict[str, ProblemSpace],
+    ) -> List[str]:
+        """Move slots from exhausted problem types to types with room left.
+
+        Args:
+            slot_types: Problem type drawn for each slot.
+            problem_weights: Weight of each problem type.
+            spaces: Problem space of each problem type.
+
+        Returns:
+            Problem type for each slot, never exceeding a space's size.
+        """
+        used = {problem_type: 0 for problem_type in problem_weights}
+        allocated = []
+        for problem_type in slot_types:
+            space = spaces.get(problem_type)
+            if space is None or used[problem_type] >= len(space):
+                open_types = [
+                    name
+                    for name in problem_weights
+                    if name in spaces and used[name] < len(spaces[name])
+                ]
+                problem_type = self.rng.choices(
+                    open_types, weights=[problem_weights[t] for t in open_types]
+                )[0]
+            used[problem_type] += 1
+            allocated.append(problem_type)
+        return allocated
+
+    def _build_problems(
+        self,
+        slot_types: List[str],
+        spaces: Dict[str, ProblemSpace],
+        sample: Callable[[ProblemSpace, int], np.ndarray],
+    ) -> List[Problem]:
+        """Sample the problems for a list of slot types.
+
+        Args:
+            slot_types: Problem type for each slot.
+            spaces: Problem space of each problem type.
+            sample: Function drawing k distinct indices from a problem space.
+
+        Returns:
+            List of problems in slot order.
+        """
+        slots_by_type = defaultdict(list)
+        for slot, problem_type in enumerate(slot_types):
+            slots_by_type[problem_type].append(slot)
+
+        problems: List[Optional[Problem]] = [None] * len(slot_types)
+        for problem_type, slots in slots_by_type.items():
+            space = spaces[problem_type]
+            indices = sample(space, len(slots))
+            if isinstance(space, BankSegment):
+                batch = space.problems(indices)
+            else:
+                strategy = self.strategies[problem_type]
+                batch = strategy.to_problems(
+                    *strategy.build_batch(*space.decode(indices))
+                )
+            for slot, problem in zip(slots, batch):
+                problems[slot] = problem
 
-        return problems, answers
+        return problems
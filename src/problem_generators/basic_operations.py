@@ -1,19 +1,23 @@
 """Strategies for generating addition and subtraction problems."""
 
-import random
 from typing import Tuple
 
-from src.problem_strategy import ProblemStrategy, adjust_range_by_difficulty
+import numpy as np
+
+from src.problem_strategy import ProblemSpace, ProblemStrategy
 from src.problem_types import OPERATORS
 
 
 class AdditionStrategy(ProblemStrategy):
     """Strategy for generating addition problems."""
 
-    def generate(
+    problem_type = "addition"
+    operator = OPERATORS["addition"]
+
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate an addition problem.
+    ) -> ProblemSpace:
+        """Describe every distinct addition problem for the settings.
 
         Args:
             min_val: Minimum value for the range
@@ -22,39 +26,42 @@ class AdditionStrategy(ProblemStrategy):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace of (first addend, second addend) pairs
         """
-        min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+        min_val, max_val = self.adjusted_range(min_val, max_val, difficulty, age)
 
-        # For age 5, ensure the sum is within their range
         if age == 5:
-            # For lower difficulties, keep one number single-digit
-            if difficulty <= 0.5:
-                num1 = random.randint(min_val, 9)
-                num2 = random.randint(min_val, min(max_val - num1, max_val))
-            else:
-                # For higher difficulties, allow both numbers to be double-digit
-                num1 = random.randint(min_val, max_val - 1)
-                num2 = random.randint(min_val, min(max_val - num1, max_val))
-        else:
-            # Generate both numbers in the full range
-            num1 = random.randint(min_val, max_val)
-            num2 = random.randint(min_val, max_val)
+            first_max = 9 if difficulty <= 0.5 else max_val - 1
+            num1 = np.arange(min_val, first_max + 1)
+            return ProblemSpace(num1, min_val, max_val - num1)
+
+        return ProblemSpace(np.arange(min_val, max_val + 1), min_val, max_val)
 
-        operator = OPERATORS["addition"]
-        problem = f"{num1} {operator} {num2}"
-        answer = num1 + num2
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build addition problems from problem space values.
 
-        return problem, str(answer)
+        Args:
+            first: First addends
+            second: Second addends
+
+        Returns:
+            Tuple of (left operands, right operands, answers) arrays
+        """
+        return first, second, first + second
 
 
 class SubtractionStrategy(ProblemStrategy):
     """Strategy for generating subtraction problems."""
 
-    def generate(
+    problem_type = "subtraction"
+    operator = OPERATORS["subtraction"]
+
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate a subtraction problem.
+    ) -> ProblemSpace:
+        """Describe every distinct subtraction problem for the settings.
 
         Args:
             min_val: Minimum value for the range
@@ -63,31 +70,30 @@ class SubtractionStrategy(ProblemStrategy):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace of (minuend, subtrahend) pairs
         """
-        min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+        min_val, max_val = self.adjusted_range(min_val, max_val, difficulty, age)
 
-        # For age 5, ensure the difference is appropriate
         if age == 5:
-            # For subtraction, ensure first number is larger and result is positive
+            num1 = np.arange(min_val + 1, max_val + 1)
             if difficulty <= 0.5:
-                # For lower difficulties, keep second number single-digit
-                num2 = random.randint(min_val, 9)
-                num1 = random.randint(num2 + 1, max_val)
-            else:
-                # For higher difficulties, allow both numbers to be double-digit
-                num1 = random.randint(min_val + 1, max_val)
-                num2 = random.randint(min_val, num1 - 1)
-        else:
-            # Generate both numbers in the full range
-            num1 = random.randint(min_val, max_val)
-            num2 = random.randint(min_val, max_val)
-
-            # Ensure first number is larger
-            num1, num2 = max(num1, num2), min(num1, num2)
-
-        operator = OPERATORS["subtraction"]
-        problem = f"{num1} {operator} {num2}"
-        answer = num1 - num2
-
-        return problem, str(answer)
+                # Second number stays single-digit
+                return ProblemSpace(num1, min_val, np.minimum(num1 - 1, 9))
+            return ProblemSpace(num1, min_val, num1 - 1)
+
+        num1 = np.arange(min_val, max_val + 1)
+        return ProblemSpace(num1, min_val, num1)
+
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build subtraction problems from problem space values.
+
+        Args:
+            first: Minuends
+            second: Subtrahends
+
+        Returns:
+            Tuple of (left operands, right operands, answers) arrays
+        """
+        return first, second, first - second
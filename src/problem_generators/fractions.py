@@ -1,18 +1,23 @@
 """Strategies for generating fraction problems."""
 
-import random
-from typing import Tuple
+from typing import List, Tuple
 
-from src.problem_strategy import ProblemStrategy, adjust_range_by_difficulty
+import numpy as np
+
+from src.problem import FRACTION, Problem
+from src.problem_strategy import ProblemSpace, ProblemStrategy
 
 
 class FractionStrategy(ProblemStrategy):
     """Strategy for generating fraction problems."""
 
-    def generate(
+    problem_type = "fractions"
+    operator = FRACTION
+
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate a fraction problem.
+    ) -> ProblemSpace:
+        """Describe every distinct fraction problem for the settings.
 
         Args:
             min_val: Minimum value for the range
@@ -21,12 +26,40 @@ class FractionStrategy(ProblemStrategy):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace of (denominator, numerator) pairs
         """
-        min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+        min_val, max_val = self.adjusted_range(min_val, max_val, difficulty, age)
 
-        denominator = random.randint(2, max_val)
-        numerator = random.randint(1, denominator)
-        problem = f"{numerator}/{denominator}"
+        denominator = np.arange(2, max_val + 1)
+        return ProblemSpace(denominator, 1, denominator)
 
-        return problem, str(round(numerator / denominator, 3))
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build fraction problems from problem space values.
+
+        Args:
+            first: Denominators
+            second: Numerators
+
+        Returns:
+            Tuple of (numerators, denominators, values) arrays
+        """
+        return second, first, second / first
+
+    def to_problems(
+        self, left: np.ndarray, right: np.ndarray, answers: np.ndarray
+    ) -> List[Problem]:
+        """Convert batch fractions into Problem records with exact answers.
+
+        Args:
+            left: Numerators
+            right: Denominators
+            answers: Decimal value of each fraction (unused, answers are exact)
+
+        Returns:
+            List of problems
+        """
+        return [
+            Problem(n, self.operator, d) for n, d in zip(left.tolist(), right.tolist())
+        ]
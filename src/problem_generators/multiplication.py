@@ -1,19 +1,23 @@
 """Strategies for generating multiplication and division problems."""
 
-import random
 from typing import Tuple
 
-from src.problem_strategy import ProblemStrategy, adjust_range_by_difficulty
+import numpy as np
+
+from src.problem_strategy import ProblemSpace, ProblemStrategy
 from src.problem_types import OPERATORS
 
 
 class MultiplicationStrategy(ProblemStrategy):
     """Strategy for generating multiplication problems."""
 
-    def generate(
+    problem_type = "multiplication"
+    operator = OPERATORS["multiplication"]
+
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate a multiplication problem.
+    ) -> ProblemSpace:
+        """Describe every distinct multiplication problem for the settings.
 
         Args:
             min_val: Minimum value for the range
@@ -22,27 +26,37 @@ class MultiplicationStrategy(ProblemStrategy):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace of (first factor, second factor) pairs
         """
-        min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+        min_val, max_val = self.adjusted_range(min_val, max_val, difficulty, age)
+
+        return ProblemSpace(np.arange(min_val, max_val + 1), min_val, max_val)
 
-        num1 = random.randint(min_val, max_val)
-        num2 = random.randint(min_val, max_val)
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build multiplication problems from problem space values.
 
-        operator = OPERATORS["multiplication"]
-        problem = f"{num1} {operator} {num2}"
-        answer = num1 * num2
+        Args:
+            first: First factors
+            second: Second factors
 
-        return problem, str(answer)
+        Returns:
+            Tuple of (left operands, right operands, answers) arrays
+        """
+        return first, second, first * second
 
 
 class DivisionStrategy(ProblemStrategy):
     """Strategy for generating division problems."""
 
-    def generate(
+    problem_type = "division"
+    operator = OPERATORS["division"]
+
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate a division problem.
+    ) -> ProblemSpace:
+        """Describe every distinct division problem for the settings.
 
         Args:
             min_val: Minimum value for the range
@@ -51,16 +65,22 @@ class DivisionStrategy(ProblemStrategy):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace of (quotient, divisor) pairs
         """
-        min_val, max_val = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+        min_val, max_val = self.adjusted_range(min_val, max_val, difficulty, age)
+
+        return ProblemSpace(np.arange(min_val, max_val + 1), min_val, max_val)
 
-        # Generate division problems with whole number answers
-        answer = random.randint(min_val, max_val)
-        num2 = random.randint(min_val, max_val)
-        num1 = answer * num2
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build division problems from problem space values.
 
-        operator = OPERATORS["division"]
-        problem = f"{num1} {operator} {num2}"
+        Args:
+            first: Quotients
+            second: Divisors
 
-        return problem, str(answer)
+        Returns:
+            Tuple of (left operands, right operands, answers) arrays
+        """
+        return first * second, second, first
@@ -0,0 +1,131 @@
+"""Alias-method sampling of difficulty-weighted problem types."""
+
+import random
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.problem_types import (
+    DIFFICULTY_BUCKETS,
+    difficulty_bucket,
+    get_difficulty_weights,
+)
+
+# Maximum number of (age, difficulty bucket) samplers kept in memory
+SAMPLER_CACHE_SIZE = 256
+
+
+class AliasSampler:
+    """Draws weighted outcomes in O(1) time using Vose's alias method."""
+
+    def __init__(self, outcomes: Sequence[str], weights: Sequence[float]):
+        """Build the probability and alias tables.
+
+        Args:
+            outcomes: Values to draw from.
+            weights: Non-negative weight of each outcome.
+
+        Raises:
+            ValueError: If there are no outcomes or all weights are zero.
+        """
+        total = float(sum(weights))
+        if not outcomes or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+
+        self.outcomes: Tuple[str, ...] = tuple(outcomes)
+        self.weights: Dict[str, float] = {
+            outcome: weight / total for outcome, weight in zip(outcomes, weights)
+        }
+
+        size = len(self.outcomes)
+        scaled = [weight * size / total for weight in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # Whatever is left over is 1.0 up to rounding error
+        self._prob = prob
+        self._alias = alias
+        self._prob_array = np.array(prob)
+        self._alias_array = np.array(alias)
+
+    def draw(self, rng: random.Random) -> str:
+        """Draw a single outcome.
+
+        Args:
+            rng: Random source.
+
+        Returns:
+            The drawn outcome.
+        """
+        # One uniform draw picks the column and the coin flip within it
+        scaled = rng.random() * len(self._prob)
+        column = int(scaled)
+        if scaled - column < self._prob[column]:
+            return self.outcomes[column]
+        return self.outcomes[self._alias[column]]
+
+    def draw_many(self, count: int, rng: random.Random) -> List[str]:
+        """Draw several outcomes.
+
+        Args:
+            count: Number of outcomes to draw.
+            rng: Random source.
+
+        Returns:
+            List of drawn outcomes.
+        """
+        return [self.draw(rng) for _ in range(count)]
+
+    def draw_indices(
+        self, size: Union[int, Tuple[int, ...]], rng: np.random.Generator
+    ) -> np.ndarray:
+        """Draw a whole array of outcome indices at once.
+
+        Args:
+            size: Shape of the array to draw.
+            rng: NumPy random generator.
+
+        Returns:
+            Array of indices into outcomes.
+        """
+        scaled = rng.random(size) * len(self._prob)
+        columns = scaled.astype(np.int64)
+        keep = (scaled - columns) < self._prob_array[columns]
+        return np.where(keep, columns, self._alias_array[columns])
+
+
+@lru_cache(maxsize=SAMPLER_CACHE_SIZE)
+def _build_sampler(age: int, bucket: int) -> AliasSampler:
+    """Build the problem type sampler for an age and difficulty bucket."""
+    weights = get_difficulty_weights(age, bucket / DIFFICULTY_BUCKETS)
+    return AliasSampler(list(weights.keys()), list(weights.values()))
+
+
+def get_problem_type_sampler(age: int, difficulty: float) -> AliasSampler:
+    """Get the cached problem type sampler for an age and difficulty.
+
+    Difficulty is quantized with difficulty_bucket, like the range tables,
+    so that nearby requests share one sampler. Least recently used samplers are
+    evicted once SAMPLER_CACHE_SIZE is reached.
+
+    Args:
+        age: Student age
+        difficulty: Difficulty level from 0.0 to 1.0
+
+    Returns:
+        AliasSampler over problem types
+
+    Raises:
+        ValueError: If age is not supported
+    """
+    return _build_sampler(age, difficulty_bucket(difficulty))
@@ -1,17 +1,128 @@
 """Base strategy for problem generation."""
 
+import random
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.problem import Problem
+from src.problem_types import DIFFICULTY_BUCKETS, PROBLEM_TYPES, difficulty_bucket
+
+
+class ProblemSpace:
+    """Enumerable set of the distinct problems a strategy can produce.
+
+    The space is stored row by row: every first value has a contiguous range
+    of second values. Problems can then be counted and decoded by index
+    without materializing them.
+    """
+
+    def __init__(
+        self, first: np.ndarray, second_min: np.ndarray, second_max: np.ndarray
+    ):
+        """Initialize problem space.
+
+        Args:
+            first: Row values of the space.
+            second_min: Smallest second value allowed for each row.
+            second_max: Largest second value allowed for each row.
+        """
+        first, second_min, second_max = np.broadcast_arrays(
+            first, second_min, second_max
+        )
+        non_empty = second_max >= second_min
+        self.first = first[non_empty]
+        self.second_min = second_min[non_empty]
+        lengths = second_max[non_empty] - self.second_min + 1
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.size = int(self.offsets[-1])
+
+    def __len__(self) -> int:
+        """Return the number of distinct problems in the space."""
+        return self.size
+
+    def decode(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert problem indices into (first, second) value arrays.
+
+        Args:
+            indices: Problem indices between 0 and size - 1.
+
+        Returns:
+            Tuple of (first values, second values) arrays
+        """
+        rows = np.searchsorted(self.offsets, indices, side="right") - 1
+        return self.first[rows], self.second_min[rows] + (indices - self.offsets[rows])
+
+    def sample(self, count: int, rng: random.Random) -> np.ndarray:
+        """Sample distinct problem indices without replacement.
+
+        Random.sample() runs a partial Fisher-Yates shuffle (or set-based
+        selection for sparse draws), so the cost depends only on count.
+
+        Args:
+            count: Number of indices to draw.
+            rng: Random source.
+
+        Returns:
+            Array of distinct problem indices.
+
+        Raises:
+            ValueError: If count is larger than the space.
+        """
+        return np.array(rng.sample(range(self.size), count), dtype=np.int64)
+
+    def sample_array(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Sample distinct problem indices without replacement using NumPy.
+
+        Args:
+            count: Number of indices to draw.
+            rng: NumPy random generator.
+
+        Returns:
+            Array of distinct problem indices.
+
+        Raises:
+            ValueError: If count is larger than the space.
+        """
+        return rng.choice(self.size, size=count, replace=False)
 
 
 class ProblemStrategy(ABC):
     """Base strategy for generating math problems."""
 
+    # Problem type key in PROBLEM_TYPES
+    problem_type: str = ""
+
+    # Operator symbol used when formatting problems
+    operator: str = ""
+
+    def adjusted_range(
+        self, min_val: int, max_val: int, difficulty: float, age: int
+    ) -> Tuple[int, int]:
+        """Get the difficulty-adjusted range for this strategy.
+
+        Uses the precomputed range table when the range is the standard one
+        for this problem type, and computes it otherwise.
+
+        Args:
+            min_val: Minimum value for the range
+            max_val: Maximum value for the range
+            difficulty: Difficulty level from 0.0 to 1.0
+            age: Student age for context-appropriate scaling
+
+        Returns:
+            Tuple of (adjusted_min, adjusted_max)
+        """
+        if PROBLEM_TYPES.get(age, {}).get(self.problem_type) == (min_val, max_val):
+            return lookup_range(age, self.problem_type, difficulty)
+        return adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+
     @abstractmethod
-    def generate(
+    def problem_space(
         self, min_val: int, max_val: int, difficulty: float, age: int
-    ) -> Tuple[str, str]:
-        """Generate a math problem.
+    ) -> ProblemSpace:
+        """Describe every distinct problem the strategy can produce.
 
         Args:
             min_val: Minimum value for the range
@@ -20,10 +131,43 @@ class ProblemStrategy(ABC):
             age: Student age for context-appropriate scaling
 
         Returns:
-            Tuple of (problem, answer)
+            ProblemSpace whose (first, second) values feed build_batch()
         """
         pass
 
+    @abstractmethod
+    def build_batch(
+        self, first: np.ndarray, second: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build problems from values decoded out of the problem space.
+
+        Args:
+            first: Row values from the problem space
+            second: Column values from the problem space
+
+        Returns:
+            Tuple of (left operands, right operands, answers) arrays
+        """
+        pass
+
+    def to_problems(
+        self, left: np.ndarray, right: np.ndarray, answers: np.ndarray
+    ) -> List[Problem]:
+        """Convert batch operands and answers into Problem records.
+
+        Args:
+            left: Left operands
+            right: Right operands
+            answers: Answers for each problem
+
+        Returns:
+            List of problems
+        """
+        return [
+            Problem(a, self.operator, b, answer)
+            for a, b, answer in zip(left.tolist(), right.tolist(), answers.tolist())
+        ]
+
 
 def adjust_range_by_difficulty(
     min_val: int, max_val: int, difficulty: float, age: int
@@ -39,8 +183,6 @@ def adjust_range_by_difficulty(
     Returns:
         Tuple of (adjusted_min, adjusted_max)
     """
-    from src.problem_types import PROBLEM_TYPES
-
     range_size = max_val - min_val
 
     # For age 5, provide a more gradual progression to double-digit numbers
@@ -74,3 +216,36 @@ def adjust_range_by_difficulty(
             adjusted_min = min_val
 
         return int(adjusted_min), int(adjusted_max)
+
+
+def _build_range_table() -> Dict[Tuple[int, str, int], Tuple[int, int]]:
+    """Precompute adjusted ranges for every age, problem type and bucket."""
+    table = {}
+    for age, problem_types in PROBLEM_TYPES.items():
+        for problem_type, (min_val, max_val) in problem_types.items():
+            for bucket in range(DIFFICULTY_BUCKETS + 1):
+                table[(age, problem_type, bucket)] = adjust_range_by_difficulty(
+                    min_val, max_val, bucket / DIFFICULTY_BUCKETS, age
+                )
+    return table
+
+
+# (age, problem type, difficulty bucket) -> (adjusted_min, adjusted_max)
+RANGE_TABLE = _build_range_table()
+
+
+def lookup_range(age: int, problem_type: str, difficulty: float) -> Tuple[int, int]:
+    """Look up the adjusted range for a standard problem type.
+
+    Args:
+        age: Student age
+        problem_type: Problem type key in PROBLEM_TYPES
+        difficulty: Difficulty level from 0.0 to 1.0
+
+    Returns:
+        Tuple of (adjusted_min, adjusted_max)
+
+    Raises:
+        KeyError: If the age, problem type or difficulty is not in the table
+    """
+    return RANGE_TABLE[(age, problem_type, difficulty_bucket(difficulty))]
@@ -1,7 +1,11 @@
 """Problem type definitions and difficulty weights for math problems."""
 
+import math
 from typing import Dict, Tuple
 
+# Number of steps difficulty is quantized into for range tables and samplers
+DIFFICULTY_BUCKETS = 100
+
 # Base problem types by age group (will be adjusted by difficulty)
 PROBLEM_TYPES = {
     5: {  # Kindergarten
@@ -164,3 +168,20 @@ def get_difficulty_weights(age: int, difficulty: float) -> Dict[str, float]:
             k: weights[0.5][k] + (weights[1.0][k] - weights[0.5][k]) * factor
             for k in weights[0.5]
         }
+
+
+def difficulty_bucket(difficulty: float) -> int:
+    """Quantize a difficulty to a bucket shared by range tables and samplers.
+
+    Buckets round up so that every threshold in adjust_range_by_difficulty
+    and get_difficulty_weights (which are all multiples of 0.01) falls on the
+    same side as the exact difficulty.
+
+    Args:
+        difficulty: Difficulty level from 0.0 to 1.0
+
+    Returns:
+        Bucket index from 0 to DIFFICULTY_BUCKETS
+    """
+    # Round first so values like 0.07 * 100 = 7.000000000000001 stay in bucket 7
+    return math.ceil(round(difficulty * DIFFICULTY_BUCKETS, 9))
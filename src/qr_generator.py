@@ -1,31 +1,84 @@
 """QR code generation for worksheet identification."""
 
-from io import BytesIO
+from functools import lru_cache
+from typing import Iterator, Tuple
 
 import qrcode
+from reportlab.pdfgen import canvas
 
+# Number of worksheet IDs whose module matrices are kept in memory
+QR_CACHE_SIZE = 1024
 
-def create_qr_code(worksheet_id: str) -> BytesIO:
-    """Generate a QR code for worksheet identification.
+QRMatrix = Tuple[Tuple[bool, ...], ...]
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def qr_matrix(worksheet_id: str) -> QRMatrix:
+    """Compute the QR code module matrix for a worksheet ID.
 
     Args:
         worksheet_id: Unique identifier for worksheet.
 
     Returns:
-        BytesIO containing QR code image.
+        Rows of modules from top to bottom, True for dark modules. Includes
+        the quiet zone border.
     """
     qr = qrcode.QRCode(
         version=1,
-        box_size=10,
         border=4,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
     )
     qr.add_data(worksheet_id)
     qr.make(fit=True)
 
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    byte_stream = BytesIO()
-    qr_image.save(byte_stream, format="PNG")
-    byte_stream.seek(0)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+
+def qr_runs(matrix: QRMatrix) -> Iterator[Tuple[int, int, int]]:
+    """Find the horizontal runs of dark modules in a QR code.
+
+    Args:
+        matrix: Module matrix from qr_matrix().
+
+    Yields:
+        (row, first_column, length) of each run, from the top row down.
+    """
+    for row_index, row in enumerate(matrix):
+        run_start = None
+        for column, dark in enumerate(row + (False,)):
+            if dark and run_start is None:
+                run_start = column
+            elif not dark and run_start is not None:
+                yield row_index, run_start, column - run_start
+                run_start = None
+
+
+def draw_qr_code(
+    pdf: canvas.Canvas, matrix: QRMatrix, x: float, y: float, size: float
+) -> None:
+    """Draw a QR code on a canvas as filled vector rectangles.
+
+    Each horizontal run of dark modules becomes one rectangle, and all
+    rectangles are filled as a single path.
+
+    Args:
+        pdf: PDF canvas to draw on.
+        matrix: Module matrix from qr_matrix().
+        x: Left edge of the code.
+        y: Bottom edge of the code.
+        size: Width and height of the code, including the border.
+    """
+    module = size / len(matrix)
+    path = pdf.beginPath()
+    for row, column, length in qr_runs(matrix):
+        path.rect(
+            x + column * module,
+            y + size - (row + 1) * module,
+            length * module,
+            module,
+        )
 
-    return byte_stream
+    pdf.saveState()
+    pdf.setFillColorRGB(0, 0, 0)
+    pdf.drawPath(path, stroke=0, fill=1)
+    pdf.restoreState()
@@ -1,12 +1,14 @@
 """Worksheet management routes for the MathTutor application."""
 
+import copy
 import json
 import logging
 import os
 import time
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional, Tuple
 
 from flask import (
     Blueprint,
@@ -17,14 +19,22 @@ from flask import (
     render_template,
     request,
     send_file,
+    stream_with_context,
     url_for,
 )
 
 from ..database import get_repository
-from ..database.models import Child, Subscription
+from ..database.jobs import create_job_store
+from ..database.models import Child, RenderJob, ScoreSummary, Subscription
 from ..database.models import Worksheet as WorksheetModel
+from ..document.jobs import RenderQueue
 from ..document.renderer import DocumentRenderer
+from ..document.svg import SVGRenderer
 from ..document.template import LayoutChoice
+from ..config import PROBLEM_BANK_PATH, RENDER_JOB_STORE, RENDER_WORKERS
+from ..preview_cache import PreviewCache
+from ..problem import Problem
+from ..problem_bank import open_problem_bank
 from ..problem_generator import ProblemGenerator
 from .common import get_current_user
 
@@ -33,12 +43,41 @@ logger = logging.getLogger(__name__)
 
 # Initialize components
 repository = get_repository()
-generator = ProblemGenerator()
+
+# Shared generator; each request works on its own fork of it so concurrent
+# requests never share a random stream. Forks share the memory-mapped problem
+# bank, and so do all worker processes.
+generator = ProblemGenerator(bank=open_problem_bank(PROBLEM_BANK_PATH))
+
+# Problems shown in previews, reused by the worksheet generated next
+preview_cache = PreviewCache()
+
+# Number of problems shown in a preview
+PREVIEW_SIZE = 5
+
+# Attempts at a score summary update that keeps losing to concurrent updates
+SUMMARY_UPDATE_ATTEMPTS = 5
+
+# PDF renderer for downloads; renders into memory, never to disk
+renderer = DocumentRenderer()
+
+# SVG pages for browser display, laid out exactly like the PDFs
+svg_renderer = SVGRenderer(renderer)
+
+# Background PDF rendering, so bulk renders never hold a web worker
+render_queue = RenderQueue(
+    create_job_store(RENDER_JOB_STORE, repository.dynamodb), workers=RENDER_WORKERS
+)
 
 # Create blueprint
 bp = Blueprint("worksheets", __name__, url_prefix="/worksheets")
 
 
+def _preview_key(email: str, age: int, difficulty: float) -> Tuple:
+    """Cache key of the preview a user saw for a set of worksheet settings."""
+    return (email, age, round(difficulty, 3))
+
+
 @bp.route("/preview", methods=["POST"])
 def preview_problems():
     """Generate a preview of problems based on current settings."""
@@ -54,9 +93,15 @@ def preview_problems():
             request.form.get("difficulty", generator.get_school_year_progress())
         )
 
-        # Generate problems but only use first 5 for preview
-        problems, _ = generator.generate_math_problems(age, count, difficulty)
-        preview_problems = [{"text": p} for p in problems[:5]]
+        # Only the previewed problems are generated; repeated previews with
+        # the same settings show the same problems
+        size = min(count, PREVIEW_SIZE)
+        key = _preview_key(user.email, age, difficulty)
+        preview = preview_cache.get(key)
+        if preview is None or len(preview[0]) < size:
+            preview = generator.fork().generate_math_problems(age, size, difficulty)
+            preview_cache.put(key, preview)
+        preview_problems = [{"text": p} for p in preview[0][:size]]
 
         # Generate preview HTML
         preview_html = render_template(
@@ -140,26 +185,30 @@ def generate_both():
                 403,
             )
 
-        # Generate multiple worksheets
-        worksheets_data = []
-        for _ in range(num_worksheets):
-            # Generate problems
-            prob_start = time.time()
-            logger.info(
-                f"Generating problems for age={age}, count={count}, difficulty={difficulty}"
-            )
-            problems, answers = generator.generate_math_problems(
-                age=age,
-                count=count,
-                difficulty=difficulty,
-            )
-            prob_time = time.time() - prob_start
-            logger.info(f"Problem generation took: {prob_time:.2f} seconds")
+        # Generate problems for all worksheets in one pass so they do not
+        # repeat across the set
+        prob_start = time.time()
+        logger.info(
+            f"Generating problems for age={age}, count={count}, "
+            f"difficulty={difficulty}, num_worksheets={num_worksheets}"
+        )
+        problem_sets = generator.fork().generate_worksheet_batch(
+            age=age,
+            difficulty=difficulty,
+            count=count,
+            n=num_worksheets,
+            start_with=preview_cache.pop(_preview_key(user.email, age, difficulty)),
+        )
+        prob_time = time.time() - prob_start
+        logger.info(f"Problem generation took: {prob_time:.2f} seconds")
 
+        # Create each worksheet
+        worksheets_data = []
+        for problems, answers in problem_sets:
             # Create worksheet in database
             logger.info(f"Creating worksheet in database for child_id={child_id}")
             worksheet = WorksheetModel.create(
-                child_id=child_id, problems=json.dumps(problems)
+                child_id=child_id, problems=json.dumps(problems), answer_key=answers
             )
             repository.create_worksheet(worksheet)
             logger.info(
@@ -245,13 +294,15 @@ def generate_worksheet_route():
         flash("Child not found.", "error")
         return redirect(url_for("pages.index"))
 
-    problems, answers = generator.generate_math_problems(
+    problems, answers = generator.fork().generate_math_problems(
         age=child.age,
         count=30,  # default count
         difficulty=generator.get_school_year_progress(),
     )
 
-    worksheet = WorksheetModel.create(child_id=child.id, problems=problems)
+    worksheet = WorksheetModel.create(
+        child_id=child.id, problems=problems, answer_key=answers
+    )
     repository.create_worksheet(worksheet)
 
     return render_template(
@@ -280,22 +331,23 @@ def submit_worksheet(worksheet_id):
         flash("Access denied.", "error")
         return redirect(url_for("pages.index"))
 
+    # Build the summary, if needed, from the history before this grade
+    _score_summary(child.id)
+    previous = copy.copy(worksheet) if worksheet.completed else None
+
     try:
         answers = []
         incorrect_problems = []
-        # Handle problems which could be a list or a string
-        if isinstance(worksheet.problems, str):
-            problems = json.loads(worksheet.problems)
-        else:
-            problems = worksheet.problems
+        # Grade against the stored answer key, or legacy answers without one
+        _, expected_answers = _worksheet_content(worksheet)
 
-        for i in range(len(problems)):
+        for i, expected in enumerate(expected_answers):
             student_answer = request.form.get(f"answer_{i}")
             if student_answer:
                 student_answer = float(student_answer)
                 answers.append(student_answer)
                 # Check if answer is incorrect
-                if "answer" in problems[i] and student_answer != problems[i]["answer"]:
+                if not _answer_matches(student_answer, expected):
                     incorrect_problems.append(i)
             else:
                 answers.append(None)
@@ -304,6 +356,7 @@ def submit_worksheet(worksheet_id):
         worksheet.incorrect_problems = incorrect_problems
         worksheet.completed = True
         repository.update_worksheet(worksheet)
+        _record_grade(child.id, worksheet, previous)
         flash("Worksheet submitted successfully!", "success")
     except (TypeError, ValueError):
         flash("Please enter valid numbers for all answers.", "error")
@@ -350,6 +403,255 @@ def view_worksheet(worksheet_id):
     )
 
 
+def _worksheet_content(worksheet: WorksheetModel) -> Tuple[List[str], List[str]]:
+    """Get the problem texts and answers of a stored worksheet.
+
+    Answers come from the answer key stored with the worksheet. Worksheets
+    created before answer keys were stored have their answers parsed from
+    the problem texts instead.
+    """
+    # Handle problems which could be a list or a string
+    if isinstance(worksheet.problems, str):
+        problems = json.loads(worksheet.problems)
+    else:
+        problems = worksheet.problems
+
+    texts = [p.get("text", "") if isinstance(p, dict) else p for p in problems]
+    if worksheet.answer_key and len(worksheet.answer_key) == len(problems):
+        return texts, worksheet.answer_key
+
+    answers = []
+    for p, text in zip(problems, texts):
+        if isinstance(p, dict) and "answer" in p:
+            answers.append(p["answer"])
+        else:
+            answers.append(_answer_from_text(text))
+    return texts, answers
+
+
+def _owned_worksheets(
+    worksheet_ids: List[str], user_email: str
+) -> Tuple[List[WorksheetModel], Optional[Tuple[Response, int]]]:
+    """Load worksheets, checking that they all belong to the user's children.
+
+    Returns:
+        Tuple of (worksheets, error) where error is a JSON error response
+        and status code if any worksheet is missing or not the user's.
+    """
+    worksheets = []
+    owned_children = set()
+    for worksheet_id in worksheet_ids:
+        worksheet = repository.get_worksheet(worksheet_id)
+        if not worksheet:
+            error = jsonify({"error": "Worksheet not found", "success": False})
+            return [], (error, 404)
+        if worksheet.child_id not in owned_children:
+            child = repository.get_child_by_id(worksheet.child_id)
+            if not child or child.parent_email != user_email:
+                error = jsonify({"error": "Access denied", "success": False})
+                return [], (error, 403)
+            owned_children.add(worksheet.child_id)
+        worksheets.append(worksheet)
+    return worksheets, None
+
+
+def _wants_answer_key() -> bool:
+    """Check whether the request asks for answer keys."""
+    return request.args.get("answer_key", "").lower() in ("1", "true", "yes")
+
+
+@bp.route("/<worksheet_id>/pdf")
+def download_pdf(worksheet_id):
+    """Download a worksheet, or its answer key with ?answer_key=1, as a PDF."""
+    user = get_current_user()
+    if not user:
+        return redirect(url_for("auth.login"))
+
+    worksheet = repository.get_worksheet(worksheet_id)
+    if not worksheet:
+        flash("Worksheet not found.", "error")
+        return redirect(url_for("pages.index"))
+
+    child = repository.get_child_by_id(worksheet.child_id)
+    if not child or child.parent_email != user.email:
+        flash("Access denied.", "error")
+        return redirect(url_for("pages.index"))
+
+    problems, answers = _worksheet_content(worksheet)
+    answer_key = _wants_answer_key()
+
+    # Render straight into memory; no temporary files
+    pdf = BytesIO()
+    if answer_key:
+        renderer.create_answer_key(pdf, problems, answers, worksheet.id)
+        filename = f"{worksheet.serial_number}_key.pdf"
+    else:
+        renderer.create_worksheet(pdf, problems, worksheet.id)
+        filename = f"{worksheet.serial_number}.pdf"
+
+    return Response(
+        pdf.getvalue(),
+        mimetype="application/pdf",
+        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+    )
+
+
+@bp.route("/<worksheet_id>/svg")
+def worksheet_svg(worksheet_id):
+    """Show a worksheet page, or answer key page with ?answer_key=1, as SVG.
+
+    Pages are numbered from 1 with ?page=.
+    """
+    user = get_current_user()
+    if not user:
+        return redirect(url_for("auth.login"))
+
+    worksheet = repository.get_worksheet(worksheet_id)
+    if not worksheet:
+        return jsonify({"error": "Worksheet not found", "success": False}), 404
+
+    child = repository.get_child_by_id(worksheet.child_id)
+    if not child or child.parent_email != user.email:
+        return jsonify({"error": "Access denied", "success": False}), 403
+
+    problems, answers = _worksheet_content(worksheet)
+    pages = svg_renderer.render_pages(
+        problems, worksheet.id, answers if _wants_answer_key() else None
+    )
+
+    page = request.args.get("page", 1, type=int)
+    if not 1 <= page <= len(pages):
+        return jsonify({"error": "Page not found", "success": False}), 404
+
+    return Response(
+        pages[page - 1],
+        mimetype="image/svg+xml",
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
+
+
+@bp.route("/pdf")
+def download_pdfs():
+    """Download several worksheets as a ZIP of PDFs.
+
+    Worksheets are passed as repeated ?id= parameters. The archive is
+    streamed with chunked transfer encoding as each worksheet is rendered.
+    """
+    user = get_current_user()
+    if not user:
+        return redirect(url_for("auth.login"))
+
+    worksheet_ids = request.args.getlist("id")
+    if not worksheet_ids:
+        return jsonify({"error": "No worksheets selected", "success": False}), 400
+
+    # Check every worksheet before streaming starts, while errors can still
+    # be returned as a status code
+    worksheets, error = _owned_worksheets(worksheet_ids, user.email)
+    if error:
+        return error
+
+    def archive_entries():
+        for worksheet in worksheets:
+            problems, answers = _worksheet_content(worksheet)
+            yield worksheet.serial_number, problems, answers, worksheet.id
+
+    logger.info(f"Streaming {len(worksheets)} worksheet PDFs for {user.email}")
+    return Response(
+        stream_with_context(
+            renderer.stream_archive(archive_entries(), answer_keys=_wants_answer_key())
+        ),
+        mimetype="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="worksheets.zip"'},
+    )
+
+
+@bp.route("/jobs", methods=["POST"])
+def submit_render_job():
+    """Queue worksheets, or their answer keys, for background PDF rendering.
+
+    Takes a JSON body with worksheet_ids and an optional answer_key flag.
+    One worksheet renders to a PDF and several to a ZIP of PDFs, as with
+    the download routes. Poll the returned status URL for the result.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify({"success": False, "error": "Not authenticated"}), 401
+
+    data = request.get_json(silent=True) or {}
+    # Keep the requested order, without duplicates
+    worksheet_ids = list(dict.fromkeys(data.get("worksheet_ids", [])))
+    if not worksheet_ids:
+        return jsonify({"success": False, "error": "No worksheets selected"}), 400
+
+    worksheets, error = _owned_worksheets(worksheet_ids, user.email)
+    if error:
+        return error
+
+    render_items = []
+    for worksheet in worksheets:
+        problems, answers = _worksheet_content(worksheet)
+        render_items.append((worksheet.serial_number, problems, answers, worksheet.id))
+
+    job = RenderJob(
+        user_email=user.email,
+        worksheet_ids=worksheet_ids,
+        answer_key=bool(data.get("answer_key", False)),
+    )
+    try:
+        render_queue.submit(job, render_items)
+    except Exception as e:
+        logger.error(f"Error queueing render job: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+    status = job.to_status()
+    status["success"] = True
+    status["status_url"] = url_for("worksheets.render_job_status", job_id=job.id)
+    return jsonify(status), 202
+
+
+@bp.route("/jobs/<job_id>")
+def render_job_status(job_id):
+    """Get the status of a render job."""
+    user = get_current_user()
+    if not user:
+        return jsonify({"success": False, "error": "Not authenticated"}), 401
+
+    job = render_queue.store.get(job_id)
+    if not job or job.user_email != user.email:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    status = job.to_status()
+    status["success"] = job.status != RenderJob.STATUS_FAILED
+    if job.status == RenderJob.STATUS_DONE:
+        status["result_url"] = url_for("worksheets.render_job_result", job_id=job.id)
+    return jsonify(status)
+
+
+@bp.route("/jobs/<job_id>/result")
+def render_job_result(job_id):
+    """Download the file rendered by a finished job."""
+    user = get_current_user()
+    if not user:
+        return jsonify({"success": False, "error": "Not authenticated"}), 401
+
+    job = render_queue.store.get(job_id)
+    if not job or job.user_email != user.email:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    if job.status != RenderJob.STATUS_DONE:
+        status = job.to_status()
+        status["success"] = False
+        status["error"] = job.error or "Job is not finished"
+        return jsonify(status), 409
+
+    return Response(
+        job.result,
+        mimetype=job.content_type,
+        headers={"Content-Disposition": f'attachment; filename="{job.filename}"'},
+    )
+
+
 @bp.route("/past/<child_id>")
 def past_worksheets(child_id):
     """View past worksheets for a child."""
@@ -375,39 +677,121 @@ def past_worksheets(child_id):
 
     is_premium = subscription.plan == Subscription.PLAN_PREMIUM
 
-    worksheets = repository.get_child_worksheets(child_id)
-    worksheets.sort(key=lambda w: w.created_at, reverse=True)
-
-    # Calculate past scores for the chart
-    past_scores = []
-    past_dates = []
-
-    # First collect all completed worksheets with scores
-    scored_worksheets = []
-    for worksheet in worksheets:
-        if worksheet.completed and worksheet.score is not None:
-            scored_worksheets.append(worksheet)
-
-    # Sort by date (oldest first) for the chart
-    scored_worksheets.sort(key=lambda w: w.created_at)
+    # One page of worksheets, newest first, with only the listed columns
+    cursor = request.args.get("cursor")
+    try:
+        worksheets, next_cursor = repository.get_child_worksheet_page(
+            child_id, cursor=cursor
+        )
+    except ValueError:
+        return redirect(url_for("worksheets.past_worksheets", child_id=child_id))
 
-    # Extract scores and dates in chronological order
-    for worksheet in scored_worksheets:
-        past_scores.append(round(worksheet.score, 1))
-        past_dates.append(worksheet.created_at.strftime("%Y-%m-%d"))
+    # Latest scores for the chart, from the child's score summary
+    summary = _score_summary(child_id)
 
     return render_template(
         "past_worksheets.html",
         user=user,
         child=child,
         worksheets=worksheets,
-        past_scores=past_scores,
-        past_dates=past_dates,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        past_scores=summary.recent_scores,
+        past_dates=summary.recent_dates,
+        score_summary=summary,
         is_premium=is_premium,
         subscription=subscription,
     )
 
 
+def _answer_from_text(problem_text: str):
+    """Compute the answer for a problem string without using eval."""
+    try:
+        return Problem.parse(problem_text).answer_text
+    except ValueError as e:
+        logger.warning(f"Failed to evaluate problem: {problem_text}. Error: {str(e)}")
+        return None
+
+
+def _answer_matches(student_answer: float, expected) -> bool:
+    """Check a student's answer against an answer key entry.
+
+    Answer keys hold fractional answers rounded to three decimals, so answers
+    are compared at that precision. Problems without a known answer are
+    never marked incorrect.
+    """
+    try:
+        expected = float(expected)
+    except (TypeError, ValueError):
+        return True
+    return round(student_answer, 3) == round(expected, 3)
+
+
+def _score_summary(child_id: str) -> ScoreSummary:
+    """Get the score summary of a child, building it from their worksheets.
+
+    Summaries are built once from the worksheet history and then kept up to
+    date by _record_grade(), so later reads are a single small item.
+    """
+    summary = repository.get_score_summary(child_id)
+    if summary is None:
+        summary = ScoreSummary(child_id)
+        worksheets = repository.get_child_worksheets(child_id)
+        for worksheet in sorted(worksheets, key=lambda w: w.created_at):
+            if worksheet.completed:
+                summary.add(worksheet, worksheet.operation_counts)
+        if not repository.save_score_summary(summary):
+            # Built and saved by a concurrent request first
+            summary = repository.get_score_summary(child_id)
+    return summary
+
+
+def _update_score_summary(
+    child_id: str, change: Callable[[ScoreSummary], None]
+) -> None:
+    """Apply a change to a child's score summary, retrying on conflicts.
+
+    The save fails if another request saved the summary since it was read,
+    and the change is then applied again to the fresh summary. Children
+    without a summary are skipped; theirs is built from the worksheet history
+    when first read.
+    """
+    for _ in range(SUMMARY_UPDATE_ATTEMPTS):
+        summary = repository.get_score_summary(child_id)
+        if summary is None:
+            return
+        change(summary)
+        if repository.save_score_summary(summary):
+            return
+    logger.error(f"Score summary of child {child_id} not updated: too many conflicts")
+
+
+def _record_grade(
+    child_id: str, worksheet: WorksheetModel, previous: Optional[WorksheetModel]
+) -> None:
+    """Count a new grade in a score summary, replacing the previous grade."""
+
+    def change(summary: ScoreSummary) -> None:
+        if previous is not None:
+            summary.remove(previous, previous.operation_counts)
+        summary.add(worksheet, worksheet.operation_counts)
+
+    _update_score_summary(child_id, change)
+
+
+def _forget_grades(child_id: str, worksheets: List[WorksheetModel]) -> None:
+    """Remove the grades of deleted worksheets from a child's score summary."""
+    graded = [worksheet for worksheet in worksheets if worksheet.completed]
+    if not graded:
+        return
+
+    def change(summary: ScoreSummary) -> None:
+        for worksheet in graded:
+            summary.remove(worksheet, worksheet.operation_counts)
+
+    _update_score_summary(child_id, change)
+
+
 @bp.route("/<worksheet_id>/grade")
 def grade_worksheet(worksheet_id):
     """Grade a worksheet."""
@@ -425,78 +809,12 @@ def grade_worksheet(worksheet_id):
         flash("Access denied.", "error")
         return redirect(url_for("pages.index"))
 
-    # Get past scores for sparkline
-    past_worksheets = repository.get_child_worksheets(child.id)
-    past_scores = []
-    past_dates = []
-
-    for w in past_worksheets:
-        if w.incorrect_problems is not None:  # Only include graded worksheets
-            # Handle problems which could be a list or a string
-            if isinstance(w.problems, str):
-                problems = json.loads(w.problems)
-            else:
-                problems = w.problems
-
-            total = len(problems)
-            incorrect = len(w.incorrect_problems)
-            score = ((total - incorrect) / total) * 100
-            past_scores.append(score)
-            past_dates.append(w.created_at.strftime("%Y-%m-%d"))
-
-    # Handle problems which could be a list or a string
-    if isinstance(worksheet.problems, str):
-        problems = json.loads(worksheet.problems)
-    else:
-        problems = worksheet.problems
+    # Past scores for the sparkline, from the child's score summary
+    summary = _score_summary(child.id)
 
-    # Generate problems and answers for the answer key view
-    problem_list = []
-    answers = []
-
-    # Process each problem to extract text and calculate answers
-    for p in problems:
-        if isinstance(p, dict):
-            # If problem is a dictionary, extract text and answer if available
-            problem_text = p.get("text", "")
-            problem_list.append({"text": problem_text})
-
-            # If answer is already in the problem dictionary, use it
-            if "answer" in p:
-                answers.append(p["answer"])
-            else:
-                # Otherwise calculate the answer from the problem text
-                try:
-                    # Replace × with * and ÷ with / for evaluation
-                    calc_text = problem_text.replace("×", "*").replace("÷", "/")
-                    # Remove any spaces
-                    calc_text = calc_text.replace(" ", "")
-                    # Evaluate the expression
-                    answer = eval(calc_text)
-                    answers.append(answer)
-                except Exception as e:
-                    # If evaluation fails, append None
-                    logger.warning(
-                        f"Failed to evaluate problem: {problem_text}. Error: {str(e)}"
-                    )
-                    answers.append(None)
-        elif isinstance(p, str):
-            # If problem is a string, use it directly
-            problem_list.append({"text": p})
-
-            # Calculate the answer from the problem text
-            try:
-                # Replace × with * and ÷ with / for evaluation
-                calc_text = p.replace("×", "*").replace("÷", "/")
-                # Remove any spaces
-                calc_text = calc_text.replace(" ", "")
-                # Evaluate the expression
-                answer = eval(calc_text)
-                answers.append(answer)
-            except Exception as e:
-                # If evaluation fails, append None
-                logger.warning(f"Failed to evaluate problem: {p}. Error: {str(e)}")
-                answers.append(None)
+    # Problems and answers for the answer key view
+    problems, answers = _worksheet_content(worksheet)
+    problem_list = [{"text": p} for p in problems]
 
     return render_template(
         "grade_worksheet.html",
@@ -506,8 +824,8 @@ def grade_worksheet(worksheet_id):
         answers=answers,
         worksheet=worksheet,
         incorrect_problems=worksheet.incorrect_problems,
-        past_scores=past_scores[-10:],  # Show last 10 scores
-        past_dates=past_dates[-10:],
+        past_scores=summary.recent_scores[-10:],  # Show last 10 scores
+        past_dates=summary.recent_dates[-10:],
         is_answer_key=True,
     )
 
@@ -531,10 +849,15 @@ def submit_grades(worksheet_id):
         data = request.get_json()
         incorrect_problems = data.get("incorrect_problems", [])
 
+        # Build the summary, if needed, from the history before this grade
+        _score_summary(child.id)
+        previous = copy.copy(worksheet) if worksheet.completed else None
+
         # Update worksheet with incorrect problems and mark as completed
         worksheet.incorrect_problems = incorrect_problems
         worksheet.completed = True
         repository.update_worksheet(worksheet)
+        _record_grade(child.id, worksheet, previous)
 
         return jsonify({"success": True})
     except Exception as e:
@@ -568,6 +891,7 @@ def delete_worksheet(worksheet_id):
 
         logger.info(f"Deleting worksheet with ID: {worksheet_id}")
         repository.delete_worksheet(worksheet_id)
+        _forget_grades(child.id, [worksheet])
         logger.info(f"Successfully deleted worksheet with ID: {worksheet_id}")
 
         flash("Worksheet deleted successfully!", "success")
@@ -593,19 +917,43 @@ def bulk_delete_worksheets():
     if not worksheet_ids:
         return jsonify({"success": False, "error": "No worksheets selected"}), 400
 
-    # Verify ownership of all worksheets before deleting
-    for worksheet_id in worksheet_ids:
-        worksheet = repository.get_worksheet(worksheet_id)
-        if not worksheet:
-            continue
-
-        child = repository.get_child_by_id(worksheet.child_id)
+    # Verify ownership of all worksheets before deleting, fetching each child
+    # once and only the stored counts needed to remove grades from score
+    # summaries
+    worksheets = repository.batch_get_worksheets(
+        worksheet_ids,
+        [
+            "child_id",
+            "completed",
+            "problem_count",
+            "incorrect_count",
+            "score",
+            "operation_counts",
+        ],
+    )
+    children = repository.batch_get_children(
+        {worksheet.child_id for worksheet in worksheets.values()}
+    )
+    for worksheet in worksheets.values():
+        child = children.get(worksheet.child_id)
         if not child or child.parent_email != user.email:
             return jsonify({"success": False, "error": "Access denied"}), 403
 
+    # Worksheets graded before their counts were stored
+    legacy = [
+        w.id for w in worksheets.values() if w.completed and w.stored_score is None
+    ]
+    if legacy:
+        worksheets.update(repository.batch_get_worksheets(legacy))
+
     # Delete all worksheets
-    for worksheet_id in worksheet_ids:
-        repository.delete_worksheet(worksheet_id)
+    repository.batch_delete_worksheets(worksheet_ids)
+
+    # Remove the deleted grades from each child's score summary
+    for child_id in children:
+        _forget_grades(
+            child_id, [w for w in worksheets.values() if w.child_id == child_id]
+        )
 
     flash(f"{len(worksheet_ids)} worksheets deleted successfully!", "success")
     return jsonify({"success": True})
@@ -81,17 +81,29 @@ def dynamodb(aws_credentials):
             AttributeDefinitions=[
                 {"AttributeName": "id", "AttributeType": "S"},
                 {"AttributeName": "child_id", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "N"},
             ],
             GlobalSecondaryIndexes=[
                 {
                     "IndexName": "ChildIdIndex",
-                    "KeySchema": [{"AttributeName": "child_id", "KeyType": "HASH"}],
+                    "KeySchema": [
+                        {"AttributeName": "child_id", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
                     "Projection": {"ProjectionType": "ALL"},
                 }
             ],
             BillingMode="PAY_PER_REQUEST",
         )
 
+        # Create Score summaries table
+        dynamodb.create_table(
+            TableName="mathtutor-score-summaries",
+            KeySchema=[{"AttributeName": "child_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "child_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
         yield dynamodb
 
 
@@ -2,13 +2,17 @@
 
 import os
 import tempfile
+import zipfile
 from io import BytesIO
 
 import pytest
 from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
+from src.document.fonts import FONTS_DIR, FontChoice, font_family
 from src.document.renderer import DocumentRenderer
 from src.document.template import LayoutChoice, TemplateManager
+from src.qr_generator import qr_matrix
 
 
 @pytest.fixture
@@ -60,6 +64,45 @@ def test_layout_calculation(renderer, sample_problems):
     assert all(x >= 400 for x in x_positions)
 
 
+def test_layout_paginates_long_worksheets(renderer):
+    """Test that problems beyond a page flow onto the next page."""
+    problems = ["2 + 2"] * 40
+    plan = renderer.template_manager.plan_layout(problems, LayoutChoice.TWO_COLUMN)
+
+    assert plan.page_count == 2
+    assert plan.pages[0] == range(0, 30)
+    assert plan.pages[1] == range(30, 40)
+    # The second page starts again at the top
+    assert plan.positions[30][1] == plan.positions[0][1]
+    assert all(y - 40 >= 50 for _, y, _ in plan.positions)
+
+
+def test_layout_makes_room_for_word_problems(renderer):
+    """Test that wrapped word problems push the next problem down."""
+    word_problem = (
+        "If you have 3 apples and get 2 more, then give 1 to a friend, "
+        "how many apples do you have left?"
+    )
+    problems = [word_problem] * 12
+    plan = renderer.template_manager.plan_layout(problems, LayoutChoice.ONE_COLUMN)
+
+    ys = [y for _, y, _ in plan.positions]
+    assert ys[0] - ys[1] >= 80
+    assert plan.page_count > 1
+    assert all(y - 80 >= 50 for y in ys)
+
+
+def test_layout_plans_are_cached_per_shape(renderer):
+    """Test that worksheets of the same shape share one immutable plan."""
+    template_manager = TemplateManager()
+    plan = template_manager.plan_layout(["2 + 2", "3 - 1"])
+
+    assert renderer.template_manager.plan_layout(["5 + 6", "9 - 4"]) is plan
+    assert template_manager.plan_layout(["2 + 2", "3 - 1", "4 + 4"]) is not plan
+    with pytest.raises(AttributeError):
+        plan.positions = ()
+
+
 def test_worksheet_creation(renderer, sample_problems):
     """Test worksheet PDF creation with different layouts."""
     with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
@@ -116,3 +159,147 @@ def test_automatic_layout_selection(renderer, sample_problems):
     assert (
         layout == LayoutChoice.ONE_COLUMN
     )  # Use one column when there are any long problems
+
+
+def test_render_pair(renderer, sample_problems, tmp_path, monkeypatch):
+    """Test that a worksheet and answer key are rendered from one plan."""
+    answers = ["4", "2", "8", "15", "5", "5"]
+    worksheet_path = tmp_path / "worksheet.pdf"
+    answer_key_path = tmp_path / "answer_key.pdf"
+
+    qr_calls = []
+
+    def counting_qr_matrix(worksheet_id):
+        qr_calls.append(worksheet_id)
+        return qr_matrix(worksheet_id)
+
+    monkeypatch.setattr("src.document.renderer.qr_matrix", counting_qr_matrix)
+
+    renderer.render_pair(
+        str(worksheet_path),
+        str(answer_key_path),
+        sample_problems,
+        answers,
+        "test_123",
+    )
+
+    assert qr_calls == ["test_123"]
+    assert worksheet_path.stat().st_size > 0
+    assert answer_key_path.stat().st_size > 0
+
+
+def test_render_pair_rejects_mismatched_answers(renderer, sample_problems, tmp_path):
+    """Test that mismatched answers fail before any PDF is written."""
+    worksheet_path = tmp_path / "worksheet.pdf"
+
+    with pytest.raises(ValueError, match="doesn't match"):
+        renderer.render_pair(
+            str(worksheet_path),
+            str(tmp_path / "answer_key.pdf"),
+            sample_problems,
+            ["4"],
+            "test_123",
+        )
+    assert not worksheet_path.exists()
+
+
+def test_plan_wraps_only_word_problems(renderer, sample_problems):
+    """Test that the render plan wraps word problems within the column."""
+    plan = renderer.plan(sample_problems, "test_123")
+
+    assert plan.wrapped[0] is None
+    lines = plan.wrapped[-1]
+    assert " ".join(lines) == sample_problems[-1]
+    assert all(stringWidth(line, "Helvetica", 12) <= 250 for line in lines)
+
+
+def test_render_to_stream(renderer, sample_problems):
+    """Test that PDFs can be rendered into a binary stream."""
+    answers = ["4", "2", "8", "15", "5", "5"]
+    worksheet_pdf = BytesIO()
+    answer_key_pdf = BytesIO()
+
+    renderer.create_worksheet(worksheet_pdf, sample_problems, "test_123")
+    renderer.create_answer_key(answer_key_pdf, sample_problems, answers, "test_123")
+
+    assert worksheet_pdf.getvalue().startswith(b"%PDF")
+    assert answer_key_pdf.getvalue().startswith(b"%PDF")
+
+
+def test_stream_archive(renderer, sample_problems):
+    """Test that worksheets are streamed as a ZIP archive, one chunk each."""
+    answers = ["4", "2", "8", "15", "5", "5"]
+    worksheets = [
+        (f"WS-{i}", sample_problems, answers, f"worksheet_{i}") for i in range(3)
+    ]
+
+    chunks = list(renderer.stream_archive(worksheets, answer_keys=True))
+
+    # One chunk per worksheet plus the closing central directory
+    assert len(chunks) == 4
+    with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+        assert sorted(archive.namelist()) == sorted(
+            [f"WS-{i}.pdf" for i in range(3)] + [f"WS-{i}_key.pdf" for i in range(3)]
+        )
+        for name in archive.namelist():
+            assert archive.read(name).startswith(b"%PDF")
+
+
+def test_create_document_shares_page_furniture(renderer):
+    """Test that a class set is one PDF reusing a form per page shape."""
+    problems = ["2 + 2", "3 - 1", "4 × 2", "9 ÷ 3"]
+    answers = ["4", "2", "8", "3"]
+    worksheets = [(problems, answers, f"worksheet_{i}") for i in range(5)]
+
+    pdf = BytesIO()
+    pages = renderer.create_document(pdf, worksheets, answer_keys=True)
+
+    content = pdf.getvalue()
+    assert pages == 10
+    assert content.count(b"/Type /Page\n") == 10
+    # One form for the worksheet furniture and one for the answer key's
+    assert content.count(b"/Subtype /Form") == 2
+
+
+def test_long_worksheet_renders_multiple_pages(renderer):
+    """Test that a worksheet longer than a page is rendered over pages."""
+    problems = ["2 + 2"] * 40
+
+    pdf = BytesIO()
+    renderer.create_worksheet(pdf, problems, "test_123", LayoutChoice.TWO_COLUMN)
+
+    assert pdf.getvalue().count(b"/Type /Page\n") == 2
+
+
+def test_create_document_rejects_mismatched_answers(renderer):
+    """Test that answer keys need one answer per problem."""
+    with pytest.raises(ValueError, match="doesn't match"):
+        renderer.create_document(
+            BytesIO(), [(["2 + 2"], [], "worksheet_1")], answer_keys=True
+        )
+
+
+def test_handwriting_font_is_registered_once(monkeypatch):
+    """Test that renderers share one parsed handwriting font."""
+    family = font_family(FontChoice.KIDS_HANDWRITING)
+
+    def fail_register(font):
+        raise AssertionError("font registered twice")
+
+    monkeypatch.setattr("src.document.fonts.pdfmetrics.registerFont", fail_register)
+
+    assert DocumentRenderer(font=FontChoice.KIDS_HANDWRITING).fonts is family
+
+
+def test_handwriting_font_is_embedded_as_subset(sample_problems):
+    """Test that handwriting PDFs embed only a subset of the font."""
+    renderer = DocumentRenderer(font=FontChoice.MESSY_HANDWRITING)
+
+    pdf = BytesIO()
+    renderer.create_worksheet(pdf, sample_problems, "test_123")
+
+    content = pdf.getvalue()
+    assert b"+Caveat" in content  # Subset fonts get a tagged name
+    assert b"/BaseFont /Helvetica" not in content
+    font_file = FONTS_DIR / "MessyHandwriting.ttf"
+    assert len(content) < font_file.stat().st_size / 4
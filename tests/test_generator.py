@@ -1,5 +1,10 @@
 """Tests for the problem generator."""
 
+import itertools
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from src.problem_generator import ProblemGenerator
@@ -108,22 +113,45 @@ def test_age_5_problem_distribution():
     """Test that age 5 problems have an appropriate distribution of addition and subtraction."""
     generator = ProblemGenerator(seed=42)  # Use a fixed seed for reproducibility
 
-    # Generate problems at different difficulty levels
-    low_problems, _ = generator.generate_math_problems(age=5, count=100, difficulty=0.2)
-    med_problems, _ = generator.generate_math_problems(age=5, count=100, difficulty=0.5)
-    high_problems, _ = generator.generate_math_problems(
-        age=5, count=100, difficulty=0.8
-    )
+    # The medium difficulty weights (0.6 addition) sit on the edge of the
+    # balanced range, so draw enough problems that the share's standard error,
+    # at most sqrt(0.25 / samples), is small and allow five of them
+    samples = 2000
+    tolerance = 5 * math.sqrt(0.25 / samples)
+
+    # Generate problems at different difficulty levels. Only 90 distinct
+    # problems exist at low difficulty, so draw the 100 as two worksheets.
+    low_problems = [
+        problem
+        for _ in range(2)
+        for problem in generator.generate_math_problems(
+            age=5, count=50, difficulty=0.2
+        )[0]
+    ]
+    med_problems = [
+        problem
+        for _ in range(samples // 100)
+        for problem in generator.generate_math_problems(
+            age=5, count=100, difficulty=0.5
+        )[0]
+    ]
+    high_problems = [
+        problem
+        for _ in range(samples // 100)
+        for problem in generator.generate_math_problems(
+            age=5, count=100, difficulty=0.8
+        )[0]
+    ]
 
     # Count addition and subtraction problems
     low_add = sum(1 for p in low_problems if "+" in p)
     low_sub = sum(1 for p in low_problems if "-" in p)
 
-    med_add = sum(1 for p in med_problems if "+" in p)
-    med_sub = sum(1 for p in med_problems if "-" in p)
+    med_add = sum(1 for p in med_problems if "+" in p) / samples
+    med_sub = sum(1 for p in med_problems if "-" in p) / samples
 
-    high_add = sum(1 for p in high_problems if "+" in p)
-    high_sub = sum(1 for p in high_problems if "-" in p)
+    high_add = sum(1 for p in high_problems if "+" in p) / samples
+    high_sub = sum(1 for p in high_problems if "-" in p) / samples
 
     # At low difficulty, should have more addition than subtraction
     assert (
@@ -131,17 +159,239 @@ def test_age_5_problem_distribution():
     ), f"Expected more addition than subtraction at low difficulty, got {low_add} addition and {low_sub} subtraction"
 
     # At medium difficulty, should be more balanced
-    assert (
-        0.4 <= med_add / 100 <= 0.6
-    ), f"Expected balanced distribution at medium difficulty, got {med_add}% addition"
-    assert (
-        0.4 <= med_sub / 100 <= 0.6
-    ), f"Expected balanced distribution at medium difficulty, got {med_sub}% subtraction"
+    assert 0.4 - tolerance <= med_add <= 0.6 + tolerance, (
+        "Expected balanced distribution at medium difficulty, "
+        f"got {med_add:.1%} addition"
+    )
+    assert 0.4 - tolerance <= med_sub <= 0.6 + tolerance, (
+        "Expected balanced distribution at medium difficulty, "
+        f"got {med_sub:.1%} subtraction"
+    )
 
     # At high difficulty, should be roughly equal
-    assert (
-        0.4 <= high_add / 100 <= 0.6
-    ), f"Expected balanced distribution at high difficulty, got {high_add}% addition"
-    assert (
-        0.4 <= high_sub / 100 <= 0.6
-    ), f"Expected balanced distribution at high difficulty, got {high_sub}% subtraction"
+    assert 0.4 - tolerance <= high_add <= 0.6 + tolerance, (
+        "Expected balanced distribution at high difficulty, "
+        f"got {high_add:.1%} addition"
+    )
+    assert 0.4 - tolerance <= high_sub <= 0.6 + tolerance, (
+        "Expected balanced distribution at high difficulty, "
+        f"got {high_sub:.1%} subtraction"
+    )
+
+
+def test_batch_generation_matches_loop_shape():
+    """Test that batch generation returns unique, correct problems per worksheet."""
+    generator = ProblemGenerator(seed=42)
+
+    worksheets = generator.generate_math_problems_batch(
+        age=8, count=30, difficulty=0.5, num_worksheets=4
+    )
+
+    assert len(worksheets) == 4
+    for problems, answers in worksheets:
+        assert len(problems) == 30
+        assert len(answers) == 30
+        assert len(set(problems)) == 30
+
+        for problem, answer in zip(problems, answers):
+            num1, operator, num2 = problem.split()
+            num1, num2 = int(num1), int(num2)
+            expected = {
+                "+": num1 + num2,
+                "-": num1 - num2,
+                "×": num1 * num2,
+                "÷": num1 // num2,
+            }[operator]
+            assert int(answer) == expected, f"Wrong answer {answer} for {problem}"
+            if operator == "-":
+                assert expected >= 0, f"Negative difference in {problem}"
+
+
+def test_batch_generation_age_5_rules():
+    """Test that batch generation keeps the age 5 sum caps."""
+    generator = ProblemGenerator(seed=42)
+
+    [(problems, answers)] = generator.generate_math_problems_batch(
+        age=5, count=20, difficulty=0.2
+    )
+    for problem, answer in zip(problems, answers):
+        num1, operator, num2 = problem.split()
+        assert 1 <= int(num1) <= 10
+        assert 1 <= int(num2) <= 10
+        assert 0 <= int(answer) <= 10, f"Answer {answer} out of range for {problem}"
+
+
+def test_problem_space_counts():
+    """Test that problem spaces count every distinct problem."""
+    generator = ProblemGenerator(seed=42)
+
+    # Age 5 at low difficulty: 45 additions with sums up to 10 and
+    # 45 subtractions with a single-digit second number
+    assert generator.count_unique_problems(age=5, difficulty=0.2) == 90
+
+    # Requesting the whole space returns every problem exactly once
+    problems, answers = generator.generate_math_problems(
+        age=5, count=90, difficulty=0.2
+    )
+    assert len(set(problems)) == 90
+    assert all(0 <= int(answer) <= 10 for answer in answers)
+
+
+def test_count_larger_than_problem_space():
+    """Test that asking for more problems than exist fails up front."""
+    generator = ProblemGenerator(seed=42)
+
+    with pytest.raises(ValueError, match="only 90 exist"):
+        generator.generate_math_problems(age=5, count=91, difficulty=0.2)
+
+    with pytest.raises(ValueError, match="only 90 exist"):
+        generator.generate_math_problems_batch(age=5, count=91, difficulty=0.2)
+
+
+def test_seed_does_not_touch_global_random():
+    """Test that seeded generators are reproducible and leave random alone."""
+    random.seed(1234)
+    expected = random.random()
+
+    random.seed(1234)
+    first = ProblemGenerator(seed=7).generate_math_problems(age=8, count=20)
+    second = ProblemGenerator(seed=7).generate_math_problems(age=8, count=20)
+
+    assert first == second
+    assert random.random() == expected
+
+
+def test_forked_generators_are_reproducible_across_threads():
+    """Test that forks of a seeded generator give the same problems in threads."""
+
+    def run(seed):
+        parent = ProblemGenerator(seed=seed)
+        forks = [parent.fork() for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            return list(
+                pool.map(
+                    lambda g: g.generate_math_problems(age=9, count=30, difficulty=0.5),
+                    forks,
+                )
+            )
+
+    first = run(99)
+    assert first == run(99)
+    # Forks draw from independent streams
+    assert len({tuple(problems) for problems, _ in first}) == len(first)
+
+
+def test_iter_problems_streams_unique_pages():
+    """Test that iter_problems yields lazily with per-page uniqueness."""
+    generator = ProblemGenerator(seed=42)
+
+    stream = generator.iter_problems(age=5, difficulty=0.2, page_size=30)
+    problems = list(itertools.islice(stream, 300))
+
+    assert len(problems) == 300
+    for start in range(0, 300, 30):
+        page = [p.text for p in problems[start : start + 30]]
+        assert len(set(page)) == 30
+
+    # A bounded stream stops after count problems, with a short last page
+    problems = list(generator.iter_problems(age=8, count=75, page_size=30))
+    assert len(problems) == 75
+
+
+def test_iter_problems_rejects_oversized_pages():
+    """Test that a page larger than the problem space fails on first use."""
+    generator = ProblemGenerator(seed=42)
+
+    stream = generator.iter_problems(age=5, difficulty=0.2, page_size=91)
+    with pytest.raises(ValueError, match="only 90 exist"):
+        next(stream)
+
+
+def test_iter_problems_small_count_fits_small_space():
+    """Test that only the problems requested must fit in the problem space."""
+    generator = ProblemGenerator(seed=42)
+
+    # 90 problems exist, fewer than the page size
+    problems = list(
+        generator.iter_problems(age=5, difficulty=0.2, count=5, page_size=100)
+    )
+    assert len(problems) == 5
+    assert len(set(problems)) == 5
+
+    stream = generator.iter_problems(age=5, difficulty=0.2, count=91, page_size=100)
+    with pytest.raises(ValueError, match="only 90 exist"):
+        next(stream)
+
+
+def test_iter_problems_rejects_empty_pages():
+    """Test that a page size below 1 fails instead of looping forever."""
+    generator = ProblemGenerator(seed=42)
+
+    for page_size in (0, -1):
+        stream = generator.iter_problems(age=8, page_size=page_size)
+        with pytest.raises(ValueError, match="at least 1"):
+            next(stream)
+
+
+def test_worksheet_batch_unique_across_worksheets():
+    """Test that a worksheet set never repeats a problem between sheets."""
+    generator = ProblemGenerator(seed=42)
+
+    sheets = generator.generate_worksheet_batch(age=8, difficulty=0.5, count=30, n=10)
+
+    assert len(sheets) == 10
+    all_problems = [p for problems, _ in sheets for p in problems]
+    assert len(all_problems) == 300
+    assert len(set(all_problems)) == 300
+    for problems, answers in sheets:
+        assert len(problems) == len(answers) == 30
+
+
+def test_worksheet_batch_falls_back_to_per_sheet_uniqueness():
+    """Test the fallback when the set needs more problems than exist."""
+    generator = ProblemGenerator(seed=42)
+
+    # Only 90 distinct problems exist for age 5 at difficulty 0.2
+    sheets = generator.generate_worksheet_batch(age=5, difficulty=0.2, count=30, n=5)
+
+    assert len(sheets) == 5
+    for problems, answers in sheets:
+        assert len(problems) == len(set(problems)) == 30
+        assert len(answers) == 30
+
+
+def test_worksheet_batch_starts_with_previewed_problems():
+    """Test that a previewed set opens the first worksheet of a batch."""
+    preview = ProblemGenerator(seed=1).generate_math_problems(
+        age=8, count=5, difficulty=0.5
+    )
+    generator = ProblemGenerator(seed=42)
+
+    sheets = generator.generate_worksheet_batch(
+        age=8, difficulty=0.5, count=30, n=10, start_with=preview
+    )
+
+    problems, answers = sheets[0]
+    assert problems[:5] == preview[0]
+    assert answers[:5] == preview[1]
+    all_problems = [p for problems, _ in sheets for p in problems]
+    assert len(all_problems) == len(set(all_problems)) == 300
+
+
+def test_previewed_batch_without_cross_sheet_uniqueness():
+    """Test that spares never repeat a problem within a later worksheet."""
+    for seed in range(20):
+        preview = ProblemGenerator(seed=seed).generate_math_problems(
+            age=5, count=5, difficulty=0.2
+        )
+        generator = ProblemGenerator(seed=seed)
+
+        # 120 problems from a space of 90 falls back to per-sheet uniqueness
+        sheets = generator.generate_worksheet_batch(
+            age=5, difficulty=0.2, count=30, n=4, start_with=preview
+        )
+
+        assert sheets[0][0][:5] == preview[0]
+        for problems, answers in sheets:
+            assert len(problems) == len(set(problems)) == 30
+            assert len(answers) == 30
@@ -0,0 +1,67 @@
+"""Tests for the MathTutor application."""
+
+import os
+
+import pytest
+
+from src.document.template import LayoutChoice
+from src.main import MathTutor, WorksheetSpec
+from src.problem_generator import ProblemGenerator
+
+
+@pytest.fixture
+def tutor(tmp_path):
+    """Create a MathTutor writing into a temporary directory."""
+    return MathTutor(output_dir=str(tmp_path))
+
+
+def test_generate_worksheets_in_parallel(tutor):
+    """Test that a process pool writes every worksheet to its own paths."""
+    specs = [
+        WorksheetSpec(age=6, difficulty=0.3),
+        WorksheetSpec(age=8, count=20, layout=LayoutChoice.ONE_COLUMN),
+        WorksheetSpec(age=9, difficulty=0.8),
+    ]
+
+    results = tutor.generate_worksheets(specs, workers=2, seed=7)
+
+    assert [result.spec for result in results] == specs
+    paths = [r.worksheet_path for r in results] + [r.answer_key_path for r in results]
+    assert len(set(paths)) == 6
+    for path in paths:
+        assert os.path.getsize(path) > 0
+    for result in results:
+        assert result.generation_seconds >= 0
+        assert result.render_seconds >= 0
+        assert result.total_seconds >= result.render_seconds
+
+
+def test_generate_worksheets_seeds_are_deterministic(tutor):
+    """Test that each task's seed depends only on the run seed and position."""
+    specs = [WorksheetSpec(age=7, difficulty=0.5)] * 3
+
+    first = tutor.generate_worksheets(specs, workers=1, seed=11)
+    second = tutor.generate_worksheets(specs, workers=2, seed=11)
+
+    assert [r.seed for r in first] == [r.seed for r in second]
+    assert len({r.seed for r in first}) == 3
+
+    # Each task draws its problems from a different stream
+    sheets = [
+        ProblemGenerator(seed=r.seed).generate_math_problems(age=7, difficulty=0.5)
+        for r in first
+    ]
+    assert len({tuple(problems) for problems, _ in sheets}) == 3
+
+
+def test_generate_worksheets_runs_do_not_overwrite(tutor):
+    """Test that back-to-back runs write to distinct paths."""
+    specs = [WorksheetSpec(age=6)] * 2
+
+    first = tutor.generate_worksheets(specs, workers=1, seed=3)
+    second = tutor.generate_worksheets(specs, workers=1, seed=3)
+
+    paths = {r.worksheet_path for r in first + second}
+    assert len(paths) == 4
+    for path in paths:
+        assert os.path.getsize(path) > 0
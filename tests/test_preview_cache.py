@@ -0,0 +1,39 @@
+"""Tests for the preview cache."""
+
+import time
+
+from src.preview_cache import PreviewCache
+
+PREVIEW = (["1 + 1 ="], ["2"])
+
+
+def test_pop_returns_preview_once():
+    """Test that a preview is reused by one worksheet only."""
+    cache = PreviewCache()
+    cache.put("key", PREVIEW)
+
+    assert cache.get("key") == PREVIEW
+    assert cache.pop("key") == PREVIEW
+    assert cache.pop("key") is None
+
+
+def test_entries_expire():
+    """Test that stale previews are not returned."""
+    cache = PreviewCache(ttl=0.01)
+    cache.put("key", PREVIEW)
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache stays bounded."""
+    cache = PreviewCache(max_entries=2)
+    cache.put("a", PREVIEW)
+    cache.put("b", PREVIEW)
+    cache.get("a")
+    cache.put("c", PREVIEW)
+
+    assert cache.get("a") == PREVIEW
+    assert cache.get("b") is None
+    assert cache.get("c") == PREVIEW
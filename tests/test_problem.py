@@ -0,0 +1,69 @@
+"""Tests for the Problem value type."""
+
+from fractions import Fraction
+
+import pytest
+
+from src.problem import Problem
+from src.problem_generator import ProblemGenerator
+
+
+@pytest.mark.parametrize(
+    "text,answer,answer_text",
+    [
+        ("12 + 4", 16, "16"),
+        ("12 - 4", 8, "8"),
+        ("12 × 4", 48, "48"),
+        ("12 ÷ 4", 3, "3"),
+        ("3/4", Fraction(3, 4), "0.75"),
+        ("4/4", Fraction(1), "1.0"),
+    ],
+)
+def test_parse_computes_exact_answers(text, answer, answer_text):
+    """Test that parsed problems carry exact answers and formatted text."""
+    problem = Problem.parse(text)
+    assert problem.answer == answer
+    assert problem.text == text
+    assert problem.answer_text == answer_text
+    assert Problem.from_compact(problem.to_compact()) == problem
+
+
+@pytest.mark.parametrize(
+    "text", ["__import__('os')", "2 ** 10", "1 + 2 + 3", "5 ÷ 0", "Which is more?"]
+)
+def test_parse_rejects_anything_but_simple_problems(text):
+    """Test that parsing never evaluates arbitrary expressions."""
+    with pytest.raises(ValueError):
+        Problem.parse(text)
+
+
+@pytest.mark.parametrize(
+    "text,operation",
+    [
+        ("12 + 4", "addition"),
+        ("12 - 4", "subtraction"),
+        ("12 × 4", "multiplication"),
+        ("12 ÷ 4", "division"),
+        ("3/4", "fraction"),
+    ],
+)
+def test_operation_names(text, operation):
+    """Test that problems report the name of their operation."""
+    assert Problem.parse(text).operation == operation
+
+
+def test_problems_use_slots():
+    """Test that problems are compact records without a __dict__."""
+    problem = Problem(3, "×", 4)
+    assert not hasattr(problem, "__dict__")
+
+
+def test_generated_problems_match_text_output():
+    """Test that generate_problems agrees with the string API."""
+    problems = ProblemGenerator(seed=3).generate_problems(age=9, count=30)
+    texts, answers = ProblemGenerator(seed=3).generate_math_problems(age=9, count=30)
+
+    assert [p.text for p in problems] == texts
+    assert [p.answer_text for p in problems] == answers
+    for problem in problems:
+        assert Problem.parse(problem.text).answer == problem.answer
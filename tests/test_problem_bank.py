@@ -0,0 +1,72 @@
+"""Tests for the memory-mapped problem bank."""
+
+import numpy as np
+import pytest
+
+from src.problem import Problem
+from src.problem_bank import ProblemBank, build_problem_bank, open_problem_bank
+from src.problem_generator import ProblemGenerator
+
+
+@pytest.fixture(scope="module")
+def bank(tmp_path_factory):
+    """Build a problem bank once for all tests."""
+    path = tmp_path_factory.mktemp("bank") / "problem_bank.bin"
+    build_problem_bank(path, ProblemGenerator().strategies)
+    return ProblemBank(path)
+
+
+def test_bank_is_memory_mapped(bank):
+    """Test that rows are read from the file instead of copied into memory."""
+    assert isinstance(bank.rows, np.memmap)
+    segment = bank.segment(8, "multiplication", 0.5)
+    assert np.shares_memory(segment.rows, bank.rows)
+
+
+def test_bank_matches_problem_spaces(bank):
+    """Test that every segment holds the problems of its problem space."""
+    generator = ProblemGenerator()
+    for age, difficulty in [(5, 0.2), (5, 0.7), (7, 0.5), (9, 0.9), (9, 0.505)]:
+        spaces = generator._problem_spaces(age, difficulty)
+        for problem_type, space in spaces.items():
+            segment = bank.segment(age, problem_type, difficulty)
+            assert len(segment) == len(space)
+
+            # Check both ends and a spread of rows in between
+            indices = np.unique(np.linspace(0, len(space) - 1, 200).astype(int))
+            strategy = generator.strategies[problem_type]
+            expected = strategy.to_problems(
+                *strategy.build_batch(*space.decode(indices))
+            )
+            actual = segment.problems(indices)
+            assert actual == expected
+            for problem in actual:
+                assert problem.answer == Problem.parse(problem.text).answer
+
+
+def test_bank_mode_reproduces_generated_problems(bank):
+    """Test that a seed produces the same problems with or without a bank."""
+    for age in [5, 6, 7, 8, 9]:
+        with_bank = ProblemGenerator(seed=3, bank=bank)
+        without_bank = ProblemGenerator(seed=3)
+
+        assert with_bank.generate_math_problems(
+            age, difficulty=0.4
+        ) == without_bank.generate_math_problems(age, difficulty=0.4)
+        assert with_bank.generate_worksheet_batch(
+            age, difficulty=0.8, n=3
+        ) == without_bank.generate_worksheet_batch(age, difficulty=0.8, n=3)
+
+    # Forks keep using the bank
+    assert ProblemGenerator(bank=bank).fork().bank is bank
+
+
+def test_open_problem_bank(tmp_path):
+    """Test that a missing or invalid bank file disables bank mode."""
+    assert open_problem_bank(tmp_path / "missing.bin") is None
+
+    invalid = tmp_path / "invalid.bin"
+    invalid.write_bytes(b"not a problem bank")
+    assert open_problem_bank(invalid) is None
+    with pytest.raises(ValueError, match="Not a problem bank"):
+        ProblemBank(invalid)
@@ -0,0 +1,49 @@
+"""Tests for the problem type sampler."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.problem_sampler import AliasSampler, get_problem_type_sampler
+from src.problem_types import (
+    DIFFICULTY_BUCKETS,
+    difficulty_bucket,
+    get_difficulty_weights,
+)
+
+
+def test_alias_sampler_matches_weights():
+    """Test that draws follow the configured weights."""
+    sampler = AliasSampler(["a", "b", "c"], [0.5, 0.3, 0.2])
+
+    draws = sampler.draw_many(20000, random.Random(1))
+    for outcome, weight in [("a", 0.5), ("b", 0.3), ("c", 0.2)]:
+        assert abs(draws.count(outcome) / len(draws) - weight) < 0.02
+
+    indices = sampler.draw_indices((100, 200), np.random.default_rng(1))
+    assert indices.shape == (100, 200)
+    counts = np.bincount(indices.ravel(), minlength=3) / indices.size
+    assert np.allclose(counts, [0.5, 0.3, 0.2], atol=0.02)
+
+
+def test_problem_type_sampler_is_cached_per_bucket():
+    """Test that nearby difficulties share one cached sampler."""
+    sampler = get_problem_type_sampler(8, 0.499)
+    assert get_problem_type_sampler(8, 0.491) is sampler
+    assert get_problem_type_sampler(8, 0.5) is sampler
+    assert get_problem_type_sampler(8, 0.501) is not sampler
+
+    expected = get_difficulty_weights(8, 0.5)
+    assert sampler.weights == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        get_problem_type_sampler(4, 0.5)
+
+
+def test_problem_type_sampler_shares_range_table_buckets():
+    """Test that samplers and range tables quantize difficulty the same way."""
+    for difficulty in (0.0, 0.07, 0.3, 0.301, 0.499, 0.5, 0.7001, 1.0):
+        bucket = difficulty_bucket(difficulty)
+        sampler = get_problem_type_sampler(8, difficulty)
+        assert sampler is get_problem_type_sampler(8, bucket / DIFFICULTY_BUCKETS)
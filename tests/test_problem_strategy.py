@@ -0,0 +1,39 @@
+"""Tests for problem strategy helpers."""
+
+import pytest
+
+from src.problem_strategy import (
+    DIFFICULTY_BUCKETS,
+    RANGE_TABLE,
+    adjust_range_by_difficulty,
+    difficulty_bucket,
+    lookup_range,
+)
+from src.problem_types import PROBLEM_TYPES
+
+
+def test_range_table_matches_adjust_range_by_difficulty():
+    """Test that every precomputed range matches the direct computation."""
+    for age, problem_types in PROBLEM_TYPES.items():
+        for problem_type, (min_val, max_val) in problem_types.items():
+            for bucket in range(DIFFICULTY_BUCKETS + 1):
+                difficulty = bucket / DIFFICULTY_BUCKETS
+                expected = adjust_range_by_difficulty(min_val, max_val, difficulty, age)
+                assert lookup_range(age, problem_type, difficulty) == expected
+                assert RANGE_TABLE[(age, problem_type, bucket)] == expected
+
+
+@pytest.mark.parametrize(
+    "difficulty,bucket",
+    [(0.0, 0), (0.07, 7), (0.3, 30), (0.301, 31), (0.5, 50), (0.7001, 71), (1.0, 100)],
+)
+def test_difficulty_bucket_rounds_up(difficulty, bucket):
+    """Test that buckets keep thresholds on the same side as the difficulty."""
+    assert difficulty_bucket(difficulty) == bucket
+
+
+def test_lookup_range_respects_age_5_thresholds():
+    """Test that off-grid difficulties land on the right side of thresholds."""
+    assert lookup_range(5, "addition", 0.3) == (1, 10)
+    assert lookup_range(5, "addition", 0.3001) == (1, 15)
+    assert lookup_range(5, "addition", 0.6001) == (1, 20)
@@ -0,0 +1,45 @@
+"""Tests for QR code generation."""
+
+from io import BytesIO
+
+from reportlab.pdfgen import canvas
+
+from src.qr_generator import QR_CACHE_SIZE, draw_qr_code, qr_matrix
+
+
+def test_qr_matrix_is_cached():
+    """Test that repeated worksheet IDs reuse the cached module matrix."""
+    qr_matrix.cache_clear()
+
+    first = qr_matrix("worksheet_123")
+    assert qr_matrix("worksheet_123") is first
+    assert qr_matrix.cache_info().hits == 1
+    assert qr_matrix.cache_info().maxsize == QR_CACHE_SIZE
+
+
+def test_qr_matrix_layout():
+    """Test the matrix is square with a quiet zone and finder patterns."""
+    matrix = qr_matrix("worksheet_123")
+    size = len(matrix)
+
+    assert all(len(row) == size for row in matrix)
+    # Four light modules of border on every side
+    for i in range(4):
+        assert not any(matrix[i]) and not any(matrix[size - 1 - i])
+        assert not any(row[i] or row[size - 1 - i] for row in matrix)
+    # Top-left finder pattern has a solid dark outer ring
+    assert all(matrix[4][4:11]) and all(matrix[10][4:11])
+
+
+def test_draw_qr_code_uses_vector_paths():
+    """Test that the code is drawn as one filled path without images."""
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.setPageCompression(0)
+    draw_qr_code(pdf, qr_matrix("worksheet_123"), 500, 730, 40)
+    pdf.save()
+
+    content = buffer.getvalue()
+    assert b"/Subtype /Image" not in content
+    assert content.count(b" re") > 0
+    assert content.count(b"\nf") == 1
@@ -0,0 +1,153 @@
+"""Tests for background PDF render jobs."""
+
+import threading
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from src.database.jobs import InMemoryJobStore, create_job_store
+from src.database.models import RenderJob
+from src.document.jobs import RenderQueue
+
+PROBLEMS = ["2 + 2", "3 - 1", "4 × 2"]
+ANSWERS = ["4", "2", "8"]
+
+
+class RecordingStore(InMemoryJobStore):
+    """In-memory store that signals when a job is finished."""
+
+    def __init__(self):
+        super().__init__()
+        self.finished = threading.Event()
+
+    def save(self, job):
+        super().save(job)
+        if job.is_finished:
+            self.finished.set()
+
+
+@pytest.fixture
+def queue():
+    """Create a render queue with one worker process."""
+    queue = RenderQueue(RecordingStore(), workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def run_job(queue, job, worksheets):
+    """Submit a job and wait until it is finished."""
+    queue.submit(job, worksheets)
+    assert queue.store.finished.wait(timeout=60)
+    return queue.store.get(job.id)
+
+
+def test_single_worksheet_job_renders_pdf(queue):
+    """Test that one worksheet renders to a PDF of its answer key."""
+    job = RenderJob(user_email="parent@example.com", worksheet_ids=["w1"])
+    job.answer_key = True
+
+    job = run_job(queue, job, [("WS-1", PROBLEMS, ANSWERS, "w1")])
+
+    assert job.status == RenderJob.STATUS_DONE
+    assert job.filename == "WS-1_key.pdf"
+    assert job.content_type == "application/pdf"
+    assert job.result.startswith(b"%PDF")
+
+
+def test_bulk_job_renders_zip(queue):
+    """Test that several worksheets render to a ZIP of PDFs."""
+    worksheets = [(f"WS-{i}", PROBLEMS, ANSWERS, f"w{i}") for i in range(3)]
+    job = RenderJob(user_email="parent@example.com", worksheet_ids=["w0", "w1", "w2"])
+
+    job = run_job(queue, job, worksheets)
+
+    assert job.status == RenderJob.STATUS_DONE
+    assert job.content_type == "application/zip"
+    with zipfile.ZipFile(BytesIO(job.result)) as archive:
+        assert sorted(archive.namelist()) == ["WS-0.pdf", "WS-1.pdf", "WS-2.pdf"]
+
+
+def test_failed_job_records_error(queue):
+    """Test that a job whose rendering raises is marked as failed."""
+    job = RenderJob(
+        user_email="parent@example.com", worksheet_ids=["w1"], answer_key=True
+    )
+
+    job = run_job(queue, job, [("WS-1", PROBLEMS, ["4"], "w1")])
+
+    assert job.status == RenderJob.STATUS_FAILED
+    assert "doesn't match" in job.error
+    assert job.result is None
+
+
+def test_oversized_result_fails_job():
+    """Test that a result larger than the store can keep fails the job."""
+    store = RecordingStore()
+    store.max_result_bytes = 100
+    queue = RenderQueue(store, workers=1)
+    try:
+        job = RenderJob(user_email="parent@example.com", worksheet_ids=["w1"])
+        job = run_job(queue, job, [("WS-1", PROBLEMS, ANSWERS, "w1")])
+    finally:
+        queue.shutdown()
+
+    assert job.status == RenderJob.STATUS_FAILED
+    assert "too large" in job.error
+    assert job.result is None
+
+
+class RejectingResultStore(RecordingStore):
+    """Store that cannot save results, like an item over the size limit."""
+
+    def save(self, job):
+        if job.result is not None:
+            raise ValueError("Item size has exceeded the maximum allowed size")
+        super().save(job)
+
+
+def test_failed_result_save_fails_job():
+    """Test that a job whose result cannot be saved does not stay pending."""
+    queue = RenderQueue(RejectingResultStore(), workers=1)
+    try:
+        job = RenderJob(user_email="parent@example.com", worksheet_ids=["w1"])
+        job = run_job(queue, job, [("WS-1", PROBLEMS, ANSWERS, "w1")])
+    finally:
+        queue.shutdown()
+
+    assert job.status == RenderJob.STATUS_FAILED
+    assert "maximum allowed size" in job.error
+
+
+def test_render_job_item_round_trip():
+    """Test that a finished job survives conversion to a DynamoDB item."""
+    job = RenderJob(
+        user_email="parent@example.com", worksheet_ids=["w2", "w1"], answer_key=True
+    )
+    job.finish("WS-1_key.pdf", "application/pdf", b"%PDF-1.4 data")
+
+    restored = RenderJob.from_item(job.to_item())
+
+    assert restored.id == job.id
+    assert restored.worksheet_ids == ["w2", "w1"]
+    assert restored.answer_key is True
+    assert restored.status == RenderJob.STATUS_DONE
+    assert restored.result == b"%PDF-1.4 data"
+    assert restored.expires_at == job.expires_at
+
+
+def test_in_memory_store_hides_expired_jobs():
+    """Test that expired jobs are no longer returned."""
+    store = create_job_store("memory")
+    job = RenderJob(user_email="parent@example.com", worksheet_ids=["w1"])
+    store.save(job)
+    assert store.get(job.id) is job
+
+    job.expires_at = job.utc_now() - 1
+    assert store.get(job.id) is None
+
+
+def test_unknown_job_store():
+    """Test that an unknown backend is rejected."""
+    with pytest.raises(ValueError, match="Unknown render job store"):
+        create_job_store("redis")
@@ -0,0 +1,118 @@
+"""Tests for per-child score summaries."""
+
+import json
+from datetime import datetime
+
+from src.database.models import ScoreSummary, Worksheet
+
+
+def graded_worksheet(day, problem_count, incorrect):
+    """Create a graded worksheet created on a day of January 2024."""
+    worksheet = Worksheet(
+        child_id="child",
+        problems=[f"{i} + 1" for i in range(problem_count)],
+        completed=True,
+        incorrect_problems=incorrect,
+    )
+    worksheet.created_at = datetime(2024, 1, day)
+    return worksheet
+
+
+def test_add_tracks_scores_and_operations():
+    """Test that graded worksheets update averages and recent scores."""
+    summary = ScoreSummary("child")
+    summary.add(graded_worksheet(2, 10, [0, 1]), {"addition": [10, 2]})
+    summary.add(graded_worksheet(1, 4, []), {"subtraction": [4, 0]})
+
+    assert summary.graded_count == 2
+    assert summary.average_score == 90.0
+    assert summary.accuracy == 12 / 14 * 100
+    assert summary.recent_scores == [100.0, 80.0]
+    assert summary.recent_dates == ["2024-01-01", "2024-01-02"]
+    assert summary.operation_accuracy() == {"addition": 80.0, "subtraction": 100.0}
+
+
+def test_regrade_replaces_previous_grade():
+    """Test that removing the old grade before adding the new one nets out."""
+    summary = ScoreSummary("child")
+    worksheet = graded_worksheet(1, 10, [0, 1, 2, 3])
+    summary.add(worksheet, {"addition": [10, 4]})
+
+    regraded = graded_worksheet(1, 10, [0])
+    regraded.id = worksheet.id
+    summary.remove(worksheet, {"addition": [10, 4]})
+    summary.add(regraded, {"addition": [10, 1]})
+
+    assert summary.graded_count == 1
+    assert summary.recent_scores == [90.0]
+    assert summary.operations == {"addition": [10, 1]}
+
+
+def test_recent_scores_are_bounded():
+    """Test that only the latest scores are kept for charts."""
+    summary = ScoreSummary("child")
+    for day in range(1, 31):
+        for _ in range(2):
+            summary.add(graded_worksheet(day, 5, []), {})
+
+    assert len(summary.recent) == ScoreSummary.RECENT_LIMIT
+    assert summary.recent_dates[-1] == "2024-01-30"
+    assert summary.graded_count == 60
+
+
+def test_item_round_trip():
+    """Test converting a summary to a DynamoDB item and back."""
+    summary = ScoreSummary("child")
+    summary.add(graded_worksheet(1, 10, [3]), {"addition": [10, 1]})
+
+    restored = ScoreSummary.from_item(summary.to_item())
+
+    assert restored.child_id == "child"
+    assert restored.graded_count == 1
+    assert restored.average_score == summary.average_score
+    assert restored.recent == summary.recent
+    assert restored.operations == summary.operations
+
+
+def test_remove_with_stored_counts():
+    """Test removing a worksheet read without its problems."""
+    summary = ScoreSummary("child")
+    worksheet = graded_worksheet(1, 10, [3, 4])
+    summary.add(worksheet, worksheet.operation_counts)
+
+    projected = Worksheet.from_dict(
+        {
+            "id": worksheet.id,
+            "child_id": "child",
+            "completed": True,
+            "problem_count": 10,
+            "incorrect_count": 2,
+            "score": worksheet.score,
+            "operation_counts": json.dumps(worksheet.operation_counts),
+        }
+    )
+    assert projected.operation_counts == {"addition": [10, 2]}
+    summary.remove(projected, projected.operation_counts)
+
+    assert summary.graded_count == 0
+    assert summary.score_total == 0
+    assert summary.problem_count == 0
+    assert summary.incorrect_count == 0
+    assert summary.operations == {}
+    assert summary.recent == []
+
+
+def test_stale_summary_is_not_saved(repository):
+    """Test that a summary changed since it was read is not overwritten."""
+    assert repository.save_score_summary(ScoreSummary("child"))
+    first = repository.get_score_summary("child")
+    second = repository.get_score_summary("child")
+
+    first.add(graded_worksheet(1, 10, [0]), {"addition": [10, 1]})
+    assert repository.save_score_summary(first)
+    second.add(graded_worksheet(2, 10, []), {"addition": [10, 0]})
+    assert not repository.save_score_summary(second)
+
+    saved = repository.get_score_summary("child")
+    assert saved.graded_count == 1
+    assert saved.version == 2
@@ -0,0 +1,73 @@
+"""Tests for SVG worksheet rendering."""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.document.renderer import DocumentRenderer
+from src.document.svg import PAGE_HEIGHT, SVGRenderer
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def svg_renderer():
+    """Create an SVGRenderer instance for testing."""
+    return SVGRenderer()
+
+
+@pytest.fixture
+def sample_problems():
+    """Create sample problems for testing."""
+    return [
+        "2 + 2",
+        "3 - 1",
+        "If you have 3 apples and get 2 more, how many do you have?",
+    ]
+
+
+def test_svg_matches_pdf_layout(svg_renderer, sample_problems):
+    """Test that boxes and problems sit where the PDF plan puts them."""
+    plan = svg_renderer.renderer.plan(sample_problems, "test_123")
+
+    [page] = svg_renderer.render_pages(sample_problems, "test_123")
+
+    root = ET.fromstring(page)
+    boxes = [
+        (float(r.get("x")), float(r.get("y")), float(r.get("height")))
+        for r in root.iter(f"{SVG_NS}rect")
+    ]
+    assert boxes == [(x, PAGE_HEIGHT - y - h, h) for x, y, _, h in plan.boxes]
+
+    texts = {
+        t.text: (float(t.get("x")), float(t.get("y")))
+        for t in root.iter(f"{SVG_NS}text")
+    }
+    x_problem, y, _ = plan.positions[0]
+    assert texts["1."] == (x_problem, PAGE_HEIGHT - y)
+    for line in plan.wrapped[2]:
+        assert line in texts
+    assert len(root.findall(f"{SVG_NS}path")) == 1
+
+
+def test_svg_answer_key(svg_renderer, sample_problems):
+    """Test that answer keys show answers and escape text."""
+    answers = ["4", "2", "<5>"]
+
+    [page] = svg_renderer.render_pages(sample_problems, "test_123", answers)
+
+    assert "Answer Key" in page
+    assert "&lt;5&gt;" in page
+    with pytest.raises(ValueError, match="doesn't match"):
+        svg_renderer.render_pages(sample_problems, "test_123", ["4"])
+
+
+def test_svg_pages_are_cached_and_paginated(svg_renderer):
+    """Test that long worksheets span pages and repeat renders are cached."""
+    problems = ["2 + 2"] * 40
+
+    pages = svg_renderer.render_pages(problems, "test_123")
+
+    assert len(pages) == len(DocumentRenderer().plan(problems, "test_123").pages)
+    assert len(pages) == 2
+    assert svg_renderer.render_pages(problems, "test_123") is pages
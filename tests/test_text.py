@@ -0,0 +1,54 @@
+"""Tests for text measurement and wrapping."""
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from src.document.text import (
+    glyph_widths,
+    is_word_problem,
+    text_width,
+    wrap_problem,
+)
+
+
+@pytest.mark.parametrize(
+    "text", ["12 × 4", "How many apples are left?", "÷ 3/4 = ?", ""]
+)
+@pytest.mark.parametrize("font_name", ["Helvetica", "Helvetica-Bold"])
+def test_text_width_matches_reportlab(text, font_name):
+    """Test that cached glyph widths measure like stringWidth()."""
+    assert text_width(text, font_name, 12) == pytest.approx(
+        stringWidth(text, font_name, 12)
+    )
+
+
+def test_glyph_widths_are_cached_per_font():
+    """Test that one lazily filled table is kept per font."""
+    table = glyph_widths("Helvetica")
+    text_width("xyz", "Helvetica", 12)
+
+    assert glyph_widths("Helvetica") is table
+    assert {"x", "y", "z"} <= table.keys()
+
+
+def test_is_word_problem():
+    """Test word problem classification."""
+    assert not is_word_problem("12 + 4")
+    assert is_word_problem("Which number is greater: 12 or 15?")
+    assert is_word_problem("x" * 31)
+
+
+def test_wrap_problem():
+    """Test that word problems wrap within the width and are memoized."""
+    problem = (
+        "If you have 3 apples and get 2 more, then give 1 to a friend, "
+        "how many apples do you have left?"
+    )
+
+    lines = wrap_problem(problem)
+
+    assert wrap_problem("12 + 4") is None
+    assert len(lines) > 1
+    assert " ".join(lines) == problem
+    assert all(stringWidth(line, "Helvetica", 12) <= 250 for line in lines)
+    assert wrap_problem(problem) is lines
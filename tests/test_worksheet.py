@@ -1,6 +1,9 @@
 """Tests for worksheet functionality."""
 
 import json
+from datetime import datetime, timedelta
+
+import pytest
 
 from src.database.models import Worksheet
 from src.models import Worksheet as WorksheetModel
@@ -117,3 +120,110 @@ def test_grade_worksheet_all_correct(repository, test_child_dynamodb):
     assert saved_worksheet is not None
     assert saved_worksheet.completed is True
     assert saved_worksheet.incorrect_problems == []
+
+
+def test_batch_get_and_delete_worksheets(repository, test_child_dynamodb):
+    """Test fetching and deleting worksheets in batches."""
+    worksheets = [
+        Worksheet(
+            child_id=test_child_dynamodb.id,
+            problems=[{"type": "addition", "a": i, "b": 1, "answer": i + 1}],
+        )
+        for i in range(30)
+    ]
+    for worksheet in worksheets:
+        repository.create_worksheet(worksheet)
+    ids = [worksheet.id for worksheet in worksheets]
+
+    # Projected fetch returns only the requested attributes
+    fetched = repository.batch_get_worksheets(ids + ["nonexistent-id"], ["child_id"])
+    assert set(fetched) == set(ids)
+    assert all(w.child_id == test_child_dynamodb.id for w in fetched.values())
+    assert all(w.problems == [] for w in fetched.values())
+
+    children = repository.batch_get_children([test_child_dynamodb.id])
+    assert children[test_child_dynamodb.id].name == test_child_dynamodb.name
+
+    # More worksheets than a single BatchWriteItem request holds
+    repository.batch_delete_worksheets(ids)
+    assert repository.batch_get_worksheets(ids) == {}
+
+
+def test_batch_get_retries_unprocessed_keys(repository, monkeypatch):
+    """Test that unprocessed keys are requested again."""
+    calls = []
+
+    def batch_get_item(RequestItems):
+        calls.append(RequestItems)
+        ((table, request),) = RequestItems.items()
+        keys = request["Keys"]
+        return {
+            "Responses": {table: [dict(key, child_id={"S": "c"}) for key in keys[:1]]},
+            "UnprocessedKeys": (
+                {table: dict(request, Keys=keys[1:])} if keys[1:] else {}
+            ),
+        }
+
+    monkeypatch.setattr(repository.dynamodb, "batch_get_item", batch_get_item)
+    monkeypatch.setattr("src.database.repository.BATCH_BACKOFF_SECONDS", 0)
+
+    fetched = repository.batch_get_worksheets(["a", "b", "c"], ["child_id"])
+
+    assert set(fetched) == {"a", "b", "c"}
+    assert len(calls) == 3
+
+
+def test_child_worksheet_pages(repository, test_child_dynamodb):
+    """Test paging through a child's worksheets, newest first."""
+    start = datetime(2024, 1, 1)
+    for i in range(25):
+        worksheet = Worksheet(
+            child_id=test_child_dynamodb.id,
+            problems=[{"type": "addition", "a": i, "b": 1, "answer": i + 1}],
+        )
+        worksheet.created_at = start + timedelta(days=i)
+        worksheet.updated_at = worksheet.created_at
+        repository.create_worksheet(worksheet)
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = repository.get_child_worksheet_page(
+            test_child_dynamodb.id, limit=10, cursor=cursor
+        )
+        pages.append(page)
+        if cursor is None:
+            break
+
+    worksheets = [w for page in pages for w in page]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [w.created_at for w in worksheets] == [
+        start + timedelta(days=i) for i in reversed(range(25))
+    ]
+
+    # Listed worksheets are fetched without their problems
+    assert all(w.problems == [] and w.problem_count == 1 for w in worksheets)
+
+
+def test_child_worksheet_page_rejects_invalid_cursor(repository, test_child_dynamodb):
+    """Test that a tampered cursor is rejected."""
+    with pytest.raises(ValueError):
+        repository.get_child_worksheet_page(test_child_dynamodb.id, cursor="bad")
+
+
+def test_worksheet_answer_key_round_trip(repository, test_child_dynamodb):
+    """Test that the answer key is stored next to the problems."""
+    worksheet = Worksheet.create(
+        child_id=test_child_dynamodb.id,
+        problems=json.dumps(["12 × 4", "3/4"]),
+        answer_key=["48", "0.75"],
+    )
+    repository.create_worksheet(worksheet)
+
+    saved_worksheet = repository.get_worksheet(worksheet.id)
+    assert saved_worksheet.answer_key == ["48", "0.75"]
+
+    # Grading keeps the answer key
+    saved_worksheet.completed = True
+    repository.update_worksheet(saved_worksheet)
+    assert repository.get_worksheet(worksheet.id).answer_key == ["48", "0.75"]